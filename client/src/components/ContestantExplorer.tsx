@@ -1,5 +1,5 @@
-import { useState, useEffect } from "react";
-import { fetchContestants } from "../hooks/useData";
+import { useState, useEffect, useMemo } from "react";
+import { fetchContestants, fetchRankings, type Rankings } from "../hooks/useData";
 
 interface Contestant {
   id: number;
@@ -21,6 +21,7 @@ interface Props {
 
 export default function ContestantExplorer({ onSelect }: Props) {
   const [contestants, setContestants] = useState<Contestant[]>([]);
+  const [rankings, setRankings] = useState<Rankings | null>(null);
   const [search, setSearch] = useState("");
   const [sortBy, setSortBy] = useState("pointsPerTask");
   const [filterSeason, setFilterSeason] = useState("all");
@@ -31,8 +32,16 @@ export default function ContestantExplorer({ onSelect }: Props) {
       setContestants(data.filter((c: Contestant) => c.episodes >= 5));
       setLoading(false);
     });
+    // Precomputed orders; until they load (or if missing) the list is sorted here
+    fetchRankings().then(setRankings, () => setRankings(null));
   }, []);
 
+  // Position of each contestant in the precomputed order for the chosen stat
+  const position = useMemo(() => {
+    const order = rankings?.stats[sortBy]?.order;
+    return order ? new Map(order.map((id, i) => [id, i])) : null;
+  }, [rankings, sortBy]);
+
   if (loading) return <div className="loading"><div className="spinner" /> Loading contestants...</div>;
 
   const seasons = [...new Set(contestants.flatMap((c) => c.seasonIds))].sort((a, b) => a - b);
@@ -41,11 +50,15 @@ export default function ContestantExplorer({ onSelect }: Props) {
     .filter((c) => c.name.toLowerCase().includes(search.toLowerCase()))
     .filter((c) => filterSeason === "all" || c.seasonIds.includes(parseInt(filterSeason)));
 
-  filtered.sort((a, b) => {
-    const av = (a as any)[sortBy] ?? 0;
-    const bv = (b as any)[sortBy] ?? 0;
-    return bv - av;
-  });
+  if (position) {
+    filtered.sort((a, b) => (position.get(a.id) ?? Infinity) - (position.get(b.id) ?? Infinity));
+  } else {
+    filtered.sort((a, b) => {
+      const av = (a as any)[sortBy] ?? 0;
+      const bv = (b as any)[sortBy] ?? 0;
+      return bv - av;
+    });
+  }
 
   return (
     <div>
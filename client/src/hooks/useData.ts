@@ -20,6 +20,18 @@ export async function fetchAnalysis() {
   return res.json();
 }
 
+/** Per stat, ranked contestant IDs highest first (see scraper/rankings.py). */
+export interface Rankings {
+  minEpisodes: number;
+  ranked: number;
+  stats: Record<string, { order: number[]; rank: number[]; percentile: number[] }>;
+}
+
+export async function fetchRankings(): Promise<Rankings> {
+  const res = await fetch(`${DATA_BASE}/rankings.json`);
+  return res.json();
+}
+
 export async function fetchFunFacts(): Promise<{ text: string; seasons: number[]; contestants: string[] }[]> {
   const res = await fetch(`${DATA_BASE}/funfacts.json`);
   return res.json();
@@ -42,3 +54,22 @@ export async function fetchEpisodes(): Promise<Record<string, Episode[]>> {
   const res = await fetch(`${DATA_BASE}/episodes.json`);
   return res.json();
 }
+
+/** Standings after every task/episode; matrix columns follow `contestants`. */
+export interface SeriesTimeline {
+  contestants: { id: number | string; name: string }[];
+  episodes: { episode: number; title: string; taskEnd: number; hash: string }[];
+  taskTotals: number[][];
+  episodePoints: number[][];
+  episodeTotals: number[][];
+  ranks: number[][];
+  rankChanges: number[][];
+  episodeWinners: number[][];
+  leaders: number[][];
+  leadMargin: number[];
+}
+
+export async function fetchTimeline(): Promise<{ series: Record<string, SeriesTimeline> }> {
+  const res = await fetch(`${DATA_BASE}/timeline.json`);
+  return res.json();
+}
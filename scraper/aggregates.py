@@ -0,0 +1,184 @@
+"""
+Incrementally maintained aggregates behind analysis.json.
+
+The store keeps, per winner/non-winner group, the member count and a running
+sum and count for every averaged column: the top-level stats and each
+taskBreakdown category/type/metric. It also keeps each contestant's own
+contribution, so adding, removing or updating one contestant is a delta of
+O(columns) that walks only that contestant's profile, and output is
+O(columns) whatever the number of contestants.
+
+Sums are exact: every float is an integer over a power of two, so a sum is
+kept as [numerator, exponent] and a delta can be undone without rounding
+drift. Rounded to float they equal the engine's math.fsum, so incremental
+output matches a full rebuild bit for bit, half-cent cases included.
+
+Persisted as data/analysis_aggregates.json next to analysis.json.
+"""
+
+import json
+import os
+
+from analysis import (BREAKDOWN_CATEGORIES, BREAKDOWN_METRICS, CLEAN_SPEC, TOP_LEVEL,
+                      is_valid, winner_label)
+from journal import write_json_atomic
+
+VERSION = 3  # files from other versions are rebuilt from scratch
+GROUPS = ("winners", "nonWinners")
+
+
+def add_exact(total: tuple[int, int], value: float, sign: int = 1) -> tuple[int, int]:
+    """total + sign * value, both exact as numerator / 2**exponent."""
+    n, k = total
+    p, q = value.as_integer_ratio()
+    kq = q.bit_length() - 1
+    if kq > k:
+        n, k = n << (kq - k), kq
+    n += sign * (p << (k - kq))
+    # Lowest terms, so equal sums compare equal however they were reached
+    shift = min(k, (n & -n).bit_length() - 1) if n else k
+    return n >> shift, k - shift
+
+
+def contribution(c: dict) -> dict[str, float]:
+    """The values a contestant adds to its group, using CLEAN_SPEC's masking rules."""
+    values = {}
+    for key in TOP_LEVEL.values():
+        v = c.get(key, 0)
+        if v != 0:
+            values[key] = float(v)
+    breakdown = c.get("taskBreakdown", {})
+    for cat, types in BREAKDOWN_CATEGORIES.items():
+        for t in types:
+            entry = breakdown.get(cat, {}).get(t) or {}
+            for m in BREAKDOWN_METRICS:
+                v = entry.get(m)
+                if v is not None and v > 0:
+                    values[f"{cat}.{t}.{m}"] = float(v)
+    return values
+
+
+class AggregateStore:
+    def __init__(self):
+        self.groups = {g: {"count": 0, "counts": {}, "sums": {}} for g in GROUPS}
+        self.members: dict[int, dict] = {}
+
+    @classmethod
+    def from_contestants(cls, contestants: list[dict]) -> "AggregateStore":
+        store = cls()
+        for c in contestants:
+            store.upsert(c)
+        return store
+
+    @classmethod
+    def load(cls, path: str) -> "AggregateStore | None":
+        if not os.path.exists(path):
+            return None
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != VERSION:
+            return None
+        store = cls()
+        for g, agg in data["groups"].items():
+            store.groups[g] = {"count": agg["count"], "counts": dict(agg["counts"]),
+                               "sums": {k: tuple(v) for k, v in agg["sums"].items()}}
+        for cid, member in data["members"].items():
+            store.members[int(cid)] = {"group": member["group"], "values": dict(member["values"])}
+        return store
+
+    def save(self, path: str) -> None:
+        write_json_atomic(path, {
+            "version": VERSION,
+            "groups": {
+                g: {"count": agg["count"], "counts": dict(sorted(agg["counts"].items())),
+                    "sums": {k: list(v) for k, v in sorted(agg["sums"].items())}}
+                for g, agg in self.groups.items()
+            },
+            "members": {
+                str(cid): {"group": m["group"], "values": dict(sorted(m["values"].items()))}
+                for cid, m in self.members.items()
+            },
+        })
+
+    def _apply(self, group: str, values: dict[str, float], sign: int):
+        agg = self.groups[group]
+        agg["count"] += sign
+        for k, v in values.items():
+            agg["counts"][k] = agg["counts"].get(k, 0) + sign
+            if agg["counts"][k] == 0:
+                del agg["counts"][k]
+                del agg["sums"][k]
+            else:
+                agg["sums"][k] = add_exact(agg["sums"].get(k, (0, 0)), v, sign)
+
+    def remove(self, contestant_id: int) -> None:
+        member = self.members.pop(contestant_id, None)
+        if member:
+            self._apply(member["group"], member["values"], -1)
+
+    def upsert(self, c: dict) -> None:
+        """Add or replace a contestant's contribution; invalid contestants are dropped."""
+        self.remove(c["id"])
+        if not is_valid(c):
+            return
+        member = {"group": winner_label(c), "values": contribution(c)}
+        self.members[c["id"]] = member
+        self._apply(member["group"], member["values"], 1)
+
+    def sync(self, contestants: list[dict], changed_ids: set[int] | None = None) -> int:
+        """Bring the store in line with contestants.
+
+        Only contestants in changed_ids are re-applied (all of them when None);
+        members missing from the list are removed. Returns the number of deltas.
+        """
+        current = {c["id"] for c in contestants}
+        deltas = 0
+        for cid in [cid for cid in self.members if cid not in current]:
+            self.remove(cid)
+            deltas += 1
+        for c in contestants:
+            if changed_ids is None or c["id"] in changed_ids or (c["id"] not in self.members and is_valid(c)):
+                self.upsert(c)
+                deltas += 1
+        return deltas
+
+    def same_state(self, other: "AggregateStore") -> bool:
+        return self.groups == other.groups and self.members == other.members
+
+    @property
+    def total(self) -> int:
+        return len(self.members)
+
+    def group_stats(self, spec: dict = CLEAN_SPEC) -> dict:
+        """Winner/non-winner stats in the same shape as analysis.winner_groups."""
+        out = {}
+        for g, agg in self.groups.items():
+
+            def avg(key):
+                # Integer true division rounds once, like math.fsum in the engine
+                count = agg["counts"].get(key, 0)
+                if not count:
+                    return 0
+                n, k = agg["sums"][key]
+                return round(n / (1 << k) / count, 2)
+
+            stats = {"count": agg["count"]}
+            for out_key, key in TOP_LEVEL.items():
+                stats[out_key] = avg(key)
+            for section, (cat, types) in spec.items():
+                stats[section] = {t: avg(f"{cat}.{t}.ppt") for t in types}
+            out[g] = stats
+        return out
+
+
+def compare(incremental: dict, full: dict, path: str = "") -> list[str]:
+    """Every difference between two group-stat dicts."""
+    mismatches = []
+    for key in sorted(set(incremental) | set(full)):
+        a, b = incremental.get(key), full.get(key)
+        where = f"{path}.{key}" if path else key
+        if isinstance(a, dict) and isinstance(b, dict):
+            mismatches += compare(a, b, where)
+        elif a != b:
+            mismatches.append(f"{where}: {a} vs {b}")
+    return mismatches
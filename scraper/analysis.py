@@ -0,0 +1,234 @@
+"""
+Columnar analysis engine shared by scrape.py and clean_data.py.
+
+Contestants become NumPy columns: the top-level averages (pointsPerTask,
+...) up front, and taskBreakdown category/type/metric columns, each with a
+presence mask, the first time a grouping needs them. Group statistics for
+any number of groupings are then computed in one vectorised pass per group.
+Sums are exact (math.fsum, correctly rounded), so an average does not depend
+on row order and aggregates.AggregateStore can keep running sums that give
+the same rounded averages after any sequence of updates.
+records.Contestant rows give every breakdown column at once: their arrays
+already have the column layout.
+"""
+
+import math
+from typing import Callable, Hashable, Iterable
+
+import numpy as np
+
+from metrics import metrics
+from records import CATEGORY_TYPES, METRIC_KEYS, N_METRICS, SLOTS, Contestant
+
+MIN_EPISODES = 5
+
+TOP_LEVEL = {
+    "avgPointsPerTask": "pointsPerTask",
+    "avgPointsPerEpisode": "pointsPerEpisode",
+    "avgEpisodeWinPct": "episodeWinPct",
+    "avgTaskWinPct": "taskWinPct",
+}
+
+# Output section -> (taskBreakdown category, task types)
+CLEAN_SPEC = {
+    "byTaskType": ("setting", ["prize", "filmed", "live"]),
+    "byActivity": ("activity", ["creative", "mental", "physical", "social"]),
+    "byJudgement": ("judgement", ["objective", "subjective", "combo"]),
+}
+SCRAPE_SPEC = {
+    "byTaskType": ("setting", ["prize", "filmed", "live", "homework"]),
+    "byActivity": CLEAN_SPEC["byActivity"],
+    "byJudgement": CLEAN_SPEC["byJudgement"],
+    "byFormat": ("format", ["solo", "team"]),
+}
+
+BREAKDOWN_CATEGORIES = {cat.value: [t.value for t in types] for cat, types in CATEGORY_TYPES.items()}
+BREAKDOWN_METRICS = list(METRIC_KEYS)
+_EMPTY: dict = {}
+_NAN = float("nan")
+
+
+def is_valid(c: dict) -> bool:
+    return "error" not in c and c.get("episodes", 0) >= MIN_EPISODES
+
+
+def winner_label(c: dict) -> str:
+    return "winners" if c.get("seasonWins", 0) > 0 else "nonWinners"
+
+
+class AnalysisEngine:
+    """Contestant stats as NumPy columns, ready for grouped averages."""
+
+    def __init__(self, contestants: list[dict], seasons: list[dict] | None = None):
+        self.rows = [c for c in contestants if is_valid(c)]
+        self.year_of = {s["seriesNumber"]: s.get("year", 0) for s in seasons or []}
+        self.top_keys = list(TOP_LEVEL.values())
+        self.bd_columns = [(cat, t, m) for cat, types in BREAKDOWN_CATEGORIES.items()
+                           for t in types for m in BREAKDOWN_METRICS]
+
+        # Columns are built on first use, straight from the rows: the
+        # groupings read only the ppt columns of their spec
+        self._columns: dict[tuple, tuple[np.ndarray, np.ndarray]] = {}
+        if self.rows and all(isinstance(c, Contestant) for c in self.rows):
+            self.top = np.array([[getattr(c, k) or 0 for k in self.top_keys] for c in self.rows], dtype=float)
+            self._from_records()
+        else:
+            self.top = np.array([[c.get(k, 0) for c in self.rows] for k in self.top_keys], dtype=float).T
+
+    def _from_records(self):
+        # Record breakdowns already have the column layout: one buffer join for all columns
+        n, width = len(self.rows), len(self.bd_columns)
+        empty = bytes(8 * width)
+        bd = np.frombuffer(b"".join(c.taskBreakdown.values.tobytes() if c.taskBreakdown else empty
+                                    for c in self.rows), dtype=float).reshape(n, width)
+        bits = np.array([c.taskBreakdown.present if c.taskBreakdown else 0 for c in self.rows], dtype=np.int64)
+        slots = ((bits[:, None] >> np.arange(len(SLOTS))) & 1).astype(bool)
+        present = np.repeat(slots, N_METRICS, axis=1)
+        for i, col in enumerate(self.bd_columns):
+            self._columns[col] = (bd[:, i], present[:, i])
+
+    def breakdown(self, cols: list[tuple]) -> tuple[np.ndarray, np.ndarray]:
+        """Values (0 where absent) and presence masks for (category, type, metric) columns."""
+        missing: dict[str, list[tuple]] = {}
+        for col in cols:
+            if col not in self._columns:
+                missing.setdefault(col[0], []).append(col)
+        if missing:
+            # One pass over the rows for every missing column, into a flat
+            # list; absent entries become NaN (JSON has no NaN), which doubles
+            # as the presence mask
+            plan = [(cat, [(t, m) for _, t, m in cat_cols]) for cat, cat_cols in missing.items()]
+            flat = []
+            append = flat.append
+            for c in self.rows:
+                bd = c.get("taskBreakdown") or _EMPTY
+                for cat, keys in plan:
+                    by_type = bd.get(cat) or _EMPTY
+                    for t, m in keys:
+                        entry = by_type.get(t)
+                        append(entry.get(m, _NAN) if entry else _NAN)
+            order = [col for _, cat_cols in missing.items() for col in cat_cols]
+            raw = np.array(flat, dtype=float).reshape(len(self.rows), len(order))
+            present = ~np.isnan(raw)
+            values = np.where(present, raw, 0.0)
+            for j, col in enumerate(order):
+                self._columns[col] = (values[:, j], present[:, j])
+            if order == list(cols):
+                return values, present
+        shape = (len(self.rows), len(cols))
+        return (np.column_stack([self._columns[col][0] for col in cols]).reshape(shape),
+                np.column_stack([self._columns[col][1] for col in cols]).reshape(shape))
+
+    def _labels(self, by: str | Callable[[dict], Hashable | Iterable]) -> list:
+        if by == "winner":
+            return [winner_label(c) for c in self.rows]
+        if by == "series":
+            return [c.get("seasonIds", []) for c in self.rows]
+        if by == "year":
+            return [sorted({self.year_of.get(s, 0) for s in c.get("seasonIds", [])}) for c in self.rows]
+        if by == "judgement":
+            # Each contestant's strongest judgement type by points per task;
+            # "none" for contestants with no judgement breakdown at all
+            types = BREAKDOWN_CATEGORIES["judgement"]
+            values, present = self.breakdown([("judgement", t, "ppt") for t in types])
+            best = np.argmax(np.where(present, values, -np.inf), axis=1)
+            return [types[b] if has else "none" for b, has in zip(best.tolist(), present.any(axis=1).tolist())]
+        return [by(c) for c in self.rows]
+
+    def group_stats(self, groupings: dict[str, str | Callable], spec: dict = CLEAN_SPEC,
+                    skip_zero_breakdown: bool = True) -> dict[str, dict]:
+        """Compute stats for every group of every grouping in one pass.
+
+        A grouping is "winner", "series", "year", "judgement" or a function
+        returning a label (or a list of labels) per contestant. Returns
+        {grouping: {label: stats}} with stats shaped like analysis.json groups.
+        """
+        codes, rows = [], []
+        index: dict[tuple, int] = {}
+        for name, by in groupings.items():
+            labels = self._labels(by)
+            if not any(isinstance(label, (list, tuple, set)) for label in labels):
+                codes += [index.setdefault((name, label), len(index)) for label in labels]
+                rows += range(len(labels))
+                continue
+            for i, label in enumerate(labels):
+                for lab in label if isinstance(label, (list, tuple, set)) else (label,):
+                    codes.append(index.setdefault((name, lab), len(index)))
+                    rows.append(i)
+        keys = list(index)
+        codes = np.asarray(codes, dtype=np.intp)
+        rows = np.asarray(rows, dtype=np.intp)
+
+        sections = [(section, cat, t) for section, (cat, types) in spec.items() for t in types]
+        bd, bd_mask = self.breakdown([(cat, t, "ppt") for _, cat, t in sections])
+        if skip_zero_breakdown:
+            bd_mask = bd_mask & (bd > 0)
+        top_mask = self.top != 0
+
+        # Members of each group are contiguous after a stable sort by group
+        # code; every group has at least one member
+        order = rows[np.argsort(codes, kind="stable")]
+        bounds = np.searchsorted(np.sort(codes), np.arange(len(keys) + 1)).tolist()
+        values = np.hstack([np.where(top_mask, self.top, 0.0), np.where(bd_mask, bd, 0.0)])[order]
+        counts = np.add.reduceat(np.hstack([top_mask, bd_mask])[order].astype(np.int64), bounds[:-1], axis=0).tolist()
+        # Exact sums (math.fsum): float adds in any fixed order would round
+        # half-cent averages differently from an order-free running total
+        columns = values.T.tolist()
+
+        offset = len(self.top_keys)
+        result: dict[str, dict] = {name: {} for name in groupings}
+        for k, (name, label) in enumerate(keys):
+            lo, hi = bounds[k], bounds[k + 1]
+            n = counts[k]
+
+            def avg(j):
+                return round(math.fsum(columns[j][lo:hi]) / n[j], 2) if n[j] else 0
+
+            stats = {"count": hi - lo}
+            for j, out_key in enumerate(TOP_LEVEL):
+                stats[out_key] = avg(j)
+            for j, (section, _, t) in enumerate(sections):
+                stats.setdefault(section, {})[t] = avg(offset + j)
+            result[name][label] = stats
+        return result
+
+    def empty_stats(self, spec: dict = CLEAN_SPEC) -> dict:
+        stats = {"count": 0, **{k: 0 for k in TOP_LEVEL}}
+        for section, (_, types) in spec.items():
+            stats[section] = {t: 0 for t in types}
+        return stats
+
+
+def winner_groups(engine: AnalysisEngine, spec: dict = CLEAN_SPEC, skip_zero_breakdown: bool = True) -> dict:
+    groups = engine.group_stats({"winner": "winner"}, spec, skip_zero_breakdown)["winner"]
+    return {label: groups.get(label, engine.empty_stats(spec)) for label in ("winners", "nonWinners")}
+
+
+@metrics.timed()
+def build_analysis(contestants: list[dict], seasons: list[dict]) -> dict:
+    """Build analysis.json from cleaned contestants and seasons."""
+    engine = AnalysisEngine(contestants, seasons)
+    return assemble_analysis(winner_groups(engine), len(engine.rows), seasons)
+
+
+def assemble_analysis(groups: dict, total_contestants: int, seasons: list[dict]) -> dict:
+    """Wrap winner/non-winner group stats into the analysis.json layout."""
+    return {
+        "totalContestants": total_contestants,
+        "totalSeasons": len(seasons),
+        "winners": groups["winners"],
+        "nonWinners": groups["nonWinners"],
+        "seasonWinners": [
+            {
+                "season": s["seriesNumber"],
+                "name": s["winner"]["name"],
+                "id": s["winner"]["id"],
+            }
+            for s in seasons
+        ],
+        "keyInsights": [
+            "Comparing season winners vs non-winners across all task categories",
+            "Task type performance correlations with series victory",
+            "Episode win percentage patterns for champions",
+        ],
+    }
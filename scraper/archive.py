@@ -0,0 +1,133 @@
+"""
+Content-addressed archive of every raw page the scraper fetches.
+
+Each distinct page body is stored once, compressed, under
+data/.page_archive/objects/<sha256[:2]>/<sha256[2:]>.gz (.zst when the
+zstandard package is installed). index.bin maps each URL to the hash of its
+latest body: fixed-width records sorted by URL key, opened as a NumPy memmap
+and binary searched, so opening the archive costs nothing however many pages
+it holds. New entries are kept in memory and merged into index.bin by flush().
+
+`scrape.py --reparse` rebuilds the data files from the archive without
+touching the network.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+import time
+
+import numpy as np
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+INDEX_DTYPE = np.dtype([("url", "S32"), ("sha", "S64"), ("fetchedAt", "<f8")])
+FLUSH_EVERY = 50  # index rewrites are batched; flush() is also called at the end of a run
+
+
+def url_key(url: str) -> bytes:
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest().encode("ascii")
+
+
+class PageArchive:
+    def __init__(self, archive_dir: str):
+        self.archive_dir = archive_dir
+        self.objects_dir = os.path.join(archive_dir, "objects")
+        self.index_file = os.path.join(archive_dir, "index.bin")
+        self._lock = threading.Lock()
+        self.pending: dict[bytes, tuple[str, float]] = {}
+        self.stored = self.deduplicated = 0
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._open_index()
+
+    def _open_index(self):
+        if os.path.exists(self.index_file) and os.path.getsize(self.index_file):
+            self.table = np.memmap(self.index_file, dtype=INDEX_DTYPE, mode="r")
+        else:
+            self.table = np.zeros(0, dtype=INDEX_DTYPE)
+
+    def __len__(self) -> int:
+        with self._lock:
+            new = np.array(list(self.pending), dtype="S32")
+            return len(self.table) + int((~np.isin(new, self.table["url"])).sum())
+
+    def _object_path(self, sha: str, suffix: str) -> str:
+        return os.path.join(self.objects_dir, sha[:2], sha[2:] + suffix)
+
+    def lookup_hash(self, url: str) -> str | None:
+        """Hash of the latest archived body for url, or None."""
+        key = url_key(url)
+        with self._lock:
+            if key in self.pending:
+                return self.pending[key][0]
+            table = self.table
+        keys = table["url"]
+        i = int(np.searchsorted(keys, key))
+        if i < len(keys) and keys[i] == key:
+            return table["sha"][i].decode("ascii")
+        return None
+
+    def get(self, url: str) -> str | None:
+        """The latest archived body for url, or None if it was never fetched."""
+        sha = self.lookup_hash(url)
+        if sha is None:
+            return None
+        try:
+            with open(self._object_path(sha, ".zst"), "rb") as f:
+                if zstandard is None:
+                    raise RuntimeError(f"{url} is archived with zstd; pip install zstandard to read it")
+                data = zstandard.ZstdDecompressor().decompress(f.read())
+        except FileNotFoundError:
+            try:
+                with gzip.open(self._object_path(sha, ".gz"), "rb") as f:
+                    data = f.read()
+            except FileNotFoundError:
+                return None
+        return data.decode("utf-8")
+
+    def put(self, url: str, body: str) -> str:
+        """Archive body as the latest version of url; returns its content hash."""
+        data = body.encode("utf-8")
+        sha = hashlib.sha256(data).hexdigest()
+        if self.lookup_hash(url) == sha:
+            return sha
+        exists = os.path.exists(self._object_path(sha, ".zst")) or os.path.exists(self._object_path(sha, ".gz"))
+        if not exists:
+            suffix = ".zst" if zstandard else ".gz"
+            path = self._object_path(sha, suffix)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            packed = zstandard.ZstdCompressor(level=10).compress(data) if zstandard else gzip.compress(data, 9)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(packed)
+            os.replace(tmp, path)
+        with self._lock:
+            if exists:
+                self.deduplicated += 1
+            else:
+                self.stored += 1
+            self.pending[url_key(url)] = (sha, time.time())
+            if len(self.pending) >= FLUSH_EVERY:
+                self._write_index()
+        return sha
+
+    def _write_index(self):
+        new = np.array([(key, sha.encode("ascii"), t) for key, (sha, t) in self.pending.items()],
+                       dtype=INDEX_DTYPE)
+        old = np.array(self.table)
+        merged = np.concatenate([old[~np.isin(old["url"], new["url"])], new])
+        merged = merged[np.argsort(merged["url"], kind="stable")]
+        tmp = self.index_file + ".tmp"
+        merged.tofile(tmp)
+        self.table = merged
+        os.replace(tmp, self.index_file)
+        self.pending = {}
+
+    def flush(self):
+        with self._lock:
+            if self.pending:
+                self._write_index()
@@ -0,0 +1,766 @@
+"""
+Micro-benchmarks for the scraper's hot paths.
+
+    python bench.py parse [--pages DIR] [--repeat N]
+    python bench.py parsers [--pages DIR] [--repeat N]
+    python bench.py dataset [--contestants N] [--seasons N]
+    python bench.py analysis [--scale N]
+    python bench.py export [--repeat N]
+    python bench.py similar [--scale N]
+    python bench.py records [--scale N]
+    python bench.py pipeline [--copies N] [--latency MS] [--parse-workers N]
+    python bench.py suite [--scales 1,10,100,1000] [--save-baseline] [--threshold PCT]
+
+`parse` times stat extraction on person.php pages. `parsers` times profile
+parsing for every parser backend (tests/test_parsing.py checks that they all
+produce the same output). Pass a directory
+of saved pages (*.html); without one, pages are rendered from
+data/contestants.json in the same markup taskmaster.info uses.
+
+`dataset` times the contestant/season joins done by clean_data.py and
+scrape.py on synthetic datasets of increasing size, comparing the original
+linear scans against the Dataset indexes.
+
+`analysis` checks that the columnar engine reproduces both original
+build_analysis variants exactly (with their sums made exact, as the engine's
+are), on the real data and on a synthetic scale-up, and times them.
+
+`export` writes every export variant to a temp directory, checks the columnar
+files round-trip losslessly, and compares file sizes and load times against
+the indented JSON.
+
+`similar` checks the batched top-k neighbours against a full similarity
+matrix sort on the real data, then times build_similar on a scale-up.
+
+`records` checks that contestant records convert back to byte-identical
+JSON, then compares the memory held by dicts and records and the time
+build_analysis and build_similar take on each.
+
+`pipeline` fetches (with simulated latency) and parses copies of the
+rendered profile pages, once with parsing inline on the fetch threads and
+once through the staged pipeline's process pool. It checks both produce the
+same profiles and compares wall-clock time.
+
+`suite` is the regression gate. It serves recorded pages (from
+data/.page_archive/ when present, otherwise rendered from the data files)
+over a local stub HTTP server, runs scrape.main against it, then times the
+hot paths: stat extraction, parse_task_breakdown, parse_season, both
+build_analysis variants and clean_data.main, the last three on 1x, 10x, 100x
+and 1000x contestant scale-ups. Each case reports best-of-N wall time and
+tracemalloc peak memory. --save-baseline writes the results to
+bench_baseline.json; later runs exit non-zero when a case is slower or
+bigger than its baseline by more than --threshold percent.
+"""
+
+import argparse
+import contextlib
+import glob
+import json
+import copy
+import gzip
+import io
+import math
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+from bs4 import BeautifulSoup
+
+import analysis
+import clean_data
+import export
+import records
+import scrape
+import similarity
+from archive import PageArchive
+from dataset import Dataset
+from pipeline import run_pipeline
+
+DATA_DIR = scrape.DATA_DIR
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "bench_baseline.json")
+
+STAT_LABELS = {
+    "Season Wins": "seasonWins", "Episodes": "episodes", "Episode Wins": "episodeWins",
+    "Episode Win %": "episodeWinPct", "Base Points": "basePoints", "Bonus Points": "bonusPoints",
+    "Points Deducted": "pointsDeducted", "Total Points": "totalPoints",
+    "Points per Episode": "pointsPerEpisode", "Tasks Attempted": "tasksAttempted",
+    "Tasks Won": "tasksWon", "Task Win %": "taskWinPct", "Points per Task": "pointsPerTask",
+    "DQs": "dqs",
+}
+SECTION_HEADERS = {
+    "format": "Assignment Type", "setting": "Task Format",
+    "activity": "Activity Type", "judgement": "Judgment Type",
+}
+ROW_LABELS = {"tiebreak": "Tie-break", "combo": "Combination"}
+
+
+def render_person_page(c: dict) -> str:
+    """Render a contestant record back into person.php-style markup."""
+    parts = [f"<html><head><title>{c.get('name', '')}</title></head><body>",
+             f"<h1>{c.get('name', '')}</h1><div class='statsContainer'>"]
+    for label, key in STAT_LABELS.items():
+        value = c.get(key, 0)
+        if label.endswith("%"):
+            value = f"{value}%"
+        parts.append(f'<div class="statsBox"><div class="statsLabel">{label}</div>'
+                     f'<div class="statsNumber">{value}</div></div>')
+    parts.append("</div>")
+    for category, header in SECTION_HEADERS.items():
+        parts.append(f'<div class="statsTasksSubSection"><div class="statsTasksByCategoryHeader">{header}</div>'
+                     '<table class="peopleStatsTable"><tr><th></th><th>Type</th><th>Attempted</th>'
+                     '<th>Won</th><th>Win %</th><th>PpT</th></tr>')
+        for key, m in c.get("taskBreakdown", {}).get(category, {}).items():
+            label = ROW_LABELS.get(key, key.capitalize())
+            parts.append(f"<tr><td></td><td>{label}</td><td>{m['attempted']}</td><td>{m['won']}</td>"
+                         f"<td>{m['winPct']}%</td><td>{m['ppt']}</td></tr>")
+        parts.append("</table></div>")
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def load_pages(pages_dir: str | None) -> list[str]:
+    if pages_dir:
+        pages = []
+        for path in sorted(glob.glob(os.path.join(pages_dir, "*.html"))):
+            with open(path, "r", encoding="utf-8") as f:
+                pages.append(f.read())
+        return pages
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        return [render_person_page(c) for c in json.load(f) if "error" not in c]
+
+
+def render_season_page(season: dict) -> str:
+    """Render a cleaned season record back into season.php-style markup."""
+    parts = [f"<html><body><h1>Series {season['seriesNumber']}</h1><p>First aired {season['year']}</p>",
+             f'<div class="statsBox"><div class="statsLabel">Episodes</div>'
+             f'<div class="statsNumber">{season["episodes"]}</div></div>',
+             '<div class="host"><a href="person.php?id=19"><p class="personName">Greg Davies</p></a></div>']
+    for c in season["contestants"]:
+        parts.append(f'<div class="contestant"><a href="person.php?id={c["id"]}">'
+                     f'<p class="personName">{c["name"]}</p></a></div>')
+    parts.append(f'<div class="notes">{season["winner"]["name"]} won this series.</div></body></html>')
+    return "".join(parts)
+
+
+def load_fixtures() -> dict[str, str]:
+    """Season and person pages keyed by site path ("person.php?id=1").
+
+    Pages recorded in the page archive are used as-is; any the archive lacks
+    are rendered from the data files.
+    """
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = [c for c in json.load(f) if "error" not in c]
+    with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+        seasons = {s["seriesNumber"]: s for s in json.load(f)}
+    pages = {}
+    for site_id, info in clean_data.UK_SEASONS.items():
+        pages[f"season.php?id={site_id}"] = render_season_page(seasons[info["series"]])
+    for c in contestants:
+        pages[f"person.php?id={c['id']}"] = render_person_page(c)
+    if os.path.exists(scrape.ARCHIVE_DIR):
+        recorded = PageArchive(scrape.ARCHIVE_DIR)
+        for path in pages:
+            html = recorded.get(f"{scrape.BASE_URL}/{path}")
+            if html is not None:
+                pages[path] = html
+    return pages
+
+
+@contextlib.contextmanager
+def stub_server(pages: dict[str, str]):
+    """Serve pages over HTTP on localhost; yields the base URL."""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = pages.get(self.path.lstrip("/"))
+            if body is None:
+                self.send_error(404)
+                return
+            data = body.encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def legacy_get_stat(soup: BeautifulSoup, label: str) -> str:
+    """The original per-label tree scan, kept as the benchmark baseline."""
+    label_div = soup.find("div", class_="statsLabel", string=re.compile(re.escape(label), re.I))
+    if label_div:
+        number_div = label_div.find_next_sibling("div", class_="statsNumber")
+        if not number_div:
+            parent = label_div.find_parent()
+            if parent:
+                number_div = parent.find("div", class_="statsNumber")
+        if number_div:
+            return number_div.get_text(strip=True)
+    return ""
+
+
+def bench_parse(args):
+    pages = load_pages(args.pages)
+    if not pages:
+        raise SystemExit("No pages to benchmark")
+    soups = [BeautifulSoup(p, "html.parser") for p in pages]
+
+    def legacy():
+        for soup in soups:
+            for label in STAT_LABELS:
+                legacy_get_stat(soup, label)
+
+    def indexed():
+        for soup in soups:
+            stats = scrape.extract_stats(soup)
+            for label in STAT_LABELS:
+                scrape.lookup_stat(stats, label)
+
+    # Both paths must agree before their timings mean anything
+    for soup in soups:
+        stats = scrape.extract_stats(soup)
+        for label in STAT_LABELS:
+            if legacy_get_stat(soup, label) != scrape.lookup_stat(stats, label):
+                raise SystemExit(f"Mismatch on {label!r}")
+
+    print(f"Stat extraction over {len(pages)} pages, best of {args.repeat}:")
+    results = {}
+    for name, fn in (("get_stat x14", legacy), ("extract_stats", indexed)):
+        best = min(timed(fn) for _ in range(args.repeat))
+        results[name] = best
+        print(f"  {name:<14} {best / len(pages) * 1e6:9.1f} us/page CPU")
+    print(f"  speedup        {results['get_stat x14'] / results['extract_stats']:9.1f}x")
+
+
+def available_parsers() -> list[str]:
+    parsers = ["html.parser"]
+    try:
+        import lxml  # noqa: F401
+        parsers.append("lxml")
+    except ImportError:
+        pass
+    return parsers
+
+
+def bench_parsers(args):
+    pages = load_pages(args.pages)
+    if not pages:
+        raise SystemExit("No pages to benchmark")
+    parsers = available_parsers()
+
+    print(f"Profile parse over {len(pages)} pages, best of {args.repeat}:")
+    for parser in parsers:
+        best = min(timed(lambda: [scrape.parse_contestant_profile(html, i, parser) for i, html in enumerate(pages)])
+                   for _ in range(args.repeat))
+        print(f"  {parser:<12} {best / len(pages) * 1e6:9.1f} us/page CPU")
+
+
+def synthetic_dataset(n_contestants: int, n_seasons: int) -> tuple[list[dict], list[dict]]:
+    """Raw scraper-shaped contestants and seasons, contestants dealt round-robin into seasons."""
+    contestants = [{"id": i, "name": f"Contestant {i}", "episodes": 10, "totalPoints": i % 200,
+                    "pointsPerTask": 2.5, "episodeWinPct": 20.0} for i in range(1, n_contestants + 1)]
+    seasons = [{"id": sid, "seriesNumber": sid, "contestants": []} for sid in range(1, n_seasons + 1)]
+    for i, c in enumerate(contestants):
+        seasons[i % n_seasons]["contestants"].append({"id": c["id"], "name": c["name"]})
+    return contestants, seasons
+
+
+def legacy_joins(contestants, seasons):
+    for c in contestants:
+        c["seasonIds"] = [s["seriesNumber"] for s in seasons
+                          if any(sc["id"] == c["id"] for sc in s.get("contestants", []))]
+    for s in seasons:
+        season_data = next((r for r in seasons if r["id"] == s["id"]), None)
+        for sc in season_data["contestants"]:
+            next((c for c in contestants if c["id"] == sc["id"]), None)
+
+
+def indexed_joins(contestants, seasons):
+    dataset = Dataset(contestants, seasons)
+    for c in contestants:
+        c["seasonIds"] = dataset.seasons_for(c["id"])
+    for s in seasons:
+        season_data = dataset.season_by_site_id(s["id"])
+        for sc in season_data["contestants"]:
+            dataset.contestant(sc["id"])
+
+
+def bench_dataset(args):
+    print("Contestant/season joins (seasonIds + per-season contestant lookup), CPU seconds:")
+    print(f"  {'contestants':>11} {'seasons':>8} {'linear scans':>13} {'Dataset':>9}")
+    for fraction in (0.125, 0.25, 0.5, 1.0):
+        n = int(args.contestants * fraction)
+        m = max(1, int(args.seasons * fraction))
+        contestants, seasons = synthetic_dataset(n, m)
+        legacy = timed(lambda: legacy_joins(contestants, seasons)) if n <= args.legacy_limit else None
+        expected = [c["seasonIds"] for c in contestants] if legacy is not None else None
+        indexed = timed(lambda: indexed_joins(contestants, seasons))
+        if expected is not None and expected != [c["seasonIds"] for c in contestants]:
+            raise SystemExit("Dataset seasonIds differ from the linear scan")
+        legacy_text = f"{legacy:13.3f}" if legacy is not None else f"{'skipped':>13}"
+        print(f"  {n:>11} {m:>8} {legacy_text} {indexed:9.4f}")
+
+
+def legacy_clean_analysis(contestants, seasons):
+    """clean_data.build_analysis as it was before the columnar engine, with
+    exact sums (math.fsum) in place of sum(), whose rounding depends on row order."""
+    valid = [c for c in contestants if "error" not in c and c.get("episodes", 0) >= 5]
+    winners = [c for c in valid if c.get("seasonWins", 0) > 0]
+    non_winners = [c for c in valid if c.get("seasonWins", 0) == 0]
+
+    def avg(group, key):
+        vals = [c.get(key, 0) for c in group if c.get(key, 0) != 0]
+        return round(math.fsum(vals) / len(vals), 2) if vals else 0
+
+    def avg_bd(group, cat, key, metric="ppt"):
+        vals = []
+        for c in group:
+            bd = c.get("taskBreakdown", {}).get(cat, {}).get(key, {})
+            if bd and metric in bd and bd[metric] > 0:
+                vals.append(bd[metric])
+        return round(math.fsum(vals) / len(vals), 2) if vals else 0
+
+    def stats(group):
+        out = {"count": len(group)}
+        for out_key, key in analysis.TOP_LEVEL.items():
+            out[out_key] = avg(group, key)
+        for section, (cat, types) in analysis.CLEAN_SPEC.items():
+            out[section] = {t: avg_bd(group, cat, t) for t in types}
+        return out
+
+    return {"winners": stats(winners), "nonWinners": stats(non_winners)}
+
+
+def legacy_scrape_analysis(contestants, seasons):
+    """scrape.build_analysis group stats as they were before the columnar engine, with math.fsum."""
+    valid = [c for c in contestants if "error" not in c and c.get("episodes", 0) >= 5]
+    winners = [c for c in valid if c.get("seasonWins", 0) > 0]
+    non_winners = [c for c in valid if c.get("seasonWins", 0) == 0]
+
+    def avg(group, key, default=0):
+        vals = [c.get(key, default) for c in group if c.get(key, default) != 0]
+        return round(math.fsum(vals) / len(vals), 2) if vals else 0
+
+    def avg_breakdown(group, category, task_type, metric="ppt"):
+        vals = []
+        for c in group:
+            bd = c.get("taskBreakdown", {}).get(category, {}).get(task_type, {})
+            if bd and metric in bd:
+                vals.append(bd[metric])
+        return round(math.fsum(vals) / len(vals), 2) if vals else 0
+
+    def stats(group):
+        out = {"count": len(group)}
+        for out_key, key in analysis.TOP_LEVEL.items():
+            out[out_key] = avg(group, key)
+        for section, (cat, types) in analysis.SCRAPE_SPEC.items():
+            out[section] = {t: avg_breakdown(group, cat, t) for t in types}
+        return out
+
+    return {"winners": stats(winners), "nonWinners": stats(non_winners)}
+
+
+def scaled_contestants(contestants: list[dict], scale: int, seed: int = 0) -> list[dict]:
+    """Replicate contestants scale times with jittered stats and fresh IDs."""
+    rng = random.Random(seed)
+    out = []
+    for k in range(scale):
+        for c in contestants:
+            c2 = copy.deepcopy(c)
+            c2["id"] = c["id"] + k * 100_000
+            if k:
+                for key in analysis.TOP_LEVEL.values():
+                    c2[key] = round(c2.get(key, 0) * rng.uniform(0.8, 1.2), 2)
+                for types in c2.get("taskBreakdown", {}).values():
+                    for m in types.values():
+                        m["ppt"] = round(m["ppt"] * rng.uniform(0.8, 1.2), 2)
+            out.append(c2)
+    return out
+
+
+def bench_analysis(args):
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = json.load(f)
+    with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+        seasons = json.load(f)
+
+    def engine_clean(cs):
+        return analysis.winner_groups(analysis.AnalysisEngine(cs, seasons))
+
+    def engine_scrape(cs):
+        return analysis.winner_groups(analysis.AnalysisEngine(cs, seasons), analysis.SCRAPE_SPEC, False)
+
+    variants = (("clean", legacy_clean_analysis, engine_clean), ("scrape", legacy_scrape_analysis, engine_scrape))
+    for scale in (1, args.scale):
+        cs = scaled_contestants(contestants, scale)
+        print(f"{len(cs)} contestants ({scale}x):")
+        for name, legacy, engine in variants:
+            if json.dumps(legacy(cs, seasons)) != json.dumps(engine(cs)):
+                raise SystemExit(f"  {name}: engine output differs from the original build_analysis")
+            t_legacy = min(timed(lambda: legacy(cs, seasons)) for _ in range(args.repeat))
+            t_engine = min(timed(lambda: engine(cs)) for _ in range(args.repeat))
+            print(f"  {name:<7} identical; original {t_legacy * 1e3:8.1f} ms, engine {t_engine * 1e3:8.1f} ms")
+
+    cs = scaled_contestants(contestants, args.scale)
+    t_flatten = min(timed(lambda: analysis.AnalysisEngine(cs, seasons).breakdown(
+        [(cat, t, m) for cat, types in analysis.BREAKDOWN_CATEGORIES.items() for t in types
+         for m in analysis.BREAKDOWN_METRICS])) for _ in range(args.repeat))
+    engine = analysis.AnalysisEngine(cs, seasons)
+    groupings = {"winner": "winner", "series": "series", "year": "year", "judgement": "judgement"}
+    t = min(timed(lambda: engine.group_stats(groupings)) for _ in range(args.repeat))
+    groups = engine.group_stats(groupings)
+    print(f"Flatten {len(cs)} contestants to all breakdown columns: {t_flatten * 1e3:.1f} ms")
+    print(f"All groupings in one call ({', '.join(f'{k}: {len(v)}' for k, v in groups.items())}): {t * 1e3:.1f} ms")
+
+
+def bench_similar(args):
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = json.load(f)
+
+    ids, x = similarity.feature_matrix(contestants)
+    sims = x @ x.T
+    np.fill_diagonal(sims, -np.inf)
+    k = min(similarity.TOP_K, len(ids) - 1)
+    expected = {str(cid): ids[np.argsort(-row, kind="stable")[:k]].tolist() for cid, row in zip(ids.tolist(), sims)}
+    got = similarity.build_similar(contestants)["contestants"]
+    if any([n for n, _ in got[cid]] != nbrs for cid, nbrs in expected.items()):
+        raise SystemExit("top-k differs from a full sort of the similarity matrix")
+    print(f"{len(ids)} contestants: top-{k} matches a full sort")
+
+    for scale in (1, args.scale):
+        cs = scaled_contestants(contestants, scale)
+        t = min(timed_wall(lambda: similarity.build_similar(cs)) for _ in range(args.repeat))
+        print(f"  build_similar, {len(cs)} contestants ({scale}x): {t * 1e3:.1f} ms")
+
+
+def bench_records(args):
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = json.load(f)
+    with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+        seasons = json.load(f)
+
+    if json.dumps(records.to_json(records.to_records(contestants))) != json.dumps(contestants):
+        raise SystemExit("records do not round-trip to the same JSON")
+    print(f"{len(contestants)} contestants: records round-trip losslessly")
+
+    cs = scaled_contestants(contestants, args.scale)
+    text = json.dumps(cs)
+    del cs
+
+    def held(build):
+        tracemalloc.start()
+        data = build()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return data, size
+
+    dicts, dict_bytes = held(lambda: json.loads(text))
+    recs, rec_bytes = held(lambda: records.to_records(json.loads(text)))
+    n = len(dicts)
+    print(f"{n} contestants ({args.scale}x) held in memory:")
+    print(f"  dicts   {dict_bytes / n:8.0f} B/contestant")
+    print(f"  records {rec_bytes / n:8.0f} B/contestant ({rec_bytes / dict_bytes:.0%})")
+
+    for name, fn in (("build_analysis", lambda cs: analysis.build_analysis(cs, seasons)),
+                     ("build_similar", similarity.build_similar)):
+        t_dicts = min(timed(lambda: fn(dicts)) for _ in range(args.repeat))
+        t_recs = min(timed(lambda: fn(recs)) for _ in range(args.repeat))
+        print(f"  {name:<15} dicts {t_dicts * 1e3:8.1f} ms, records {t_recs * 1e3:8.1f} ms")
+
+
+def bench_export(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        export.COMPACT_DIR = tmp
+        for name, writer, reader in (("contestants", export.write_contestants, export.read_contestants),
+                                     ("episodes", export.write_episodes, export.read_episodes)):
+            source = os.path.join(DATA_DIR, f"{name}.json")
+            with open(source, "r", encoding="utf-8") as f:
+                obj = json.load(f)
+            export.write_minified(obj, name)
+            columnar = os.path.join(tmp, f"{name}.tmcol")
+            writer(obj, columnar)
+            if json.dumps(reader(columnar)) != json.dumps(obj):
+                raise SystemExit(f"{name}.tmcol does not round-trip to {name}.json")
+            with open(columnar, "rb") as f:
+                columnar_gz = len(gzip.compress(f.read(), mtime=0))
+
+            minified = os.path.join(tmp, f"{name}.min.json")
+
+            def load_json(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    return json.load(f)
+
+            def load_gz():
+                with open(minified + ".gz", "rb") as f:
+                    return json.loads(gzip.decompress(f.read()))
+
+            def open_columns():
+                cf = export.ColumnarFile(columnar)
+                table = next(iter(cf.header["tables"]))
+                return [cf.column(table, c) for c in cf.header["tables"][table]["columns"]]
+
+            variants = [
+                ("indented json", os.path.getsize(source), lambda: load_json(source)),
+                ("minified json", os.path.getsize(minified), lambda: load_json(minified)),
+                ("minified .gz", os.path.getsize(minified + ".gz"), load_gz),
+            ]
+            if os.path.exists(minified + ".br"):
+                variants.append(("minified .br", os.path.getsize(minified + ".br"), None))
+            variants += [
+                ("tmcol columns", os.path.getsize(columnar), open_columns),
+                ("tmcol records", os.path.getsize(columnar), lambda: reader(columnar)),
+                ("tmcol .gz", columnar_gz, None),
+            ]
+            print(f"{name}:")
+            for label, size, loader in variants:
+                load = f"{min(timed(loader) for _ in range(args.repeat)) * 1e3:8.2f} ms" if loader else f"{'-':>11}"
+                print(f"  {label:<14} {size:>9} bytes  load {load}")
+
+
+def bench_pipeline(args):
+    pages = load_pages(None) * args.copies
+    latency = args.latency / 1000
+
+    def fetch(i):
+        time.sleep(latency)
+        return pages[i]
+
+    def inline():
+        return {i: p for i, p, _ in scrape.fetch_all(
+            lambda i: scrape.parse_contestant_profile(fetch(i), i), range(len(pages)), args.fetch_workers)}
+
+    def staged():
+        return {i: p for i, p, _ in run_pipeline(range(len(pages)), fetch, scrape.parse_contestant_profile,
+                                                args.fetch_workers, args.parse_workers,
+                                                parse_args=(scrape.PARSER,))}
+
+    print(f"{len(pages)} pages, {args.latency} ms simulated latency, {args.fetch_workers} fetch threads, "
+          f"{args.parse_workers} parse processes ({scrape.PARSER}):")
+    results = {}
+    for name, fn in (("inline", inline), ("pipeline", staged)):
+        start = time.perf_counter()
+        results[name] = fn()
+        print(f"  {name:<9} {time.perf_counter() - start:8.2f} s wall")
+    if results["inline"] != results["pipeline"]:
+        raise SystemExit("Pipeline output differs from inline parsing")
+    print("  outputs identical")
+
+
+def run_main(module, argv: list[str]):
+    """Run a script's main() with argv, discarding its console output."""
+    saved = sys.argv
+    sys.argv = [module.__name__] + argv
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            module.main()
+    finally:
+        sys.argv = saved
+
+
+def measure(fn, repeat: int) -> dict:
+    """Best-of-repeat wall time and tracemalloc peak of one extra run."""
+    seconds = min(timed_wall(fn) for _ in range(repeat))
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(seconds, 6), "peakMB": round(peak / 2 ** 20, 3)}
+
+
+def suite_cases(pages: dict[str, str], work: str, scales: list[int]):
+    """Yield (name, fn) benchmark cases; fn runs the hot path once."""
+    raw_dir = os.path.join(work, "raw")
+    os.makedirs(raw_dir)
+    scrape.DATA_DIR = raw_dir
+    scrape.CACHE_DIR = os.path.join(work, "http_cache")
+    scrape.ARCHIVE_DIR = os.path.join(work, "page_archive")
+    with stub_server(pages) as base_url:
+        saved_base, scrape.BASE_URL = scrape.BASE_URL, base_url
+
+        def scrape_run():
+            for name in os.listdir(raw_dir):
+                os.remove(os.path.join(raw_dir, name))
+            run_main(scrape, ["--rate", "0", "--no-cache", "--parse-workers", "0"])
+
+        try:
+            yield "scrape.main (stub server)", scrape_run
+        finally:
+            scrape.BASE_URL = saved_base
+    with open(os.path.join(raw_dir, "contestants.json"), "r", encoding="utf-8") as f:
+        raw_contestants = json.load(f)
+    with open(os.path.join(raw_dir, "seasons.json"), "r", encoding="utf-8") as f:
+        raw_seasons = json.load(f)
+
+    person_pages = [html for path, html in pages.items() if path.startswith("person.php")]
+    season_pages = [(int(path.split("=")[1]), html) for path, html in pages.items() if path.startswith("season.php")]
+    soups = [scrape.make_soup(html) for html in person_pages]
+
+    def get_stats():
+        for soup in soups:
+            stats = scrape.extract_stats(soup)
+            for label in STAT_LABELS:
+                scrape.lookup_stat(stats, label)
+
+    yield "get_stat (extract_stats)", get_stats
+    yield "parse_task_breakdown", lambda: [scrape.parse_task_breakdown(soup) for soup in soups]
+    yield "parse_contestant_profile", lambda: [scrape.parse_contestant_profile(html, i)
+                                               for i, html in enumerate(person_pages)]
+    yield "parse_season", lambda: [scrape.parse_season(html, sid) for sid, html in season_pages]
+
+    for scale in scales:
+        cs = scaled_contestants(raw_contestants, scale)
+        clean_dir = os.path.join(work, f"clean_{scale}x")
+        os.makedirs(clean_dir)
+
+        def clean_run(cs=cs, clean_dir=clean_dir):
+            # clean_data rewrites its inputs in place, so start from the raw files each time
+            for name, obj in (("contestants.json", cs), ("seasons.json", raw_seasons)):
+                with open(os.path.join(clean_dir, name), "w", encoding="utf-8") as f:
+                    json.dump(obj, f)
+            manifest = os.path.join(clean_dir, "manifest.json")
+            if os.path.exists(manifest):
+                os.remove(manifest)
+            saved_dir, clean_data.DATA_DIR = clean_data.DATA_DIR, clean_dir
+            try:
+                run_main(clean_data, [])
+            finally:
+                clean_data.DATA_DIR = saved_dir
+
+        yield f"build_analysis scrape {scale}x", lambda cs=cs: scrape.build_analysis(cs, raw_seasons)
+        with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+            clean_seasons = json.load(f)
+        yield f"build_analysis clean {scale}x", lambda cs=cs: analysis.build_analysis(cs, clean_seasons)
+        yield f"clean_data.main {scale}x", clean_run
+
+
+def compare_baseline(results: dict, baseline: dict, threshold: float, min_delta: float) -> list[str]:
+    """Cases slower or bigger than the baseline by more than threshold (a fraction)."""
+    regressions = []
+    for name, now in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        if now["seconds"] > base["seconds"] * (1 + threshold) and now["seconds"] - base["seconds"] > min_delta:
+            regressions.append(f"{name}: {base['seconds'] * 1e3:.1f} -> {now['seconds'] * 1e3:.1f} ms")
+        if now["peakMB"] > base["peakMB"] * (1 + threshold) and now["peakMB"] - base["peakMB"] > 1:
+            regressions.append(f"{name}: peak {base['peakMB']:.1f} -> {now['peakMB']:.1f} MB")
+    return regressions
+
+
+def bench_suite(args):
+    scales = [int(s) for s in args.scales.split(",")]
+    pages = load_fixtures()
+    print(f"{len(pages)} fixture pages, scales {scales}, best of {args.repeat}:")
+    results = {}
+    with tempfile.TemporaryDirectory() as work:
+        saved = scrape.DATA_DIR, scrape.CACHE_DIR, scrape.ARCHIVE_DIR
+        try:
+            for name, fn in suite_cases(pages, work, scales):
+                results[name] = measure(fn, args.repeat)
+                print(f"  {name:<30} {results[name]['seconds'] * 1e3:10.1f} ms {results[name]['peakMB']:9.1f} MB peak")
+        finally:
+            scrape.DATA_DIR, scrape.CACHE_DIR, scrape.ARCHIVE_DIR = saved
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("No baseline yet; run with --save-baseline to record one")
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    regressions = compare_baseline(results, baseline, args.threshold / 100, args.min_delta_ms / 1000)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold}% of baseline:")
+        for r in regressions:
+            print(f"  {r}")
+        raise SystemExit(1)
+    print(f"\nNo regressions beyond {args.threshold}% of baseline")
+
+
+def timed_wall(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def timed(fn) -> float:
+    start = time.process_time()
+    fn()
+    return time.process_time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scraper micro-benchmarks")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("parse", help="stat extraction on person.php pages")
+    p.add_argument("--pages", help="directory of saved person.php pages (*.html)")
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_parse)
+    p = sub.add_parser("parsers", help="profile parse timings across parser backends")
+    p.add_argument("--pages", help="directory of saved person.php pages (*.html)")
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_parsers)
+    p = sub.add_parser("dataset", help="contestant/season joins on synthetic data")
+    p.add_argument("--contestants", type=int, default=10_000)
+    p.add_argument("--seasons", type=int, default=500)
+    p.add_argument("--legacy-limit", type=int, default=10_000,
+                   help="skip the quadratic baseline above this many contestants")
+    p.set_defaults(func=bench_dataset)
+    p = sub.add_parser("analysis", help="columnar analysis engine vs the original build_analysis")
+    p.add_argument("--scale", type=int, default=100)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_analysis)
+    p = sub.add_parser("similar", help="batched top-k contestant neighbours")
+    p.add_argument("--scale", type=int, default=50)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_similar)
+    p = sub.add_parser("records", help="slotted contestant records vs dicts: round trip, memory, hot loops")
+    p.add_argument("--scale", type=int, default=50)
+    p.add_argument("--repeat", type=int, default=3)
+    p.set_defaults(func=bench_records)
+    p = sub.add_parser("export", help="compact export sizes and load times")
+    p.add_argument("--repeat", type=int, default=5)
+    p.set_defaults(func=bench_export)
+    p = sub.add_parser("pipeline", help="inline parsing vs the staged fetch/parse pipeline")
+    p.add_argument("--copies", type=int, default=10, help="times to repeat the rendered pages")
+    p.add_argument("--latency", type=float, default=5.0, help="simulated fetch latency in ms")
+    p.add_argument("--fetch-workers", type=int, default=scrape.MAX_WORKERS)
+    p.add_argument("--parse-workers", type=int, default=scrape.PARSE_WORKERS)
+    p.set_defaults(func=bench_pipeline)
+    p = sub.add_parser("suite", help="hot-path timings and peak memory, checked against a baseline")
+    p.add_argument("--scales", default="1,10,100,1000", help="contestant scale-ups to run (default 1,10,100,1000)")
+    p.add_argument("--repeat", type=int, default=3)
+    p.add_argument("--baseline", default=BASELINE_FILE)
+    p.add_argument("--save-baseline", action="store_true", help="record these results as the new baseline")
+    p.add_argument("--threshold", type=float, default=25.0, help="allowed slowdown in percent (default 25)")
+    p.add_argument("--min-delta-ms", type=float, default=5.0,
+                   help="ignore slowdowns smaller than this, to absorb timer noise")
+    p.set_defaults(func=bench_suite)
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,39 @@
 """
 Clean and enrich the scraped data:
-1. Filter to UK-only contestants
-2. Create accurate UK season data with winners
-3. Map site season IDs to actual UK series numbers
+1. Filter to the show's own contestants
+2. Create accurate season data with winners
+3. Map site season IDs to actual series numbers
+
+The UK (the default shard in ../data/) uses the curated UK_SEASONS table.
+With --shows, the other shows' shards listed in data/shows.json are cleaned
+too, each in its own process, with series numbers, years and winners taken
+from their scraped season pages.
 """
 
+import argparse
 import json
 import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregates import AggregateStore, compare
+from analysis import AnalysisEngine, assemble_analysis, build_analysis, winner_groups
+from dataset import Dataset
+from episodes import EPISODES_FILE
+from manifest import Manifest
+from metrics import PROFILE_MODES, metrics
+from names import NameIndex
+from rankings import build_rankings
+from records import to_json as records_to_json
+from records import to_records
+from search_index import build_index
+from shows import DEFAULT_SHOW, DEFAULT_SLUG, load_index, shard_dir, update_index
+from similarity import build_similar
 
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+# The client serves its copy of the UK data files from here
+CLIENT_DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "client", "public", "data")
 
 # Site season ID -> UK Series mapping (from taskmaster.info/show.php?id=1)
 UK_SEASONS = {
@@ -35,42 +60,136 @@ UK_SEASONS = {
     77: {"series": 20, "year": 2025, "winner": "Maisie Adam",        "episodes": 10},
 }
 
-# Non-UK contestant IDs to exclude (hosts + international shows)
-NON_UK_IDS = {
-    112, 113, 114, 115, 116, 117, 118, 119, 120, 121, 122, 123, 124,  # Norwegian
-    143, 144, 145, 146, 147,  # Danish
-}
+UK_SHOW = {"id": DEFAULT_SHOW, "name": "Taskmaster UK", "slug": DEFAULT_SLUG, "seasonIds": sorted(UK_SEASONS)}
 
 
 def main():
-    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
-        contestants = json.load(f)
+    parser = argparse.ArgumentParser(description="Clean scraped data into per-show seasons and analysis")
+    parser.add_argument("--only-changed", action="store_true",
+                        help="skip cleaning when the last scrape changed nothing or was already cleaned")
+    parser.add_argument("--incremental", action="store_true",
+                        help="update analysis aggregates only for contestants changed in the last scrape")
+    parser.add_argument("--verify", action="store_true",
+                        help="check incremental aggregates against a full recompute")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help="capture a cProfile and/or tracemalloc profile into the run metrics")
+    parser.add_argument("--shows", metavar="all|ID,ID",
+                        help="clean these shows' shards from data/shows.json (1 = UK; default UK only)")
+    args = parser.parse_args()
+    with metrics.run("clean_data", os.path.join(DATA_DIR, "run_metrics.jsonl"), profile=args.profile):
+        run(args)
+
+
+def run(args):
+    metrics.phase("load")
+    manifest = Manifest(os.path.join(DATA_DIR, "manifest.json"))
+    last_run = manifest.last_run()
+    if args.only_changed and (last_run.get("cleaned") or not (last_run.get("changedSeasons") or last_run.get("changedContestants"))):
+        print("No changes since the last clean; nothing to do")
+        return
+
+    shows = selected_shows(args.shows)
+    others = [show for show in shows if show["id"] != DEFAULT_SHOW]
+    counts = {}
+    # Shards are independent: other shows clean in worker processes while the UK cleans here
+    with ProcessPoolExecutor(max_workers=max(1, min(len(others), os.cpu_count() or 1))) as pool:
+        futures = {show["id"]: pool.submit(clean_shard, DATA_DIR, show, args, last_run) for show in others}
+        if any(show["id"] == DEFAULT_SHOW for show in shows):
+            counts[DEFAULT_SHOW] = clean_show(DATA_DIR, UK_SHOW, args, last_run)
+        for show_id, future in futures.items():
+            counts[show_id], worker_metrics = future.result()
+            metrics.merge(worker_metrics)
+    update_index(DATA_DIR, shows, counts)
+
+    if last_run:
+        last_run["cleaned"] = True
+        manifest.save()
+
+
+def selected_shows(value: str | None) -> list[dict]:
+    """Show entries for a --shows value: UK by default, "all" for every indexed show."""
+    if not value:
+        return [UK_SHOW]
+    indexed = {show["id"]: show for show in load_index(DATA_DIR)}
+    indexed[DEFAULT_SHOW] = UK_SHOW
+    ids = sorted(indexed) if value == "all" else [int(v) for v in value.split(",") if v.strip()]
+    missing = [i for i in ids if i not in indexed]
+    if missing:
+        sys.exit(f"Shows {missing} are not in {os.path.join(DATA_DIR, 'shows.json')}; scrape them first")
+    return [indexed[i] for i in ids]
+
+
+def clean_shard(root: str, show: dict, args, last_run: dict) -> tuple[dict, dict]:
+    """clean_show in a pool worker. Returns its record counts and the worker's
+    metrics snapshot, since metrics recorded in a worker process never reach
+    the parent's registry. Workers are reused, so each task starts from zero."""
+    metrics.reset()
+    counts = clean_show(root, show, args, last_run)
+    metrics.phase(None)
+    return counts, metrics.snapshot()
+
 
-    with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+def is_cleaned(seasons: list[dict]) -> bool:
+    """Whether seasons.json was already written by clean_data (series numbers,
+    no site IDs), so its contestants' seasonIds are series numbers too."""
+    return bool(seasons) and not any("id" in s for s in seasons)
+
+
+def season_table(show: dict, raw_seasons: list[dict]) -> dict[int, dict]:
+    """Site season ID -> {series, year, winner, episodes} for a show."""
+    if show["id"] == DEFAULT_SHOW:
+        return UK_SEASONS
+    cleaned = is_cleaned(raw_seasons)
+    by_site_id = {s["id"]: s for s in raw_seasons if "id" in s}
+    by_series = {s["seriesNumber"]: s for s in raw_seasons} if cleaned else {}
+    table = {}
+    for series, site_id in enumerate(show["seasonIds"], 1):
+        raw = by_series.get(series, {}) if cleaned else by_site_id.get(site_id, {})
+        table[site_id] = {"series": series, "year": raw.get("year", 0),
+                          "winner": (raw.get("winner") or {}).get("name", ""),
+                          "episodes": raw.get("episodes" if cleaned else "episodeCount", 0)}
+    return table
+
+
+def clean_show(root: str, show: dict, args, last_run: dict) -> dict:
+    """Clean one show's shard in place; returns its record counts for the index."""
+    data_dir = shard_dir(root, show)
+    label = "UK" if show["id"] == DEFAULT_SHOW else show["name"]
+    with open(os.path.join(data_dir, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = to_records(json.load(f))
+
+    with open(os.path.join(data_dir, "seasons.json"), "r", encoding="utf-8") as f:
         raw_seasons = json.load(f)
 
-    # Filter out non-UK contestants
-    uk_contestants = [c for c in contestants if c["id"] not in NON_UK_IDS]
-    print(f"Filtered {len(contestants)} -> {len(uk_contestants)} UK contestants")
+    metrics.phase("clean")
+    table = season_table(show, raw_seasons)
+    cleaned = is_cleaned(raw_seasons)
+    # Site season ID -> series number; a shard cleaned before already has series numbers
+    if cleaned:
+        site_to_series = {info["series"]: info["series"] for info in table.values()}
+    else:
+        site_to_series = {site_id: info["series"] for site_id, info in table.items()}
 
-    # Fix season IDs on contestant profiles
-    site_to_series = {}
-    for site_id, info in UK_SEASONS.items():
-        site_to_series[site_id] = info["series"]
+    # Keep only contestants who appeared in this show (older scrapes mixed in other shows)
+    show_contestants = [c for c in contestants
+                        if not c.get("seasonIds") or any(s in site_to_series for s in c["seasonIds"])]
+    print(f"Filtered {len(contestants)} -> {len(show_contestants)} {label} contestants")
 
-    for c in uk_contestants:
+    # Fix season IDs on contestant profiles
+    for c in show_contestants:
         old_seasons = c.get("seasonIds", [])
         c["seasonIds"] = [site_to_series.get(s, s) for s in old_seasons]
 
-    # Build clean UK seasons data
-    uk_seasons = []
-    for site_id, info in sorted(UK_SEASONS.items()):
-        season_data = next((s for s in raw_seasons if s["id"] == site_id), None)
+    # Build clean seasons data for this show
+    raw = Dataset(show_contestants, raw_seasons)
+    show_seasons = []
+    for site_id, info in sorted(table.items()):
+        season_data = raw.season(info["series"]) if cleaned else raw.season_by_site_id(site_id)
         contestants_in_season = []
         winner_id = None
         if season_data:
             for sc in season_data.get("contestants", []):
-                contestant = next((c for c in uk_contestants if c["id"] == sc["id"]), None)
+                contestant = raw.contestant(sc["id"])
                 if contestant:
                     contestants_in_season.append({
                         "id": sc["id"],
@@ -79,9 +198,9 @@ def main():
                         "pointsPerTask": contestant.get("pointsPerTask", 0),
                         "episodeWinPct": contestant.get("episodeWinPct", 0),
                     })
-                # Match winner by name (partial match for names like "Dara")
-                if info["winner"].lower() in sc["name"].lower():
-                    winner_id = sc["id"]
+            # Match winner by name, alias ("Dara") or a close spelling
+            if info["winner"]:
+                winner_id = NameIndex(season_data.get("contestants", [])).resolve(info["winner"])
 
         if winner_id is None and contestants_in_season:
             # Fallback: pick contestant with most total points
@@ -104,86 +223,94 @@ def main():
                 "name": winner_name
             }
         }
-        uk_seasons.append(season_entry)
+        show_seasons.append(season_entry)
+
+    # Rebuild analysis with clean data, or apply deltas to the stored aggregates
+    metrics.phase("analysis")
+    aggregates_file = os.path.join(data_dir, "analysis_aggregates.json")
+    store = AggregateStore.load(aggregates_file) if args.incremental else None
+    deltas = None
+    if store is None:
+        analysis = build_analysis(show_contestants, show_seasons)
+        store = AggregateStore.from_contestants(show_contestants)
+    else:
+        start = time.perf_counter()
+        changed = set(last_run.get("changedContestants", []))
+        deltas = store.sync(show_contestants, changed)
+        metrics.count("aggregates.deltas", deltas)
+        analysis = assemble_analysis(store.group_stats(), store.total, show_seasons)
+        print(f"Applied {deltas} aggregate deltas in {(time.perf_counter() - start) * 1000:.1f}ms")
+
+    if args.verify:
+        metrics.phase("verify")
+        rebuilt = AggregateStore.from_contestants(show_contestants)
+        mismatches = compare(store.group_stats(), winner_groups(AnalysisEngine(show_contestants, show_seasons)))
+        if not store.same_state(rebuilt) or mismatches:
+            print("Verify FAILED: incremental aggregates differ from a full recompute")
+            for m in mismatches:
+                print(f"  {m}")
+            sys.exit(1)
+        print("Verify OK: incremental aggregates match a full recompute")
 
-    # Rebuild analysis with clean data
-    analysis = build_analysis(uk_contestants, uk_seasons)
+    # Ranks, neighbour lists and BM25 weights are global (one changed contestant
+    # can move all of them), so there is no delta to apply: --incremental keeps
+    # the existing files when nothing they are built from changed, else rebuilds
+    episodes_file = EPISODES_FILE if show["id"] == DEFAULT_SHOW else None
+    derived = {name: os.path.join(data_dir, f"{name}.json") for name in ("rankings", "similar", "search_index")}
+    # The client ranks the UK explorer from its own copy of rankings.json
+    client_rankings = os.path.join(CLIENT_DATA_DIR, "rankings.json") if show["id"] == DEFAULT_SHOW else None
+    unchanged = (deltas == 0 and not last_run.get("changedSeasons")
+                 and all(os.path.exists(path) for path in derived.values()))
+    reuse = {name: unchanged for name in derived}
+    if client_rankings and not os.path.exists(client_rankings):
+        reuse["rankings"] = False
+    if episodes_file and os.path.exists(episodes_file) and reuse["search_index"]:
+        reuse["search_index"] = os.path.getmtime(episodes_file) <= os.path.getmtime(derived["search_index"])
+    if all(reuse.values()):
+        print("No contestant or season changes; rankings, similar and search_index left as is")
+    if not reuse["rankings"]:
+        with metrics.timer("build_rankings"):
+            rankings = build_rankings(show_contestants, show_seasons)
+    if not reuse["similar"]:
+        with metrics.timer("build_similar"):
+            similar = build_similar(show_contestants)
+    if not reuse["search_index"]:
+        with metrics.timer("build_index"):
+            search_index = build_index(show_contestants, show_seasons, episodes_file)
 
     # Save cleaned data
-    with open(os.path.join(DATA_DIR, "contestants.json"), "w", encoding="utf-8") as f:
-        json.dump(uk_contestants, f, indent=2, ensure_ascii=False)
-    print(f"Saved {len(uk_contestants)} UK contestants")
+    metrics.phase("save")
+    metrics.count("contestants", len(show_contestants))
+    with open(os.path.join(data_dir, "contestants.json"), "w", encoding="utf-8") as f:
+        json.dump(records_to_json(show_contestants), f, indent=2, ensure_ascii=False)
+    print(f"Saved {len(show_contestants)} {label} contestants")
 
-    with open(os.path.join(DATA_DIR, "seasons.json"), "w", encoding="utf-8") as f:
-        json.dump(uk_seasons, f, indent=2, ensure_ascii=False)
-    print(f"Saved {len(uk_seasons)} UK seasons")
+    with open(os.path.join(data_dir, "seasons.json"), "w", encoding="utf-8") as f:
+        json.dump(show_seasons, f, indent=2, ensure_ascii=False)
+    print(f"Saved {len(show_seasons)} {label} seasons")
 
-    with open(os.path.join(DATA_DIR, "analysis.json"), "w", encoding="utf-8") as f:
+    with open(os.path.join(data_dir, "analysis.json"), "w", encoding="utf-8") as f:
         json.dump(analysis, f, indent=2, ensure_ascii=False)
     print("Saved analysis.json")
 
+    if not reuse["rankings"]:
+        for path in filter(None, (derived["rankings"], client_rankings)):
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(rankings, f, indent=2, ensure_ascii=False)
+        print(f"Saved rankings.json ({rankings['ranked']} ranked contestants)")
 
-def build_analysis(contestants, seasons):
-    valid = [c for c in contestants if "error" not in c and c.get("episodes", 0) >= 5]
-    winners = [c for c in valid if c.get("seasonWins", 0) > 0]
-    non_winners = [c for c in valid if c.get("seasonWins", 0) == 0]
-
-    def avg(group, key):
-        vals = [c.get(key, 0) for c in group if c.get(key, 0) != 0]
-        return round(sum(vals) / len(vals), 2) if vals else 0
-
-    def avg_bd(group, cat, key, metric="ppt"):
-        vals = []
-        for c in group:
-            bd = c.get("taskBreakdown", {}).get(cat, {}).get(key, {})
-            if bd and metric in bd and bd[metric] > 0:
-                vals.append(bd[metric])
-        return round(sum(vals) / len(vals), 2) if vals else 0
-
-    def stats(group):
-        return {
-            "count": len(group),
-            "avgPointsPerTask": avg(group, "pointsPerTask"),
-            "avgPointsPerEpisode": avg(group, "pointsPerEpisode"),
-            "avgEpisodeWinPct": avg(group, "episodeWinPct"),
-            "avgTaskWinPct": avg(group, "taskWinPct"),
-            "byTaskType": {
-                "prize": avg_bd(group, "setting", "prize"),
-                "filmed": avg_bd(group, "setting", "filmed"),
-                "live": avg_bd(group, "setting", "live"),
-            },
-            "byActivity": {
-                "creative": avg_bd(group, "activity", "creative"),
-                "mental": avg_bd(group, "activity", "mental"),
-                "physical": avg_bd(group, "activity", "physical"),
-                "social": avg_bd(group, "activity", "social"),
-            },
-            "byJudgement": {
-                "objective": avg_bd(group, "judgement", "objective"),
-                "subjective": avg_bd(group, "judgement", "subjective"),
-                "combo": avg_bd(group, "judgement", "combo"),
-            },
-        }
+    if not reuse["similar"]:
+        with open(derived["similar"], "w", encoding="utf-8") as f:
+            json.dump(similar, f, ensure_ascii=False)
+        print(f"Saved similar.json (top {similar['k']} for {len(similar['contestants'])} contestants)")
 
-    return {
-        "totalContestants": len(valid),
-        "totalSeasons": len(seasons),
-        "winners": stats(winners),
-        "nonWinners": stats(non_winners),
-        "seasonWinners": [
-            {
-                "season": s["seriesNumber"],
-                "name": s["winner"]["name"],
-                "id": s["winner"]["id"],
-            }
-            for s in seasons
-        ],
-        "keyInsights": [
-            "Comparing season winners vs non-winners across all task categories",
-            "Task type performance correlations with series victory",
-            "Episode win percentage patterns for champions",
-        ],
-    }
+    if not reuse["search_index"]:
+        with open(derived["search_index"], "w", encoding="utf-8") as f:
+            json.dump(search_index, f, ensure_ascii=False, separators=(",", ":"))
+        print(f"Saved search_index.json ({len(search_index['docs'])} documents, {len(search_index['postings'])} terms)")
+
+    store.save(aggregates_file)
+    return {"contestants": len(show_contestants), "seasons": len(show_seasons)}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,42 @@
+"""
+Indexed in-memory view over contestants and seasons.
+
+Built in a single pass over both lists, it replaces the linear `next(...)` /
+`any(...)` scans that scrape.py and clean_data.py used to resolve contestants
+by ID, seasons by series or site ID, and the seasons each contestant appeared in.
+The underlying dicts are shared, not copied.
+"""
+
+
+class Dataset:
+    def __init__(self, contestants: list[dict], seasons: list[dict]):
+        self.contestants = contestants
+        self.seasons = seasons
+        self.by_id: dict[int, dict] = {}
+        self.by_series: dict[int, dict] = {}
+        self.by_site_id: dict[int, dict] = {}
+        self.series_of: dict[int, list[int]] = {}
+
+        for c in contestants:
+            self.by_id.setdefault(c["id"], c)
+        for s in seasons:
+            series = s.get("seriesNumber")
+            self.by_series.setdefault(series, s)
+            if "id" in s:
+                self.by_site_id.setdefault(s["id"], s)
+            for sc in s.get("contestants", []):
+                self.series_of.setdefault(sc["id"], []).append(series)
+
+    def contestant(self, contestant_id: int) -> dict | None:
+        return self.by_id.get(contestant_id)
+
+    def season(self, series: int) -> dict | None:
+        return self.by_series.get(series)
+
+    def season_by_site_id(self, site_id: int) -> dict | None:
+        """Look up a raw scraped season by its taskmaster.info season ID."""
+        return self.by_site_id.get(site_id)
+
+    def seasons_for(self, contestant_id: int) -> list[int]:
+        """Series numbers the contestant appears in, in season order."""
+        return self.series_of.get(contestant_id, [])
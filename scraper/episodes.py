@@ -0,0 +1,157 @@
+"""
+Streaming access to episode/task data.
+
+episodes.json is one large dict (series -> episodes -> tasks -> scores), and
+episodes.jsonl (written by scrape_episodes.py) holds one episode per line.
+The readers here yield one episode or task at a time from either format without
+loading the whole file, so memory stays flat as series are added:
+
+    for series, ep in iter_episodes(series=20): ...
+    for series, episode, task in iter_tasks(series=19, episode=3): ...
+
+EpisodesWriter produces episodes.json incrementally from a stream of episodes.
+"""
+
+import json
+import os
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+EPISODES_FILE = os.path.join(DATA_DIR, "episodes.json")
+EPISODES_STREAM = os.path.join(DATA_DIR, "episodes.jsonl")
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _JsonStream:
+    """Incremental tokenizer over a file holding {"key": [value, ...], ...}."""
+
+    def __init__(self, f):
+        self.f = f
+        self.buf = ""
+        self.pos = 0
+        self.decoder = json.JSONDecoder()
+        self.eof = False
+
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        chunk = self.f.read(CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos].isspace():
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise ValueError(f"expected {char!r} in episodes file, got {self.peek()!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode the next complete JSON value, reading more input until it parses."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # A number at the buffer edge may be cut short; make sure it is terminated
+            if end == len(self.buf) and not self.eof and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+
+def _iter_json(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        stream = _JsonStream(f)
+        stream.expect("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            series = int(stream.value())
+            stream.expect(":")
+            stream.expect("[")
+            if stream.peek() != "]":
+                while True:
+                    yield series, stream.value()
+                    if stream.peek() != ",":
+                        break
+                    stream.pos += 1
+            stream.expect("]")
+            if stream.peek() != ",":
+                break
+            stream.pos += 1
+        stream.expect("}")
+
+
+def _iter_jsonl(path: str):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn final line from an interrupted run
+            if "episode" in rec:
+                yield rec["series"], {k: v for k, v in rec.items() if k != "series"}
+
+
+def iter_episodes(path: str | None = None, series: int | None = None):
+    """Yield (series, episode) pairs from episodes.json or episodes.jsonl."""
+    path = path or EPISODES_FILE
+    records = _iter_jsonl(path) if path.endswith(".jsonl") else _iter_json(path)
+    for s, ep in records:
+        if series is None or s == series:
+            yield s, ep
+
+
+def iter_tasks(path: str | None = None, series: int | None = None, episode: int | None = None):
+    """Yield (series, episode number, task) for every task, optionally filtered."""
+    for s, ep in iter_episodes(path, series):
+        if episode is None or ep["episode"] == episode:
+            for task in ep["tasks"]:
+                yield s, ep["episode"], task
+
+
+class EpisodesWriter:
+    """Write episodes.json one episode at a time; episodes must arrive grouped by series."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.tmp = f"{path}.tmp"
+        self.f = open(self.tmp, "w", encoding="utf-8")
+        self.f.write("{")
+        self.series = None
+        self.first_episode = True
+
+    def write(self, series: int, episode: dict) -> None:
+        if series != self.series:
+            if self.series is not None:
+                self.f.write("\n  ],")
+            self.f.write(f"\n  {json.dumps(str(series))}: [")
+            self.series = series
+            self.first_episode = True
+        body = json.dumps(episode, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+        self.f.write(("" if self.first_episode else ",") + "\n    " + body)
+        self.first_episode = False
+
+    def close(self) -> None:
+        if self.series is not None:
+            self.f.write("\n  ]\n")
+        self.f.write("}")
+        self.f.flush()
+        os.fsync(self.f.fileno())
+        self.f.close()
+        os.replace(self.tmp, self.path)
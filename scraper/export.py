@@ -0,0 +1,350 @@
+"""
+Export compact variants of the data files into data/compact/:
+
+- contestants.tmcol / episodes.tmcol: columnar binary with a JSON schema header,
+  fixed-width little-endian numeric columns and a dictionary-encoded string
+  table (names, titles, judgement types)
+- *.min.json plus pre-compressed .gz (and .br when the brotli module is installed)
+
+Columnar layout:
+    MAGIC | u32 header length | header JSON | column data (8-byte aligned)
+
+The header lists each table's row count and, per column, its kind, dtype,
+byte offset and length. Kinds:
+    int    integers, smallest signed dtype that fits; NULL_INT marks absent values
+    fixed  decimals stored as integers scaled by `scale` (lossless for the
+           1-2 decimal values taskmaster.info publishes)
+    float  raw float64 fallback for values that are not short decimals
+    str    uint16/uint32 index into the string table (dtype max marks absent)
+    json   index of a JSON-encoded value, for columns mixing strings and numbers
+           or holding empty objects
+    list   int values plus a uint32 offsets column (row i spans offsets[i]:offsets[i+1]);
+           nullable list columns add a uint8 `present` column
+
+Contestant records are flattened to dotted paths (taskBreakdown.format.solo.ppt)
+so any field the scraper adds is exported without schema changes; an empty
+object (a category with no tasks) is kept as a {} leaf. read_contestants()
+rebuilds the nested dicts with their keys in the original order: the columns
+follow the first record's order, and the header lists the key order of any
+row that differs. Explicit nulls are not told apart from absent fields (the
+scraper never writes them).
+
+Run after clean_data.py:
+    python export.py
+"""
+
+import gzip
+import json
+import os
+import struct
+
+import numpy as np
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+COMPACT_DIR = os.path.join(DATA_DIR, "compact")
+
+MAGIC = b"TMCOL\x01"
+NULL_INT = -(2 ** 31)
+INT_DTYPES = ["<i1", "<i2", "<i4", "<i8"]
+
+
+def flatten(record: dict, prefix: str = "") -> dict:
+    out = {}
+    for k, v in record.items():
+        path = f"{prefix}{k}"
+        if isinstance(v, dict) and v:
+            out.update(flatten(v, path + "."))
+        else:
+            out[path] = v
+    return out
+
+
+def unflatten(flat: dict) -> dict:
+    out: dict = {}
+    for path, v in flat.items():
+        node = out
+        *parents, leaf = path.split(".")
+        for p in parents:
+            node = node.setdefault(p, {})
+        node[leaf] = v
+    return out
+
+
+def decimal_scale(values: list[float]) -> int | None:
+    """Smallest power-of-ten scale that makes every value an exact integer, if any."""
+    for scale in (1, 10, 100, 1000, 10000):
+        if all(float(round(v * scale)) / scale == v for v in values):
+            return scale
+    return None
+
+
+def smallest_int_dtype(values, nullable: bool) -> str:
+    lo = min(values, default=0)
+    hi = max(values, default=0)
+    if nullable:
+        return "<i4" if -(2 ** 31) < lo and hi < 2 ** 31 else "<i8"
+    for dtype in INT_DTYPES:
+        info = np.iinfo(np.dtype(dtype))
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    raise ValueError(f"integer column out of range: {lo}..{hi}")
+
+
+class StringTable:
+    def __init__(self):
+        self.index: dict[str, int] = {}
+        self.strings: list[str] = []
+
+    def code(self, s: str) -> int:
+        if s not in self.index:
+            self.index[s] = len(self.strings)
+            self.strings.append(s)
+        return self.index[s]
+
+
+class ColumnarWriter:
+    def __init__(self):
+        self.strings = StringTable()
+        self.tables: dict[str, dict] = {}
+        self.blobs: list[bytes] = []
+        self.offset = 0
+
+    def _add_blob(self, arr: np.ndarray) -> dict:
+        data = arr.tobytes()
+        pad = (-len(data)) % 8
+        entry = {"dtype": arr.dtype.str, "offset": self.offset, "length": len(data)}
+        self.blobs.append(data + b"\0" * pad)
+        self.offset += len(data) + pad
+        return entry
+
+    def _codes(self, values: list) -> np.ndarray:
+        """String-table codes in the narrowest unsigned dtype; its max value marks absent."""
+        codes = [None if v is None else self.strings.code(v) for v in values]
+        dtype = "<u2" if max((c for c in codes if c is not None), default=0) < 0xFFFF else "<u4"
+        null = np.iinfo(np.dtype(dtype)).max
+        return np.array([null if c is None else c for c in codes], dtype=dtype)
+
+    def add_column(self, table: str, name: str, values: list) -> None:
+        """Add a column, choosing its encoding from the values; None means absent."""
+        t = self.tables.setdefault(table, {"rows": len(values), "columns": {}})
+        present = [v for v in values if v is not None]
+        nullable = len(present) < len(values)
+        if any(isinstance(v, list) for v in present):
+            flat = [x for v in values for x in (v or [])]
+            offsets = np.cumsum([0] + [len(v or []) for v in values]).astype("<u4")
+            col = {"kind": "list", **self._add_blob(np.array(flat, dtype=smallest_int_dtype(flat, False)))}
+            col["offsets"] = self._add_blob(offsets)
+            if nullable:
+                col["present"] = self._add_blob(np.array([v is not None for v in values], dtype="u1"))
+        elif all(isinstance(v, str) for v in present) and present:
+            col = {"kind": "str", **self._add_blob(self._codes(values))}
+        elif any(isinstance(v, (str, dict)) for v in present):
+            # Mixed strings and numbers (e.g. series 20's slug contestant IDs), or empty objects
+            col = {"kind": "json", **self._add_blob(self._codes([None if v is None else json.dumps(v) for v in values]))}
+        elif any(isinstance(v, float) for v in present):
+            scale = decimal_scale(present)
+            if scale is None:
+                arr = np.array([np.nan if v is None else v for v in values], dtype="<f8")
+                col = {"kind": "float", **self._add_blob(arr)}
+            else:
+                ints = [NULL_INT if v is None else round(v * scale) for v in values]
+                col = {"kind": "fixed", "scale": scale,
+                       **self._add_blob(np.array(ints, dtype=smallest_int_dtype(ints, nullable)))}
+        else:
+            ints = [NULL_INT if v is None else int(v) for v in values]
+            col = {"kind": "int", **self._add_blob(np.array(ints, dtype=smallest_int_dtype(ints, nullable)))}
+        col["nullable"] = nullable
+        t["columns"][name] = col
+
+    def write(self, path: str) -> int:
+        encoded = [s.encode("utf-8") for s in self.strings.strings]
+        string_offsets = np.cumsum([0] + [len(b) for b in encoded]).astype("<u4")
+        strings = {
+            "offsets": self._add_blob(string_offsets),
+            "data": self._add_blob(np.frombuffer(b"".join(encoded), dtype="u1")),
+        }
+        header = json.dumps({"version": 1, "strings": strings, "tables": self.tables},
+                            separators=(",", ":")).encode("utf-8")
+        prefix = MAGIC + struct.pack("<I", len(header)) + header
+        prefix += b"\0" * ((-len(prefix)) % 8)
+        with open(path, "wb") as f:
+            f.write(prefix)
+            for blob in self.blobs:
+                f.write(blob)
+        return len(prefix) + self.offset
+
+
+class ColumnarFile:
+    """Zero-copy reader: columns are NumPy views over the file bytes."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.buf = f.read()
+        if not self.buf.startswith(MAGIC):
+            raise ValueError(f"{path} is not a columnar export")
+        (header_len,) = struct.unpack_from("<I", self.buf, len(MAGIC))
+        start = len(MAGIC) + 4
+        self.header = json.loads(self.buf[start:start + header_len])
+        self.base = start + header_len + ((-(start + header_len)) % 8)
+        strings = self.header["strings"]
+        offsets = self._array(strings["offsets"])
+        data = self._array(strings["data"]).tobytes()
+        self.strings = [data[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+    def _array(self, entry: dict) -> np.ndarray:
+        return np.frombuffer(self.buf, dtype=entry["dtype"], count=entry["length"] // np.dtype(entry["dtype"]).itemsize,
+                             offset=self.base + entry["offset"])
+
+    def rows(self, table: str) -> int:
+        return self.header["tables"][table]["rows"]
+
+    def column(self, table: str, name: str) -> np.ndarray:
+        """Raw column array (codes for str, scaled ints for fixed, flat values for list)."""
+        return self._array(self.header["tables"][table]["columns"][name])
+
+    def values(self, table: str, name: str) -> list:
+        """Decoded Python values for a column, with None for absent entries."""
+        col = self.header["tables"][table]["columns"][name]
+        arr = self._array(col)
+        kind = col["kind"]
+        if kind == "list":
+            offsets = self._array(col["offsets"])
+            flat = arr.tolist()
+            lists = [flat[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+            if "present" in col:
+                lists = [v if p else None for v, p in zip(lists, self._array(col["present"]).tolist())]
+            return lists
+        if kind in ("str", "json"):
+            null = np.iinfo(arr.dtype).max
+            decode = json.loads if kind == "json" else str
+            return [None if c == null else decode(self.strings[c]) for c in arr.tolist()]
+        if kind == "float":
+            return [None if np.isnan(v) else v for v in arr.tolist()]
+        if kind == "fixed":
+            scale = col["scale"]
+            return [None if v == NULL_INT else v / scale for v in arr.tolist()]
+        return [None if v == NULL_INT and col["nullable"] else v for v in arr.tolist()]
+
+
+def write_contestants(contestants: list[dict], path: str) -> int:
+    flat = [flatten(c) for c in contestants]
+    paths: dict[str, None] = {}
+    for f in flat:
+        paths.update(dict.fromkeys(f))
+    writer = ColumnarWriter()
+    for p in paths:
+        writer.add_column("contestants", p, [f.get(p) for f in flat])
+    order = list(paths)
+    key_orders = {str(i): list(f) for i, f in enumerate(flat) if list(f) != [p for p in order if p in f]}
+    if key_orders:
+        writer.tables["contestants"]["keyOrders"] = key_orders
+    return writer.write(path)
+
+
+def read_contestants(path: str) -> list[dict]:
+    cf = ColumnarFile(path)
+    table = cf.header["tables"]["contestants"]
+    columns = {name: cf.values("contestants", name) for name in table["columns"]}
+    key_orders = table.get("keyOrders", {})
+    out = []
+    for i in range(cf.rows("contestants")):
+        order = key_orders.get(str(i), columns)
+        out.append(unflatten({p: columns[p][i] for p in order if columns[p][i] is not None}))
+    return out
+
+
+def write_episodes(episodes: dict, path: str) -> int:
+    """Episodes as two tables: one row per episode and a flat task-score table."""
+    ep_rows = {"series": [], "episode": [], "title": []}
+    scores = {"series": [], "episode": [], "taskId": [], "taskName": [], "judgement": [],
+              "contestantId": [], "contestantName": [], "score": []}
+    for series, eps in episodes.items():
+        for ep in eps:
+            ep_rows["series"].append(int(series))
+            ep_rows["episode"].append(ep["episode"])
+            ep_rows["title"].append(ep["title"])
+            for task in ep["tasks"]:
+                for c in task["contestants"]:
+                    scores["series"].append(int(series))
+                    scores["episode"].append(ep["episode"])
+                    scores["taskId"].append(task["id"])
+                    scores["taskName"].append(task["name"])
+                    scores["judgement"].append(task["judgement"])
+                    scores["contestantId"].append(c["id"])
+                    scores["contestantName"].append(c["name"])
+                    scores["score"].append(c["score"])
+    writer = ColumnarWriter()
+    for name, values in ep_rows.items():
+        writer.add_column("episodes", name, values)
+    for name, values in scores.items():
+        writer.add_column("scores", name, values)
+    return writer.write(path)
+
+
+def read_episodes(path: str) -> dict:
+    """Rebuild the nested series -> episodes -> tasks -> scores dict."""
+    cf = ColumnarFile(path)
+    eps = {name: cf.values("episodes", name) for name in ("series", "episode", "title")}
+    out: dict[str, list] = {}
+    by_key = {}
+    for series, number, title in zip(eps["series"], eps["episode"], eps["title"]):
+        ep = {"episode": number, "title": title, "tasks": []}
+        out.setdefault(str(series), []).append(ep)
+        by_key[(series, number)] = ep
+    cols = {name: cf.values("scores", name) for name in cf.header["tables"]["scores"]["columns"]}
+    last_task = None
+    for i in range(cf.rows("scores")):
+        ep = by_key[(cols["series"][i], cols["episode"][i])]
+        key = (cols["series"][i], cols["episode"][i], cols["taskId"][i])
+        if key != last_task:
+            ep["tasks"].append({"id": cols["taskId"][i], "name": cols["taskName"][i],
+                                "judgement": cols["judgement"][i], "contestants": []})
+            last_task = key
+        ep["tasks"][-1]["contestants"].append({"id": cols["contestantId"][i], "name": cols["contestantName"][i],
+                                               "score": cols["score"][i]})
+    return out
+
+
+def write_minified(obj, name: str) -> dict[str, int]:
+    """Write name.min.json plus .gz and (if available) .br; return sizes by suffix."""
+    data = json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    base = os.path.join(COMPACT_DIR, f"{name}.min.json")
+    sizes = {".min.json": len(data)}
+    with open(base, "wb") as f:
+        f.write(data)
+    gz = gzip.compress(data, compresslevel=9, mtime=0)
+    with open(base + ".gz", "wb") as f:
+        f.write(gz)
+    sizes[".min.json.gz"] = len(gz)
+    if brotli is not None:
+        br = brotli.compress(data, quality=11)
+        with open(base + ".br", "wb") as f:
+            f.write(br)
+        sizes[".min.json.br"] = len(br)
+    return sizes
+
+
+def main():
+    os.makedirs(COMPACT_DIR, exist_ok=True)
+    for name in ("contestants", "seasons", "analysis", "episodes"):
+        path = os.path.join(DATA_DIR, f"{name}.json")
+        if not os.path.exists(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            obj = json.load(f)
+        sizes = write_minified(obj, name)
+        if name == "contestants":
+            sizes[".tmcol"] = write_contestants(obj, os.path.join(COMPACT_DIR, "contestants.tmcol"))
+        elif name == "episodes":
+            sizes[".tmcol"] = write_episodes(obj, os.path.join(COMPACT_DIR, "episodes.tmcol"))
+        print(f"{name}.json ({os.path.getsize(path)} bytes): "
+              + ", ".join(f"{suffix} {size}" for suffix, size in sizes.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Persistent on-disk HTTP response cache for the scraper.
+
+Bodies are stored one file per URL under data/.http_cache/, with an index.json
+holding the validators (ETag / Last-Modified), fetch time and last access time
+for each entry. Entries younger than the TTL are served without touching the
+network; older ones are revalidated with a conditional GET. The cache is kept
+under a byte budget by evicting least recently used entries.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+
+DEFAULT_TTL = 24 * 3600  # seconds before an entry must be revalidated
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+FLUSH_EVERY = 20  # index writes are batched; flush() is also called at the end of a run
+
+
+class HttpCache:
+    def __init__(self, cache_dir: str, ttl: float = DEFAULT_TTL, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.index_file = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = 0
+        self.hits = self.revalidated = self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index: dict[str, dict] = {}
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+            except (OSError, ValueError):
+                self.index = {}
+
+    def _body_path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".html")
+
+    def _read_body(self, url: str) -> str | None:
+        try:
+            with open(self._body_path(url), "r", encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def lookup(self, url: str, revalidate: bool = False) -> tuple[str | None, dict]:
+        """Return (fresh_body, conditional_headers) for url.
+
+        fresh_body is set when the entry is within the TTL and can be used as-is.
+        Otherwise conditional_headers carries If-None-Match / If-Modified-Since
+        for revalidation (empty when nothing is cached). revalidate=True skips
+        the TTL, for pages the caller wants checked against the site.
+        """
+        with self._lock:
+            entry = self.index.get(url)
+        if not entry:
+            return None, {}
+        if not revalidate and time.time() - entry["fetchedAt"] < self.ttl:
+            body = self._read_body(url)
+            if body is not None:
+                with self._lock:
+                    entry["lastAccess"] = time.time()
+                    self.hits += 1
+                    self._mark_dirty()
+                return body, {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("lastModified"):
+            headers["If-Modified-Since"] = entry["lastModified"]
+        return None, headers
+
+    def not_modified(self, url: str) -> str | None:
+        """Handle a 304: refresh the entry's age and return the cached body."""
+        body = self._read_body(url)
+        with self._lock:
+            entry = self.index.get(url)
+            if body is None or entry is None:
+                return None
+            entry["fetchedAt"] = entry["lastAccess"] = time.time()
+            self.revalidated += 1
+            self._mark_dirty()
+        return body
+
+    def store(self, url: str, body: str, headers) -> None:
+        data = body.encode("utf-8")
+        path = self._body_path(url)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        now = time.time()
+        with self._lock:
+            self.misses += 1
+            self.index[url] = {
+                "etag": headers.get("ETag"),
+                "lastModified": headers.get("Last-Modified"),
+                "fetchedAt": now,
+                "lastAccess": now,
+                "size": len(data),
+            }
+            self._evict()
+            self._mark_dirty()
+
+    def _evict(self):
+        total = sum(e["size"] for e in self.index.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(self.index.items(), key=lambda kv: kv[1]["lastAccess"]):
+            if total <= self.max_bytes:
+                break
+            total -= entry["size"]
+            del self.index[url]
+            try:
+                os.remove(self._body_path(url))
+            except OSError:
+                pass
+
+    def _mark_dirty(self):
+        self._dirty += 1
+        if self._dirty >= FLUSH_EVERY:
+            self._write_index()
+
+    def _write_index(self):
+        tmp = self.index_file + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f)
+        os.replace(tmp, self.index_file)
+        self._dirty = 0
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._write_index()
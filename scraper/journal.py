@@ -0,0 +1,103 @@
+"""
+Append-only JSONL checkpoint journal for scrape runs.
+
+Each scraped season or contestant profile is appended as one line
+({"kind": ..., "id": ..., "data": {...}}) and fsync'd in batches, so a
+checkpoint costs O(1) per record and a crash can at worst lose the tail of
+the last batch. A line torn by a crash is cut off before the next append,
+so it cannot swallow the record written after it. On restart the journal
+is replayed to resume; once the run finishes, the results are compacted
+into the regular JSON files with write_json_atomic and the journal is
+removed.
+"""
+
+import json
+import os
+import threading
+
+FSYNC_EVERY = 10  # records per fsync batch
+TAIL_CHUNK = 4096  # bytes read per step when looking for the last newline
+
+
+def write_json_atomic(path: str, obj) -> None:
+    """Write obj as indented JSON via a temp file and rename, so readers never see a partial file."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, indent=2, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def truncate_torn_tail(path: str) -> None:
+    """Cut a JSONL file back to its last complete line, dropping a line torn by a crash."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos = end
+        while pos > 0:
+            start = max(0, pos - TAIL_CHUNK)
+            f.seek(start)
+            newline = f.read(pos - start).rfind(b"\n")
+            if newline >= 0:
+                pos = start + newline + 1
+                break
+            pos = start
+        if pos < end:
+            f.truncate(pos)
+
+
+class Journal:
+    def __init__(self, path: str, fsync_every: int = FSYNC_EVERY):
+        self.path = path
+        self.fsync_every = fsync_every
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._file = None
+
+    def replay(self) -> dict[str, dict]:
+        """Return {kind: {id: data}} from the journal; later records win.
+
+        A torn final line (crash mid-write) is ignored.
+        """
+        records: dict[str, dict] = {}
+        if not os.path.exists(self.path):
+            return records
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue
+                records.setdefault(rec["kind"], {})[rec["id"]] = rec["data"]
+        return records
+
+    def append(self, kind: str, record_id, data: dict) -> None:
+        line = json.dumps({"kind": kind, "id": record_id, "data": data}, ensure_ascii=False)
+        with self._lock:
+            if self._file is None:
+                truncate_torn_tail(self.path)
+                self._file = open(self.path, "a", encoding="utf-8")
+            self._file.write(line + "\n")
+            self._pending += 1
+            if self._pending >= self.fsync_every:
+                self._sync()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._pending = 0
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._sync()
+                self._file.close()
+                self._file = None
+
+    def remove(self) -> None:
+        """Drop the journal after its contents have been compacted."""
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,70 @@
+"""
+Per-entity freshness manifest for incremental re-scrapes.
+
+data/manifest.json records, for every season and contestant page, when it was
+last fetched and a hash of the parsed record, plus the source season of each
+contestant. Season entries also keep the parsed season record so a partial
+re-scrape can rebuild seasons.json without refetching untouched seasons.
+`lastRun` lists what changed in the most recent scrape so downstream steps can
+limit themselves to those entities.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from journal import write_json_atomic
+
+
+def content_hash(data: dict) -> str:
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()[:16]
+
+
+class Manifest:
+    def __init__(self, path: str):
+        self.path = path
+        self.data = {"seasons": {}, "contestants": {}, "lastRun": {}}
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self.data.update(json.load(f))
+
+    def entry(self, kind: str, entity_id: int) -> dict | None:
+        return self.data[kind].get(str(entity_id))
+
+    def is_stale(self, kind: str, entity_id: int, max_age: float) -> bool:
+        entry = self.entry(kind, entity_id)
+        return entry is None or time.time() - entry["fetchedAt"] > max_age
+
+    def season_record(self, season_id: int) -> dict | None:
+        entry = self.entry("seasons", season_id)
+        return entry.get("record") if entry else None
+
+    def record(self, kind: str, entity_id: int, data: dict, fetched: bool = True, **extra) -> bool:
+        """Store a parsed record; return True if its content changed.
+
+        fetched=False (a reparse of archived pages) keeps the previous
+        fetchedAt, so staleness still counts from the last real fetch; with no
+        previous entry the fetch time is unknown and the record counts as stale.
+        """
+        digest = content_hash(data)
+        previous = self.entry(kind, entity_id)
+        fetched_at = time.time() if fetched else (previous or {}).get("fetchedAt", 0)
+        entry = {"fetchedAt": fetched_at, "hash": digest, **extra}
+        if kind == "seasons":
+            entry["record"] = data
+        self.data[kind][str(entity_id)] = entry
+        return previous is None or previous["hash"] != digest
+
+    def set_last_run(self, changed_seasons, changed_contestants) -> None:
+        self.data["lastRun"] = {
+            "finishedAt": time.time(),
+            "changedSeasons": sorted(changed_seasons),
+            "changedContestants": sorted(changed_contestants),
+        }
+
+    def last_run(self) -> dict:
+        return self.data.get("lastRun", {})
+
+    def save(self) -> None:
+        write_json_atomic(self.path, self.data)
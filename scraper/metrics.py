@@ -0,0 +1,207 @@
+"""
+Run metrics for the scraper and cleaner.
+
+A process-wide Metrics registry collects counters (requests, bytes, retries,
+cache hits, ...), timers (count/total/max seconds per instrumented function)
+and wall time per phase. Wrapping a script's work in metrics.run() appends
+one JSON line per run to data/run_metrics.jsonl, so scrape cost can be
+tracked across runs:
+
+    with metrics.run("scrape", METRICS_FILE, profile=args.profile):
+        metrics.phase("seasons")
+        ...
+        with metrics.timer("build_analysis"):
+            ...
+
+profile="cpu" adds a cProfile capture (saved as a .prof file, with the top
+functions in the record); profile="memory" adds tracemalloc peak and top
+allocation sites; "all" does both. cProfile only sees the main thread, so
+work on fetch threads and in parse processes shows up through the timers.
+"""
+
+import contextlib
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+PROFILE_MODES = ("cpu", "memory", "all")
+TOP_N = 15  # functions / allocation sites kept in a profiled record
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counters: dict[str, float] = {}
+            self.gauges: dict[str, float] = {}
+            self.timers: dict[str, dict] = {}
+            self.phases: dict[str, float] = {}
+            self._phase: tuple[str, float] | None = None
+
+    def count(self, name: str, n: float = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name: str, value: float):
+        with self._lock:
+            self.gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        with self._lock:
+            t = self.timers.setdefault(name, {"count": 0, "total": 0.0, "max": 0.0})
+            t["count"] += 1
+            t["total"] += seconds
+            t["max"] = max(t["max"], seconds)
+
+    @contextlib.contextmanager
+    def timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def timed(self, name: str | None = None):
+        """Decorator form of timer(), named after the function by default."""
+        def wrap(fn):
+            label = name or fn.__name__
+
+            @functools.wraps(fn)
+            def inner(*args, **kwargs):
+                with self.timer(label):
+                    return fn(*args, **kwargs)
+            return inner
+        return wrap
+
+    def phase(self, name: str | None):
+        """Start timing phase name, ending the current one; None just ends it."""
+        now = time.perf_counter()
+        with self._lock:
+            if self._phase:
+                current, start = self._phase
+                self.phases[current] = self.phases.get(current, 0.0) + now - start
+            self._phase = (name, now) if name else None
+
+    def merge(self, snapshot: dict):
+        """Fold in another process's snapshot() (e.g. a pool worker's): counters,
+        timers and phase times add up, gauges are overwritten."""
+        with self._lock:
+            for k, v in snapshot["counters"].items():
+                self.counters[k] = self.counters.get(k, 0) + v
+            self.gauges.update(snapshot["gauges"])
+            for k, v in snapshot["phases"].items():
+                self.phases[k] = self.phases.get(k, 0.0) + v
+            for k, other in snapshot["timers"].items():
+                t = self.timers.setdefault(k, {"count": 0, "total": 0.0, "max": 0.0})
+                t["count"] += other["count"]
+                t["total"] += other["total"]
+                t["max"] = max(t["max"], other["max"])
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            timers = {k: {**t, "mean": t["total"] / t["count"]} for k, t in sorted(self.timers.items())}
+            return {
+                "phases": {k: round(v, 4) for k, v in self.phases.items()},
+                "counters": dict(sorted(self.counters.items())),
+                "gauges": dict(sorted(self.gauges.items())),
+                "timers": {k: {m: round(v, 6) for m, v in t.items()} for k, t in timers.items()},
+            }
+
+    def summary(self) -> list[str]:
+        snap = self.snapshot()
+        lines = [", ".join(f"{k} {v:.2f}s" for k, v in snap["phases"].items())]
+        c = snap["counters"]
+        requests = c.get("http.requests", 0)
+        if requests:
+            lines.append(f"{requests:.0f} requests, {c.get('http.bytes', 0) / 1024:.0f} KiB, "
+                         f"{c.get('http.retries', 0):.0f} retries")
+        served = c.get("cache.fresh", 0) + c.get("cache.revalidated", 0)
+        looked_up = served + c.get("cache.misses", 0)
+        if looked_up:
+            lines.append(f"cache hit rate {served / looked_up:.0%} ({served:.0f} of {looked_up:.0f})")
+        for name, t in snap["timers"].items():
+            if name.startswith("parse."):
+                lines.append(f"{name}: {t['count']} pages, {t['mean'] * 1e3:.1f} ms/page")
+        return [line for line in lines if line]
+
+    @contextlib.contextmanager
+    def run(self, script: str, path: str, profile: str | None = None):
+        """Collect metrics for one run and append them to the JSONL file at path."""
+        self.reset()
+        started = datetime.now(timezone.utc)
+        start = time.perf_counter()
+        profiler = cProfile.Profile() if profile in ("cpu", "all") else None
+        trace_memory = profile in ("memory", "all")
+        if trace_memory:
+            tracemalloc.start()
+        if profiler:
+            profiler.enable()
+        status = "ok"
+        try:
+            yield self
+        except BaseException as e:
+            status = "ok" if isinstance(e, SystemExit) and not e.code else type(e).__name__
+            raise
+        finally:
+            if profiler:
+                profiler.disable()
+            self.phase(None)
+            record = {
+                "script": script,
+                "startedAt": started.isoformat(timespec="seconds"),
+                "seconds": round(time.perf_counter() - start, 4),
+                "status": status,
+                "argv": sys.argv[1:],
+                **self.snapshot(),
+            }
+            stem = f"{script}-{started.strftime('%Y%m%d-%H%M%S')}"
+            if profiler:
+                record["cpuProfile"] = self._save_profile(profiler, os.path.dirname(path), stem)
+            if trace_memory:
+                record["memory"] = self._memory_profile()
+                tracemalloc.stop()
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            for line in self.summary():
+                print(f"  {line}")
+            print(f"  Run metrics appended to {os.path.relpath(path)}")
+
+    def _save_profile(self, profiler: cProfile.Profile, data_dir: str, stem: str) -> dict:
+        profile_dir = os.path.join(data_dir, "profiles")
+        os.makedirs(profile_dir, exist_ok=True)
+        prof_path = os.path.join(profile_dir, f"{stem}.prof")
+        profiler.dump_stats(prof_path)
+        stats = pstats.Stats(profiler, stream=io.StringIO())
+        top = sorted(stats.stats.items(), key=lambda kv: kv[1][3], reverse=True)[:TOP_N]
+        return {
+            "file": os.path.relpath(prof_path),
+            "top": [{"function": f"{os.path.basename(f)}:{line}({fn})", "calls": nc,
+                     "tottime": round(tt, 4), "cumtime": round(ct, 4)}
+                    for (f, line, fn), (_, nc, tt, ct, _) in top],
+        }
+
+    @staticmethod
+    def _memory_profile() -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        top = tracemalloc.take_snapshot().statistics("lineno")[:TOP_N]
+        return {
+            "currentMB": round(current / 2 ** 20, 3),
+            "peakMB": round(peak / 2 ** 20, 3),
+            "top": [{"site": f"{os.path.basename(s.traceback[0].filename)}:{s.traceback[0].lineno}",
+                     "sizeKB": round(s.size / 1024, 1), "count": s.count} for s in top],
+        }
+
+
+metrics = Metrics()
@@ -0,0 +1,100 @@
+"""
+Name resolution for contestants: winner notes and the curated winner table.
+
+A NameIndex is built once from a list of {id, name} records. A name's key
+is its casefolded letters and digits, with diacritics stripped and a few
+letters that do not decompose (ø, æ, ł) transliterated. So "Dara Ó Briain",
+"dara o'briain" and "DARA O BRIAIN" share one key. Short names are indexed
+as aliases: every run of consecutive words in a name ("Dara", "Briain",
+"Ó Briain"), plus any KNOWN_ALIASES. An alias shared by two people is
+ambiguous and resolves to nothing. Lookups are dict hits. Only names that
+match neither way go to a fuzzy match over the full-name keys.
+
+    index = NameIndex(season["contestants"])
+    index.resolve("Dara")  # -> 378
+"""
+
+import difflib
+import re
+import unicodedata
+from typing import Iterable
+
+FUZZY_CUTOFF = 0.85  # difflib ratio a misspelt full name must reach
+# Other spellings of contestants' names, as the site's notes, the curated
+# winner table or the press write them. Word runs of the name itself
+# ("Dara") and accent/apostrophe variants ("Dara O'Briain") need no entry.
+KNOWN_ALIASES: dict[str, list[str]] = {
+    "Dara Ó Briain": ["Dara O'Brien"],
+    "Doc Brown": ["Ben Bailey Smith"],
+    "Mathew Baynton": ["Matthew Baynton"],
+    "Mel Giedroyc": ["Melanie Giedroyc"],
+    "Nish Kumar": ["Nishant Kumar"],
+    "Bob Mortimer": ["Robert Mortimer"],
+    "Victoria Coren Mitchell": ["Victoria Coren"],
+    "Babatunde Aléshé": ["Tunde Aleshe"],
+}
+
+_TRANSLITERATE = str.maketrans({"ø": "o", "æ": "ae", "å": "a", "ł": "l", "đ": "d", "ð": "d", "þ": "th"})
+_WORD = re.compile(r"[a-z0-9]+")
+_AMBIGUOUS = -1
+
+
+def normalise(text: str) -> str:
+    """Casefold and strip diacritics ("Ó" -> "o"); shared with the search index tokenizer."""
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def name_words(name: str) -> list[str]:
+    # Apostrophes join rather than split: "O'Briain" -> "obriain"
+    return _WORD.findall(normalise(name).translate(_TRANSLITERATE).replace("'", "").replace("’", ""))
+
+
+def name_key(name: str) -> str:
+    return "".join(name_words(name))
+
+
+class NameIndex:
+    def __init__(self, people: Iterable[dict]):
+        self.exact: dict[str, int] = {}
+        self.aliases: dict[str, int] = {}
+        for p in people:
+            self.add(p["id"], p["name"])
+
+    def add(self, person_id: int, name: str):
+        words = name_words(name)
+        self._put(self.exact, "".join(words), person_id)
+        spans = {"".join(words[i:j]) for i in range(len(words)) for j in range(i + 1, len(words) + 1)}
+        spans.update(name_key(alias) for alias in _ALIASES_BY_KEY.get("".join(words), []))
+        for span in spans:
+            self._put(self.aliases, span, person_id)
+
+    @staticmethod
+    def _put(table: dict[str, int], key: str, person_id: int):
+        if key:
+            table[key] = person_id if table.get(key, person_id) == person_id else _AMBIGUOUS
+
+    def _lookup(self, key: str) -> int | None:
+        found = self.exact.get(key)
+        if found is None:
+            found = self.aliases.get(key)
+        return None if found == _AMBIGUOUS else found
+
+    def resolve(self, name: str, fuzzy: bool = True) -> int | None:
+        """ID of the one person name refers to, or None.
+
+        Tries the whole name, then its trailing words ("In the final, Dara
+        Ó Briain" -> "Dara Ó Briain"), then a fuzzy match on full names."""
+        words = name_words(name)
+        for i in range(len(words)):
+            found = self._lookup("".join(words[i:]))
+            if found is not None:
+                return found
+        if not fuzzy or not words:
+            return None
+        close = difflib.get_close_matches("".join(words), [k for k, v in self.exact.items() if v != _AMBIGUOUS],
+                                          n=1, cutoff=FUZZY_CUTOFF)
+        return self.exact[close[0]] if close else None
+
+
+_ALIASES_BY_KEY = {name_key(name): aliases for name, aliases in KNOWN_ALIASES.items()}
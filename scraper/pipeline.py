@@ -0,0 +1,138 @@
+"""
+Staged fetch/parse pipeline.
+
+Downloading is I/O-bound and BeautifulSoup parsing is CPU-bound, so they run
+as separate stages joined by bounded queues:
+
+    fetch threads -> html queue -> parse processes -> result queue -> caller
+
+The caller consumes results on its own thread (scrape.py journals them there),
+so it acts as the writer stage. Every queue holds at most `depth` entries and
+at most `depth` pages are being parsed at once: a slow parse stage stalls the
+fetchers, and a slow writer stalls the parsers, instead of raw HTML piling up
+in memory. Parse functions must be picklable (module-level) and return plain
+dicts; with parse_workers=0 they run in a single thread instead. Parse time
+per page is recorded in the parent as the "parse.<function>" timer.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator
+
+from metrics import metrics
+
+POLL = 0.05  # seconds between checks for a stopped consumer
+
+_DONE = object()
+
+
+def _timed_parse(parse: Callable[..., Any], html: str, item, *args) -> tuple[Any, float]:
+    # Runs in the worker, so the timing excludes queueing and pickling
+    start = time.perf_counter()
+    return parse(html, item, *args), time.perf_counter() - start
+
+
+def run_pipeline(items: Iterable, fetch: Callable[[Any], str], parse: Callable[..., Any],
+                 fetch_workers: int, parse_workers: int, depth: int | None = None,
+                 parse_args: tuple = ()) -> Iterator[tuple[Any, Any, Exception | None]]:
+    """Fetch and parse every item, yielding (item, result, error) in completion order.
+
+    fetch(item) returns raw HTML on a thread; parse(html, item, *parse_args)
+    runs in a process pool. Exactly one of result/error is set. Breaking out
+    of the loop early stops both stages.
+    """
+    items = list(items)
+    timer_name = f"parse.{getattr(parse, '__name__', 'page')}"
+    depth = depth or 2 * max(fetch_workers, parse_workers, 1)
+    html_q: queue.Queue = queue.Queue(maxsize=depth)
+    result_q: queue.Queue = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(q: queue.Queue, entry) -> bool:
+        # Block while the next stage is full, but give up once the caller has gone
+        while not stop.is_set():
+            try:
+                q.put(entry, timeout=POLL)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def fetch_one(item):
+        if stop.is_set():
+            return
+        try:
+            put(html_q, (item, fetch(item), None))
+        except Exception as e:
+            put(html_q, (item, None, e))
+
+    def fetch_stage():
+        with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as pool:
+            for future in [pool.submit(fetch_one, item) for item in items]:
+                future.result()
+        put(html_q, _DONE)
+
+    def parse_stage():
+        pool = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers > 0 else None
+        inflight: dict[Future, Any] = {}
+
+        def forward(futures):
+            for future in futures:
+                item = inflight.pop(future)
+                try:
+                    result, seconds = future.result()
+                except Exception as e:
+                    put(result_q, (item, None, e))
+                    continue
+                metrics.observe(timer_name, seconds)
+                put(result_q, (item, result, None))
+
+        try:
+            finished = False
+            while (not finished or inflight) and not stop.is_set():
+                if finished or len(inflight) >= depth:
+                    done, _ = wait(inflight, timeout=POLL, return_when=FIRST_COMPLETED)
+                    forward(done)
+                    continue
+                forward([f for f in inflight if f.done()])
+                try:
+                    entry = html_q.get(timeout=POLL)
+                except queue.Empty:
+                    continue
+                if entry is _DONE:
+                    finished = True
+                    continue
+                item, html, err = entry
+                if err is not None:
+                    put(result_q, (item, None, err))
+                elif pool is None:
+                    try:
+                        result, seconds = _timed_parse(parse, html, item, *parse_args)
+                    except Exception as e:
+                        put(result_q, (item, None, e))
+                        continue
+                    metrics.observe(timer_name, seconds)
+                    put(result_q, (item, result, None))
+                else:
+                    inflight[pool.submit(_timed_parse, parse, html, item, *parse_args)] = item
+        finally:
+            if pool:
+                pool.shutdown(wait=True, cancel_futures=True)
+            put(result_q, _DONE)
+
+    stages = [threading.Thread(target=fetch_stage, daemon=True),
+              threading.Thread(target=parse_stage, daemon=True)]
+    for t in stages:
+        t.start()
+    try:
+        while True:
+            entry = result_q.get()
+            if entry is _DONE:
+                break
+            yield entry
+    finally:
+        stop.set()
+        for t in stages:
+            t.join()
@@ -0,0 +1,86 @@
+"""
+Precomputed rank, percentile and leaderboard tables (data/rankings.json; the UK
+tables are also written to client/public/data/ for the client).
+
+Built by clean_data.py so that "top N by X" and "where does contestant Y
+rank" are lookups for the server and client rather than a sort per request:
+
+- stats: for every numeric profile stat, contestant IDs ordered highest
+  first (ties broken by ID) with competition ranks ("1224") and percentiles
+  in the same order
+- contestants: per contestant, {stat: [rank, percentile]} plus a percentile
+  per taskBreakdown category/type (by points per task, among contestants who
+  attempted that type)
+- seriesStandings: per series, contestants ordered by total points
+
+Only contestants that count towards analysis.json (analysis.is_valid) are
+ranked. Rank 1 is always the highest value, including pointsDeducted and dqs.
+A percentile is the share of other ranked contestants with a strictly lower
+value, so the top value is 100 and the bottom 0.
+"""
+
+import numpy as np
+
+from analysis import BREAKDOWN_CATEGORIES, MIN_EPISODES, is_valid
+
+RANK_STATS = [
+    "pointsPerTask", "pointsPerEpisode", "totalPoints", "basePoints", "bonusPoints",
+    "episodeWinPct", "taskWinPct", "episodeWins", "tasksWon", "tasksAttempted",
+    "episodes", "seasonWins", "pointsDeducted", "dqs",
+]
+
+
+def rank_column(ids: np.ndarray, values: np.ndarray) -> tuple[list, list, list]:
+    """Order, competition ranks and percentiles for one stat, highest first."""
+    n = len(values)
+    order = np.lexsort((ids, -values))
+    ordered = values[order]
+    # Competition rank: 1 + number of strictly higher values
+    ranks = np.searchsorted(-ordered, -ordered, side="left") + 1
+    lower = n - np.searchsorted(-ordered, -ordered, side="right")
+    percentiles = np.round(100.0 * lower / (n - 1), 1) if n > 1 else np.full(n, 100.0)
+    return ids[order].tolist(), ranks.tolist(), percentiles.tolist()
+
+
+def build_rankings(contestants: list[dict], seasons: list[dict]) -> dict:
+    ranked = [c for c in contestants if is_valid(c)]
+    ids = np.array([c["id"] for c in ranked], dtype=np.int64)
+    stats, per_contestant = {}, {str(cid): {"stats": {}, "breakdown": {}} for cid in ids.tolist()}
+
+    for stat in RANK_STATS:
+        values = np.array([float(c.get(stat, 0)) for c in ranked])
+        order, ranks, percentiles = rank_column(ids, values)
+        stats[stat] = {"order": order, "rank": ranks, "percentile": percentiles}
+        for cid, rank, pct in zip(order, ranks, percentiles):
+            per_contestant[str(cid)]["stats"][stat] = [rank, pct]
+
+    for cat, types in BREAKDOWN_CATEGORIES.items():
+        for t in types:
+            entries = [(c["id"], c["taskBreakdown"][cat][t]["ppt"]) for c in ranked
+                       if (c.get("taskBreakdown", {}).get(cat, {}).get(t) or {}).get("attempted", 0) > 0]
+            if not entries:
+                continue
+            cids = np.array([cid for cid, _ in entries], dtype=np.int64)
+            order, _, percentiles = rank_column(cids, np.array([v for _, v in entries], dtype=float))
+            for cid, pct in zip(order, percentiles):
+                per_contestant[str(cid)]["breakdown"].setdefault(cat, {})[t] = pct
+
+    standings = {}
+    for s in seasons:
+        members = sorted(s.get("contestants", []), key=lambda c: (-c.get("totalPoints", 0), c["id"]))
+        table, rank = [], 0
+        for i, c in enumerate(members):
+            if i == 0 or c.get("totalPoints", 0) != members[i - 1].get("totalPoints", 0):
+                rank = i + 1
+            table.append({"rank": rank, "id": c["id"], "name": c["name"],
+                          "totalPoints": c.get("totalPoints", 0),
+                          "winner": c["id"] == s.get("winner", {}).get("id")})
+        standings[str(s["seriesNumber"])] = table
+
+    return {
+        "minEpisodes": MIN_EPISODES,
+        "ranked": len(ranked),
+        "stats": stats,
+        "contestants": per_contestant,
+        "seriesStandings": standings,
+    }
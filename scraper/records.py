@@ -0,0 +1,219 @@
+"""
+Typed, compact contestant records for the Python pipeline.
+
+A Contestant is a slotted dataclass with one attribute per profile field
+(named as in the JSON, so field access and key lookups share one name). Its
+taskBreakdown is a Breakdown: the 15 category/type slots x 4 metrics live in
+a single array('d') of 60 doubles plus a bitmask of the types present,
+instead of 20 nested dicts. Category, TaskType and Metric fix that layout.
+It is the same column order AnalysisEngine uses, so the engine takes the
+arrays as they are.
+
+Conversion is lossless for scraper and cleaner output:
+Contestant.from_json(d).to_json() == d, with the same key order (counts come
+back as ints and rates as floats, as the scraper writes them). Records also
+answer the read-only dict calls made across the pipeline (c["id"],
+c.get("episodes", 0), "error" in c, c["taskBreakdown"]["setting"]["prize"]).
+Code without a record fast path therefore keeps working. Nested breakdown
+dicts are built on demand for those callers.
+"""
+
+from array import array
+from dataclasses import dataclass
+from enum import Enum, IntEnum
+
+
+class Category(str, Enum):
+    FORMAT = "format"
+    SETTING = "setting"
+    ACTIVITY = "activity"
+    JUDGEMENT = "judgement"
+
+
+class TaskType(str, Enum):
+    SOLO = "solo"
+    TEAM = "team"
+    SPLIT = "split"
+    TIEBREAK = "tiebreak"
+    PRIZE = "prize"
+    FILMED = "filmed"
+    HOMEWORK = "homework"
+    LIVE = "live"
+    CREATIVE = "creative"
+    MENTAL = "mental"
+    PHYSICAL = "physical"
+    SOCIAL = "social"
+    OBJECTIVE = "objective"
+    SUBJECTIVE = "subjective"
+    COMBO = "combo"
+
+
+class Metric(IntEnum):
+    ATTEMPTED = 0
+    WON = 1
+    WIN_PCT = 2
+    PPT = 3
+
+    @property
+    def key(self) -> str:
+        return METRIC_KEYS[self]
+
+
+METRIC_KEYS = ("attempted", "won", "winPct", "ppt")
+INT_METRICS = frozenset({Metric.ATTEMPTED, Metric.WON})
+
+CATEGORY_TYPES = {
+    Category.FORMAT: (TaskType.SOLO, TaskType.TEAM, TaskType.SPLIT, TaskType.TIEBREAK),
+    Category.SETTING: (TaskType.PRIZE, TaskType.FILMED, TaskType.HOMEWORK, TaskType.LIVE),
+    Category.ACTIVITY: (TaskType.CREATIVE, TaskType.MENTAL, TaskType.PHYSICAL, TaskType.SOCIAL),
+    Category.JUDGEMENT: (TaskType.OBJECTIVE, TaskType.SUBJECTIVE, TaskType.COMBO),
+}
+SLOTS = [(cat, t) for cat, types in CATEGORY_TYPES.items() for t in types]
+SLOT_INDEX = {(cat.value, t.value): i for i, (cat, t) in enumerate(SLOTS)}
+N_METRICS = len(Metric)
+_EMPTY = bytes(8 * len(SLOTS) * N_METRICS)
+
+STAT_FIELDS = (
+    "seasonWins", "episodes", "episodeWins", "episodeWinPct", "basePoints", "bonusPoints",
+    "pointsDeducted", "totalPoints", "pointsPerEpisode", "tasksAttempted", "tasksWon",
+    "taskWinPct", "pointsPerTask", "dqs",
+)
+
+
+@dataclass(slots=True)
+class Breakdown:
+    values: array  # len(SLOTS) x N_METRICS doubles, slot-major; 0 where absent
+    present: int = 0  # bit i set when SLOTS[i] appeared on the page
+
+    @classmethod
+    def from_json(cls, d: dict) -> "Breakdown":
+        b = cls(array("d", _EMPTY))
+        for cat, by_type in d.items():
+            for t, entry in by_type.items():
+                i = SLOT_INDEX[(cat, t)]
+                b.present |= 1 << i
+                for m in Metric:
+                    b.values[i * N_METRICS + m] = entry.get(m.key, 0)
+        return b
+
+    def has(self, cat: Category | str, t: TaskType | str) -> bool:
+        return bool(self.present >> SLOT_INDEX[(Category(cat).value, TaskType(t).value)] & 1)
+
+    def value(self, cat: Category | str, t: TaskType | str, metric: Metric) -> float | None:
+        i = SLOT_INDEX[(Category(cat).value, TaskType(t).value)]
+        return self.values[i * N_METRICS + metric] if self.present >> i & 1 else None
+
+    def _entry(self, i: int) -> dict:
+        base = i * N_METRICS
+        return {m.key: int(self.values[base + m]) if m in INT_METRICS else self.values[base + m] for m in Metric}
+
+    def category(self, cat: Category | str) -> dict:
+        cat = Category(cat)
+        out = {}
+        for t in CATEGORY_TYPES[cat]:
+            i = SLOT_INDEX[(cat.value, t.value)]
+            if self.present >> i & 1:
+                out[t.value] = self._entry(i)
+        return out
+
+    def to_json(self) -> dict:
+        return {cat.value: self.category(cat) for cat in CATEGORY_TYPES}
+
+    # Read-only dict interface: breakdown["setting"]["prize"]["ppt"]
+    def __getitem__(self, cat: str) -> dict:
+        try:
+            return self.category(cat)
+        except ValueError:
+            raise KeyError(cat) from None
+
+    def get(self, cat: str, default=None):
+        try:
+            return self.category(cat)
+        except ValueError:
+            return default
+
+
+# Key orders are interned, so every record from the same source shares one tuple
+_KEY_ORDERS: dict[tuple, tuple] = {}
+
+
+@dataclass(slots=True)
+class Contestant:
+    id: int
+    name: str | None = None
+    seasonIds: list | None = None
+    seasonWins: int | None = None
+    episodes: int | None = None
+    episodeWins: int | None = None
+    episodeWinPct: float | None = None
+    basePoints: int | None = None
+    bonusPoints: int | None = None
+    pointsDeducted: int | None = None
+    totalPoints: int | None = None
+    pointsPerEpisode: float | None = None
+    tasksAttempted: int | None = None
+    tasksWon: int | None = None
+    taskWinPct: float | None = None
+    pointsPerTask: float | None = None
+    dqs: int | None = None
+    taskBreakdown: Breakdown | None = None
+    error: str | None = None
+    extra: dict | None = None  # JSON keys outside the schema, kept for round trips
+    keys_: tuple = ()  # JSON key order
+
+    @classmethod
+    def from_json(cls, d: dict) -> "Contestant":
+        c = cls(d["id"])
+        for key, value in d.items():
+            if key == "taskBreakdown":
+                c.taskBreakdown = Breakdown.from_json(value)
+            elif key in _FIELDS:
+                setattr(c, key, value)
+            else:
+                c.extra = c.extra or {}
+                c.extra[key] = value
+        keys = tuple(d)
+        c.keys_ = _KEY_ORDERS.setdefault(keys, keys)
+        return c
+
+    def to_json(self) -> dict:
+        out = {}
+        for key in self.keys_:
+            value = self[key]
+            out[key] = value.to_json() if isinstance(value, Breakdown) else value
+        return out
+
+    # Dict interface, so records can stand in for profile dicts
+    def __getitem__(self, key: str):
+        if key not in self.keys_:
+            raise KeyError(key)
+        return getattr(self, key) if key in _FIELDS else self.extra[key]
+
+    def get(self, key: str, default=None):
+        return self[key] if key in self.keys_ else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.keys_
+
+    def __setitem__(self, key: str, value):
+        if key == "taskBreakdown" and isinstance(value, dict):
+            value = Breakdown.from_json(value)
+        if key in _FIELDS:
+            setattr(self, key, value)
+        else:
+            self.extra = self.extra or {}
+            self.extra[key] = value
+        if key not in self.keys_:
+            keys = self.keys_ + (key,)
+            self.keys_ = _KEY_ORDERS.setdefault(keys, keys)
+
+
+_FIELDS = frozenset(("id", "name", "seasonIds", "taskBreakdown", "error") + STAT_FIELDS)
+
+
+def to_records(contestants: list[dict]) -> list[Contestant]:
+    return [Contestant.from_json(c) for c in contestants]
+
+
+def to_json(records: list[Contestant]) -> list[dict]:
+    return [c.to_json() for c in records]
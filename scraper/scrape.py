@@ -1,24 +1,61 @@
 """
 Taskmaster UK Data Scraper
 Scrapes contestant profiles and season data from taskmaster.info.
-Outputs JSON files to ../data/
+Outputs JSON files to ../data/, and with --shows one shard per show (see shows.py)
 """
 
+import argparse
+import copy
 import json
 import os
 import re
 import sys
 import time
-from typing import Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Container, Iterable
 
 import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+
+from archive import PageArchive
+from http_cache import DEFAULT_TTL, HttpCache
+from analysis import SCRAPE_SPEC, AnalysisEngine, winner_groups
+from dataset import Dataset
+from journal import Journal, write_json_atomic
+from manifest import Manifest
+from metrics import PROFILE_MODES, metrics
+from names import NameIndex
+from pipeline import run_pipeline
+from records import Contestant, to_records
+from records import to_json as records_to_json
+from shows import DEFAULT_SHOW, DEFAULT_SLUG, parse_show, parse_show_list, shard_dir, update_index
+from throttle import RateController, parse_retry_after
 
 BASE_URL = "https://taskmaster.info"
 DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
-DELAY = 2.5  # seconds between requests
+CACHE_DIR = os.path.join(DATA_DIR, ".http_cache")
+ARCHIVE_DIR = os.path.join(DATA_DIR, ".page_archive")
+DELAY = 2.5  # base seconds for retry backoff
+MAX_WORKERS = 4  # concurrent fetches
+PARSE_WORKERS = os.cpu_count() or 1  # processes parsing HTML
+REQUESTS_PER_SECOND = 1.0  # starting rate across all workers; adapts to the server
+MAX_REQUESTS_PER_SECOND = 3.0  # ceiling for the adaptive rate
+THROTTLE_STATUSES = {429, 503}
 HOST_IDS = {19, 32}  # Greg Davies, Alex Horne
 
+# All UK regular series site IDs in series order (from taskmaster.info/show.php?id=1)
+UK_SEASON_IDS = [1, 2, 3, 4, 5, 7, 8, 9, 10, 11, 32, 38, 48, 55, 56, 73, 74, 75, 76, 77]
+UK_SHOW = {"id": DEFAULT_SHOW, "name": "Taskmaster UK", "slug": DEFAULT_SLUG, "seasonIds": UK_SEASON_IDS}
+
+try:
+    import lxml  # noqa: F401
+    PARSER = "lxml"
+except ImportError:
+    PARSER = "html.parser"
+
+# Winner sentence in a season page's notes
+WINNER_NOTE = re.compile(r"(\w[\w\s'-]+?)\s+won\s+this\s+series")
+
 session = requests.Session()
 session.headers.update({
     "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
@@ -26,24 +63,147 @@ session.headers.update({
     "Accept-Language": "en-US,en;q=0.5",
     "Referer": "https://taskmaster.info/",
 })
+session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_WORKERS))
+
+
+limiter = RateController(REQUESTS_PER_SECOND, MAX_REQUESTS_PER_SECOND, base_delay=DELAY)
+cache: HttpCache | None = None
+archive: PageArchive | None = None
+OFFLINE = False  # serve every page from the archive (--reparse)
+
+
+def configure(workers: int = MAX_WORKERS, rate: float = REQUESTS_PER_SECOND,
+              max_rate: float = MAX_REQUESTS_PER_SECOND, use_cache: bool = True, cache_ttl: float = DEFAULT_TTL, parser: str | None = None,
+              parse_workers: int | None = None, offline: bool = False):
+    """Resize the connection pool, reset the rate controller, open the HTTP cache
+    and page archive, and pick the HTML parser backend and parse pool size."""
+    global MAX_WORKERS, PARSE_WORKERS, limiter, cache, archive, OFFLINE, PARSER
+    if parser:
+        PARSER = parser
+    if parse_workers is not None:
+        PARSE_WORKERS = max(0, parse_workers)
+    MAX_WORKERS = max(1, workers)
+    limiter = RateController(rate, max_rate, base_delay=DELAY)
+    session.mount("https://", requests.adapters.HTTPAdapter(pool_maxsize=MAX_WORKERS))
+    cache = HttpCache(CACHE_DIR, ttl=cache_ttl) if use_cache and not offline else None
+    archive = PageArchive(ARCHIVE_DIR)
+    OFFLINE = offline
+
 
+def make_soup(html: str, parse_only: SoupStrainer | None = None, parser: str | None = None) -> BeautifulSoup:
+    """Parse html with the configured backend, optionally keeping only matching subtrees."""
+    return BeautifulSoup(html, parser or PARSER, parse_only=parse_only)
 
-def fetch_page(path: str, retries: int = 3) -> BeautifulSoup:
+
+def fetch_page(path: str, retries: int = 3, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    return make_soup(fetch_html(path, retries), parse_only)
+
+
+def archived(url: str, body: str) -> str:
+    if archive is not None:
+        archive.put(url, body)
+    return body
+
+
+@metrics.timed()
+def fetch_html(path: str, retries: int = 3, revalidate: bool = False) -> str:
+    """Page body for path. revalidate=True bypasses the cache TTL and asks the
+    site (with a conditional GET when the page is cached)."""
     url = f"{BASE_URL}/{path}" if not path.startswith("http") else path
+    if OFFLINE:
+        body = archive.get(url) if archive is not None else None
+        if body is None:
+            raise Exception(f"{url} is not in the page archive")
+        metrics.count("archive.reads")
+        return body
+    headers = {}
+    if cache:
+        body, headers = cache.lookup(url, revalidate)
+        if body is not None:
+            print(f"  Cached: {url}")
+            metrics.count("cache.fresh")
+            return archived(url, body)
     print(f"  Fetching: {url}")
+
+    def retry(attempt: int, reason):
+        tripped = limiter.record_failure()
+        wait = limiter.backoff(attempt)
+        metrics.count("http.retries")
+        print(f"    Retry {attempt+1}/{retries} after {wait:.1f}s: {reason}")
+        if tripped:
+            metrics.count("http.circuitTrips")
+            print(f"    Circuit open after repeated failures; all workers pausing {tripped:.0f}s")
+        time.sleep(wait)
+
     for attempt in range(retries):
+        limiter.acquire()
+        start = time.monotonic()
         try:
-            resp = session.get(url, timeout=30)
+            with metrics.timer("http.request"):
+                resp = session.get(url, headers=headers, timeout=30)
+        except requests.RequestException as e:
+            metrics.count("http.errors")
+            retry(attempt, e)
+            continue
+        metrics.count("http.requests")
+        metrics.count(f"http.status.{resp.status_code}")
+        metrics.count("http.bytes", len(resp.content))
+        if resp.status_code in THROTTLE_STATUSES:
+            metrics.count("http.throttled")
+            retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+            pause = limiter.record_throttled(retry_after, attempt)
+            print(f"    Throttled ({resp.status_code}); all workers pausing {pause:.1f}s, "
+                  f"rate now {limiter.rate:.2f} req/s")
+            continue
+        if resp.status_code == 304 and cache:
+            body = cache.not_modified(url)
+            if body is not None:
+                limiter.record_success(time.monotonic() - start)
+                metrics.count("cache.revalidated")
+                return archived(url, body)
+            headers = {}
+            retry(attempt, "304 for an evicted cache entry")
+            continue
+        if 400 <= resp.status_code < 500:
+            # Client errors will not change on retry
             resp.raise_for_status()
-            time.sleep(DELAY)
-            return BeautifulSoup(resp.text, "html.parser")
-        except Exception as e:
-            wait = DELAY * (2 ** (attempt + 1))
-            print(f"    Retry {attempt+1}/{retries} after {wait}s: {e}")
-            time.sleep(wait)
+        if resp.status_code >= 500:
+            retry(attempt, f"HTTP {resp.status_code}")
+            continue
+        limiter.record_success(time.monotonic() - start)
+        if cache:
+            metrics.count("cache.misses")
+            cache.store(url, resp.text, resp.headers)
+        return archived(url, resp.text)
     raise Exception(f"Failed to fetch {url} after {retries} retries")
 
 
+def fetch_all(func: Callable[[Any], Any], items: Iterable, workers: int | None = None):
+    """Run func over items on a bounded thread pool.
+
+    Yields (item, result, error) tuples in completion order; exactly one of
+    result/error is set. The shared rate controller paces the pool.
+    """
+    items = list(items)
+    with ThreadPoolExecutor(max_workers=workers or MAX_WORKERS) as pool:
+        futures = {pool.submit(func, item): item for item in items}
+        for future in as_completed(futures):
+            item = futures[future]
+            try:
+                yield item, future.result(), None
+            except Exception as e:
+                yield item, None, e
+
+
+def fetch_and_parse(parse: Callable[..., Any], path_for: Callable[[Any], str], items: Iterable,
+                    revalidate: Container = ()):
+    """Fetch path_for(item) on the fetch threads and parse(html, item, PARSER) in
+    the parse process pool. Items in revalidate skip the fresh-cache shortcut.
+    Yields (item, result, error) like fetch_all."""
+    return run_pipeline(items, lambda item: fetch_html(path_for(item), revalidate=item in revalidate), parse,
+                        MAX_WORKERS, PARSE_WORKERS, parse_args=(PARSER,))
+
+
 def safe_int(val: str, default: int = 0) -> int:
     try:
         return int(re.sub(r"[^\d-]", "", val.strip()))
@@ -58,20 +218,42 @@ def safe_float(val: str, default: float = 0.0) -> float:
         return default
 
 
-def get_stat(soup: BeautifulSoup, label: str) -> str:
-    """Get a top-level stat value by its label text."""
-    label_div = soup.find("div", class_="statsLabel", string=re.compile(re.escape(label), re.I))
-    if label_div:
+def extract_stats(soup: BeautifulSoup) -> dict[str, str]:
+    """Build a lowercased label -> value map from every statsLabel div in one pass."""
+    stats = {}
+    for label_div in soup.find_all("div", class_="statsLabel"):
+        label = label_div.string
+        if label is None:
+            continue
+        key = label.strip().lower()
+        if key in stats:
+            continue
         number_div = label_div.find_next_sibling("div", class_="statsNumber")
         if not number_div:
             parent = label_div.find_parent()
             if parent:
                 number_div = parent.find("div", class_="statsNumber")
         if number_div:
-            return number_div.get_text(strip=True)
+            stats[key] = number_div.get_text(strip=True)
+    return stats
+
+
+def lookup_stat(stats: dict[str, str], label: str) -> str:
+    """Find a stat by label: exact match first, then the first label containing it."""
+    key = label.lower()
+    if key in stats:
+        return stats[key]
+    for name, value in stats.items():
+        if key in name:
+            return value
     return ""
 
 
+def get_stat(soup: BeautifulSoup, label: str) -> str:
+    """Get a top-level stat value by its label text."""
+    return lookup_stat(extract_stats(soup), label)
+
+
 def parse_task_breakdown(soup: BeautifulSoup) -> dict:
     """Parse the task breakdown tables from a contestant's person page."""
     breakdown = {
@@ -140,24 +322,30 @@ def parse_task_breakdown(soup: BeautifulSoup) -> dict:
 
 def scrape_contestant_profile(contestant_id: int) -> dict:
     """Scrape a full contestant profile from person.php."""
-    soup = fetch_page(f"person.php?id={contestant_id}")
+    return parse_contestant_profile(fetch_html(f"person.php?id={contestant_id}"), contestant_id)
+
+
+def parse_contestant_profile(html: str, contestant_id: int, parser: str | None = None) -> dict:
+    """Parse a person.php page into a profile dict."""
+    soup = make_soup(html, parser=parser)
     profile: dict[str, Any] = {"id": contestant_id}
 
     # Extract stats
-    profile["seasonWins"] = safe_int(get_stat(soup, "Season Wins"))
-    profile["episodes"] = safe_int(get_stat(soup, "Episodes"))
-    profile["episodeWins"] = safe_int(get_stat(soup, "Episode Wins"))
-    profile["episodeWinPct"] = safe_float(get_stat(soup, "Episode Win %"))
-    profile["basePoints"] = safe_int(get_stat(soup, "Base Points"))
-    profile["bonusPoints"] = safe_int(get_stat(soup, "Bonus Points"))
-    profile["pointsDeducted"] = safe_int(get_stat(soup, "Points Deducted"))
-    profile["totalPoints"] = safe_int(get_stat(soup, "Total Points"))
-    profile["pointsPerEpisode"] = safe_float(get_stat(soup, "Points per Episode"))
-    profile["tasksAttempted"] = safe_int(get_stat(soup, "Tasks Attempted"))
-    profile["tasksWon"] = safe_int(get_stat(soup, "Tasks Won"))
-    profile["taskWinPct"] = safe_float(get_stat(soup, "Task Win %"))
-    profile["pointsPerTask"] = safe_float(get_stat(soup, "Points per Task"))
-    profile["dqs"] = safe_int(get_stat(soup, "DQs"))
+    stats = extract_stats(soup)
+    profile["seasonWins"] = safe_int(lookup_stat(stats, "Season Wins"))
+    profile["episodes"] = safe_int(lookup_stat(stats, "Episodes"))
+    profile["episodeWins"] = safe_int(lookup_stat(stats, "Episode Wins"))
+    profile["episodeWinPct"] = safe_float(lookup_stat(stats, "Episode Win %"))
+    profile["basePoints"] = safe_int(lookup_stat(stats, "Base Points"))
+    profile["bonusPoints"] = safe_int(lookup_stat(stats, "Bonus Points"))
+    profile["pointsDeducted"] = safe_int(lookup_stat(stats, "Points Deducted"))
+    profile["totalPoints"] = safe_int(lookup_stat(stats, "Total Points"))
+    profile["pointsPerEpisode"] = safe_float(lookup_stat(stats, "Points per Episode"))
+    profile["tasksAttempted"] = safe_int(lookup_stat(stats, "Tasks Attempted"))
+    profile["tasksWon"] = safe_int(lookup_stat(stats, "Tasks Won"))
+    profile["taskWinPct"] = safe_float(lookup_stat(stats, "Task Win %"))
+    profile["pointsPerTask"] = safe_float(lookup_stat(stats, "Points per Task"))
+    profile["dqs"] = safe_int(lookup_stat(stats, "DQs"))
 
     # Parse task breakdowns
     profile["taskBreakdown"] = parse_task_breakdown(soup)
@@ -167,7 +355,12 @@ def scrape_contestant_profile(contestant_id: int) -> dict:
 
 def scrape_season(season_id: int) -> dict:
     """Scrape season page for contestant list and metadata."""
-    soup = fetch_page(f"season.php?id={season_id}")
+    return parse_season(fetch_html(f"season.php?id={season_id}"), season_id)
+
+
+def parse_season(html: str, season_id: int, parser: str | None = None) -> dict:
+    """Parse a season.php page into a season dict."""
+    soup = make_soup(html, parser=parser)
     season: dict[str, Any] = {"id": season_id, "seriesNumber": season_id}
 
     # Extract year from page text
@@ -176,7 +369,7 @@ def scrape_season(season_id: int) -> dict:
     season["year"] = safe_int(year_match.group(1)) if year_match else 0
 
     # Episode count
-    ep_stat = get_stat(soup, "Episodes")
+    ep_stat = lookup_stat(extract_stats(soup), "Episodes")
     season["episodeCount"] = safe_int(ep_stat) if ep_stat else 0
 
     # Find contestants (class='contestant') vs hosts (class='host')
@@ -198,190 +391,314 @@ def scrape_season(season_id: int) -> dict:
                 if cid not in {c["id"] for c in season["contestants"]}:
                     season["contestants"].append({"id": cid, "name": name_text})
 
-    # Try to find winner from notes text
+    # Winner from the notes element ("Dara Ó Briain won this series.")
     season["winner"] = None
-    notes_text = text
-    win_match = re.search(r"(\w[\w\s'-]+?)\s+won\s+this\s+series", notes_text)
+    notes_text = " ".join(n.get_text(" ", strip=True) for n in soup.find_all(class_="notes"))
+    win_match = WINNER_NOTE.search(notes_text)
     if win_match:
-        winner_name = win_match.group(1).strip()
-        for c in season["contestants"]:
-            if winner_name.lower() in c["name"].lower():
-                season["winner"] = c
-                break
+        winner_id = NameIndex(season["contestants"]).resolve(win_match.group(1))
+        season["winner"] = next((c for c in season["contestants"] if c["id"] == winner_id), None)
 
     return season
 
 
+def parse_series_list(value: str) -> list[int]:
+    """Parse a --seasons value like "19,20" into UK series numbers."""
+    try:
+        series = [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated series numbers, got {value!r}")
+    for n in series:
+        if not 1 <= n <= len(UK_SEASON_IDS):
+            raise argparse.ArgumentTypeError(f"series {n} is not in 1-{len(UK_SEASON_IDS)}")
+    return series
+
+
+def parse_show_ids(value: str) -> list[int] | str:
+    """Parse a --shows value: "all" or comma-separated show.php IDs."""
+    if value == "all":
+        return value
+    try:
+        return [int(v) for v in value.split(",") if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected \"all\" or comma-separated show IDs, got {value!r}")
+
+
+def discover_shows(selection: list[int] | str) -> list[dict]:
+    """Show records for the selected show IDs ("all" = every show linked from the home page)."""
+    ids = parse_show_list(fetch_html(f"{BASE_URL}/")) if selection == "all" else selection
+    shows = [UK_SHOW] if DEFAULT_SHOW in ids else []
+    others = [i for i in dict.fromkeys(ids) if i != DEFAULT_SHOW]
+    for show_id, show, err in fetch_and_parse(parse_show, lambda i: f"show.php?id={i}", others):
+        if err:
+            print(f"  Show {show_id}: ERROR: {err}")
+        elif not show["seasonIds"]:
+            print(f"  Show {show_id} ({show['name']}): no series listed, skipped")
+        else:
+            shows.append(show)
+    shows.sort(key=lambda s: s["id"])
+    for show in shows:
+        print(f"  Show {show['id']}: {show['name']} -> {os.path.relpath(shard_dir(DATA_DIR, show))}/ "
+              f"({len(show['seasonIds'])} series)")
+    return shows
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Scrape Taskmaster UK data from taskmaster.info")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS,
+                        help=f"concurrent fetches (default {MAX_WORKERS})")
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND,
+                        help=f"starting requests per second across all workers (default {REQUESTS_PER_SECOND}, "
+                             "0 = unlimited)")
+    parser.add_argument("--max-rate", type=float, default=MAX_REQUESTS_PER_SECOND,
+                        help=f"ceiling the rate may adapt up to (default {MAX_REQUESTS_PER_SECOND})")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL / 3600,
+                        help="hours before a cached page is revalidated (default 24, 0 = always revalidate)")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the on-disk HTTP cache")
+    parser.add_argument("--parser", choices=["lxml", "html.parser"],
+                        help=f"BeautifulSoup backend (default {PARSER})")
+    parser.add_argument("--parse-workers", type=int, default=PARSE_WORKERS,
+                        help=f"processes parsing pages (default {PARSE_WORKERS}, 0 = parse in a thread)")
+    parser.add_argument("--stale-after", type=float, metavar="HOURS",
+                        help="refetch seasons and profiles last fetched more than HOURS ago")
+    parser.add_argument("--seasons", type=parse_series_list, metavar="N,N",
+                        help="refetch these UK series and their contestants' profiles")
+    parser.add_argument("--shows", type=parse_show_ids, metavar="all|ID,ID",
+                        help="scrape these shows (show.php IDs, 1 = UK) into per-show shards (default UK only)")
+    parser.add_argument("--only-changed", action="store_true",
+                        help="refetch profiles only for seasons whose page content changed")
+    parser.add_argument("--reparse", action="store_true",
+                        help="rebuild every data file from the page archive, without network access")
+    parser.add_argument("--profile", choices=PROFILE_MODES,
+                        help="capture a cProfile and/or tracemalloc profile into the run metrics")
+    args = parser.parse_args()
+    with metrics.run("scrape", os.path.join(DATA_DIR, "run_metrics.jsonl"), profile=args.profile):
+        run(args)
+
+
+def run(args):
+    configure(args.workers, args.rate, args.max_rate, use_cache=not args.no_cache, cache_ttl=args.cache_ttl * 3600,
+              parser=args.parser, parse_workers=args.parse_workers, offline=args.reparse)
+    max_age = args.stale_after * 3600 if args.stale_after is not None else None
+
     os.makedirs(DATA_DIR, exist_ok=True)
 
     print("=" * 60)
     print("TASKMASTER UK DATA SCRAPER")
     print("=" * 60)
+    if args.reparse:
+        print(f"  Reparsing {len(archive)} archived pages (no network)")
+    print(f"  {MAX_WORKERS} fetch workers, {PARSE_WORKERS} parse workers, {PARSER} parser, "
+          f"{args.rate} req/s adapting up to {limiter.max_rate}")
 
-    # Check for existing partial data to resume
-    seasons_file = os.path.join(DATA_DIR, "seasons.json")
-    contestants_file = os.path.join(DATA_DIR, "contestants.json")
-
-    # All UK regular series site IDs (from taskmaster.info/show.php?id=1)
-    UK_SEASON_IDS = [1, 2, 3, 4, 5, 7, 8, 9, 10, 11, 32, 38, 48, 55, 56, 73, 74, 75, 76, 77]
+    shows = discover_shows(args.shows) if args.shows else [UK_SHOW]
+    season_ids = [sid for show in shows for sid in show["seasonIds"]]
+    shard_files = {show["id"]: {name: os.path.join(shard_dir(DATA_DIR, show), f"{name}.json")
+                                for name in ("contestants", "seasons", "analysis")} for show in shows}
 
-    # Step 1: Scrape all UK season pages to get contestant IDs
+    # Check for existing partial data to resume
+    manifest = Manifest(os.path.join(DATA_DIR, "manifest.json"))
+    journal = Journal(os.path.join(DATA_DIR, "scrape_journal.jsonl"))
+    journaled = journal.replay()
+    if journaled:
+        print(f"  Resuming from journal: {len(journaled.get('season', {}))} seasons, "
+              f"{len(journaled.get('contestant', {}))} profiles")
+
+    # Step 1: Scrape every selected show's season pages to get contestant IDs
+    metrics.phase("seasons")
     print("\n[1/3] Scraping season pages...")
-    seasons = []
-    if os.path.exists(seasons_file):
-        with open(seasons_file, "r", encoding="utf-8") as f:
-            existing = json.load(f)
-        existing_ids = {s["id"] for s in existing}
-        if all(sid in existing_ids for sid in UK_SEASON_IDS) and all(s.get("contestants") for s in existing if s["id"] in set(UK_SEASON_IDS)):
-            print(f"  Loaded {len(existing)} seasons from cache")
-            seasons = existing
-
-    if not seasons:
-        all_contestant_ids = {}
-        for sid in UK_SEASON_IDS:
-            print(f"\n  Season (site id={sid}):")
-            try:
-                season = scrape_season(sid)
-                seasons.append(season)
-                for c in season["contestants"]:
-                    if c["id"] not in HOST_IDS:
-                        all_contestant_ids[c["id"]] = c["name"]
-                print(f"    Contestants: {[c['name'] for c in season['contestants']]}")
-                if season.get("winner"):
-                    print(f"    Winner: {season['winner']['name']}")
-            except Exception as e:
-                print(f"    ERROR: {e}")
-                seasons.append({"id": sid, "seriesNumber": sid, "contestants": [], "error": str(e)})
-        # Save partial progress
-        with open(seasons_file, "w", encoding="utf-8") as f:
-            json.dump(seasons, f, indent=2, ensure_ascii=False)
-
-    # Collect all contestant IDs from seasons
+    known_seasons = {}
+    for files in shard_files.values():
+        if os.path.exists(files["seasons"]):
+            with open(files["seasons"], "r", encoding="utf-8") as f:
+                # Cleaned seasons.json has no site "id"; only raw scraper output can seed the cache
+                known_seasons.update({s["id"]: s for s in json.load(f) if "id" in s and s.get("contestants")})
+    for sid in season_ids:
+        record = manifest.season_record(sid)
+        if record and record.get("contestants"):
+            known_seasons[sid] = record
+    resumed = {sid: s for sid, s in journaled.get("season", {}).items() if s.get("contestants")}
+    known_seasons.update(resumed)
+
+    if args.reparse:
+        todo = list(season_ids)
+    elif args.seasons:
+        todo = [UK_SEASON_IDS[n - 1] for n in args.seasons if UK_SEASON_IDS[n - 1] in season_ids]
+    elif max_age is not None:
+        todo = [sid for sid in season_ids if manifest.is_stale("seasons", sid, max_age)]
+    else:
+        todo = [sid for sid in season_ids if sid not in known_seasons]
+    # Seasons with no record to build from (a cold start with --seasons) are fetched as well
+    todo = set(todo) | {sid for sid in season_ids if sid not in known_seasons}
+    # Journaled seasons from an interrupted run are kept, except on --reparse,
+    # which re-parses every archived page with the current parser
+    todo = [sid for sid in season_ids if sid in todo and (args.reparse or sid not in resumed)]
+    print(f"  {len(season_ids) - len(todo)} seasons up to date, {len(todo)} to fetch")
+
+    by_id = dict(known_seasons)
+    changed_seasons = set()
+    # Forced refetches must reach the site, not a cached copy still inside its TTL
+    forced = set(todo) if args.seasons or max_age is not None else set()
+    for sid, season, err in fetch_and_parse(parse_season, lambda sid: f"season.php?id={sid}", todo, forced):
+        print(f"\n  Season (site id={sid}):")
+        if err:
+            print(f"    ERROR: {err}")
+            if sid not in by_id:
+                by_id[sid] = {"id": sid, "seriesNumber": sid, "contestants": [], "error": str(err)}
+            continue
+        by_id[sid] = season
+        journal.append("season", sid, season)
+        print(f"    Contestants: {[c['name'] for c in season['contestants']]}")
+        if season.get("winner"):
+            print(f"    Winner: {season['winner']['name']}")
+    for sid in set(todo) | set(resumed):
+        if sid in by_id and "error" not in by_id[sid]:
+            if manifest.record("seasons", sid, by_id[sid], fetched=not args.reparse):
+                changed_seasons.add(sid)
+    seasons = [by_id[sid] for sid in season_ids]
+
+    # Collect all contestant IDs from seasons, with the latest season each appeared in
     all_contestant_ids = {}
+    source_season = {}
     for s in seasons:
         for c in s.get("contestants", []):
             if c["id"] not in HOST_IDS:
                 all_contestant_ids[c["id"]] = c["name"]
+                source_season[c["id"]] = s["id"]
     print(f"\nTotal unique contestants: {len(all_contestant_ids)}")
 
     # Step 2: Scrape each contestant's profile
+    metrics.phase("profiles")
     print(f"\n[2/3] Scraping {len(all_contestant_ids)} contestant profiles...")
     # Load existing contestants to resume
     existing_contestants = {}
-    if os.path.exists(contestants_file):
-        with open(contestants_file, "r", encoding="utf-8") as f:
-            for c in json.load(f):
-                if "error" not in c and c.get("episodes", 0) > 0:
-                    existing_contestants[c["id"]] = c
-
-    contestants = []
-    for i, (cid, name) in enumerate(sorted(all_contestant_ids.items())):
-        if cid in existing_contestants:
-            print(f"  [{i+1}/{len(all_contestant_ids)}] {name} (cached)")
-            contestants.append(existing_contestants[cid])
-            continue
-
-        print(f"\n  [{i+1}/{len(all_contestant_ids)}] {name} (id={cid})")
-        try:
-            profile = scrape_contestant_profile(cid)
+    for files in shard_files.values():
+        if os.path.exists(files["contestants"]):
+            with open(files["contestants"], "r", encoding="utf-8") as f:
+                for c in to_records(json.load(f)):
+                    if "error" not in c and c.get("episodes", 0) > 0:
+                        existing_contestants[c["id"]] = c
+    resumed_profiles = {cid: Contestant.from_json(p) for cid, p in journaled.get("contestant", {}).items()}
+    existing_contestants.update(resumed_profiles)
+
+    profiles = {cid: c for cid, c in existing_contestants.items() if cid in all_contestant_ids}
+    refresh = set()
+    if args.reparse:
+        refresh = set(all_contestant_ids)
+    elif args.only_changed:
+        refresh = {cid for cid in all_contestant_ids if source_season[cid] in changed_seasons}
+    else:
+        if args.seasons:
+            refresh |= {cid for cid in all_contestant_ids if source_season[cid] in todo}
+        if max_age is not None:
+            refresh |= {cid for cid in all_contestant_ids if manifest.is_stale("contestants", cid, max_age)}
+    if not args.reparse:
+        refresh -= set(resumed_profiles)
+    todo_profiles = [cid for cid in sorted(all_contestant_ids) if cid not in profiles or cid in refresh]
+    print(f"  {len(all_contestant_ids) - len(todo_profiles)} profiles up to date, {len(todo_profiles)} to fetch")
+
+    errors = 0
+    results = fetch_and_parse(parse_contestant_profile, lambda cid: f"person.php?id={cid}", todo_profiles, refresh)
+    for i, (cid, profile, err) in enumerate(results):
+        name = all_contestant_ids[cid]
+        print(f"\n  [{i+1}/{len(todo_profiles)}] {name} (id={cid})")
+        if err:
+            print(f"    ERROR: {err}")
+            errors += 1
+            if cid not in profiles:
+                profiles[cid] = Contestant.from_json({"id": cid, "name": name, "error": str(err), "seasonIds": []})
+        else:
             profile["name"] = name
-            profile["seasonIds"] = [s["seriesNumber"] for s in seasons
-                                    if any(c["id"] == cid for c in s.get("contestants", []))]
-            contestants.append(profile)
-        except Exception as e:
-            print(f"    ERROR: {e}")
-            contestants.append({"id": cid, "name": name, "error": str(e), "seasonIds": []})
-
-        # Save progress every 10 contestants
-        if (i + 1) % 10 == 0:
-            with open(contestants_file, "w", encoding="utf-8") as f:
-                json.dump(contestants, f, indent=2, ensure_ascii=False)
-            print(f"  [Progress saved: {len(contestants)} contestants]")
-
-    # Step 3: Build analysis
+            profiles[cid] = Contestant.from_json(profile)
+            journal.append("contestant", cid, profile)
+
+    changed_contestants = set()
+    for cid in set(todo_profiles) | set(resumed_profiles):
+        if cid in profiles and "error" not in profiles[cid]:
+            if manifest.record("contestants", cid, profiles[cid].to_json(), fetched=not args.reparse,
+                               seasonId=source_season[cid]):
+                changed_contestants.add(cid)
+
+    manifest.set_last_run(changed_seasons, changed_contestants)
+    metrics.gauge("changed.seasons", len(changed_seasons))
+    metrics.gauge("changed.contestants", len(changed_contestants))
+    metrics.gauge("errors.profiles", errors)
+    manifest.save()
+    print(f"\n  Changed: {len(changed_seasons)} seasons, {len(changed_contestants)} profiles")
+    up_to_date = all(os.path.exists(files["contestants"]) for files in shard_files.values())
+    if not changed_seasons and not changed_contestants and not errors and up_to_date:
+        journal.remove()
+        if cache:
+            cache.flush()
+        archive.flush()
+        print("  Nothing changed; data files left untouched")
+        return
+
+    # Step 3: Build analysis, per show
+    metrics.phase("analysis")
     print("\n[3/3] Building analysis...")
-    analysis = build_analysis(contestants, seasons)
+    shards = []
+    for show in shows:
+        show_seasons = [by_id[sid] for sid in show["seasonIds"]]
+        members = {c["id"] for s in show_seasons for c in s.get("contestants", []) if c["id"] not in HOST_IDS}
+        # Copies, since a contestant on several shows gets each shard's seasonIds
+        show_contestants = [copy.copy(profiles[cid]) for cid in sorted(members)]
+        dataset = Dataset(show_contestants, show_seasons)
+        for c in show_contestants:
+            if "error" not in c:
+                c["seasonIds"] = dataset.seasons_for(c["id"])
+        shards.append((show, show_contestants, show_seasons, build_analysis(show_contestants, show_seasons)))
 
     # Save data
+    metrics.phase("save")
     print("\nSaving data files...")
-    with open(os.path.join(DATA_DIR, "contestants.json"), "w", encoding="utf-8") as f:
-        json.dump(contestants, f, indent=2, ensure_ascii=False)
-    print(f"  Saved contestants.json ({len(contestants)} contestants)")
-
-    with open(os.path.join(DATA_DIR, "seasons.json"), "w", encoding="utf-8") as f:
-        json.dump(seasons, f, indent=2, ensure_ascii=False)
-    print(f"  Saved seasons.json ({len(seasons)} seasons)")
-
-    with open(os.path.join(DATA_DIR, "analysis.json"), "w", encoding="utf-8") as f:
-        json.dump(analysis, f, indent=2, ensure_ascii=False)
-    print(f"  Saved analysis.json")
+    journal.close()
+    for show, show_contestants, show_seasons, analysis in shards:
+        files = shard_files[show["id"]]
+        os.makedirs(os.path.dirname(files["contestants"]), exist_ok=True)
+        write_json_atomic(files["contestants"], records_to_json(show_contestants))
+        print(f"  Saved {os.path.relpath(files['contestants'], DATA_DIR)} ({len(show_contestants)} contestants)")
+
+        write_json_atomic(files["seasons"], show_seasons)
+        print(f"  Saved {os.path.relpath(files['seasons'], DATA_DIR)} ({len(show_seasons)} seasons)")
+
+        write_json_atomic(files["analysis"], analysis)
+        print(f"  Saved {os.path.relpath(files['analysis'], DATA_DIR)}")
+    update_index(DATA_DIR, shows, {show["id"]: {"contestants": len(cs), "seasons": len(ss)}
+                                   for show, cs, ss, _ in shards})
+    journal.remove()
+
+    if cache:
+        cache.flush()
+        print(f"  HTTP cache: {cache.hits} fresh, {cache.revalidated} revalidated, {cache.misses} downloaded")
+    print(f"  Rate: {limiter.summary()}")
+    metrics.gauge("rate.final", limiter.rate)
+    archive.flush()
+    print(f"  Page archive: {archive.stored} new pages, {archive.deduplicated} already stored, {len(archive)} URLs")
 
     print("\n" + "=" * 60)
     print("SCRAPING COMPLETE!")
     print("=" * 60)
 
 
+@metrics.timed()
 def build_analysis(contestants: list[dict], seasons: list[dict]) -> dict:
     """Build pre-computed analysis from contestant data."""
-    valid = [c for c in contestants if "error" not in c and c.get("episodes", 0) >= 5]
-    winners = [c for c in valid if c.get("seasonWins", 0) > 0]
-    non_winners = [c for c in valid if c.get("seasonWins", 0) == 0]
-
-    def avg(group, key, default=0):
-        vals = [c.get(key, default) for c in group if c.get(key, default) != 0]
-        return round(sum(vals) / len(vals), 2) if vals else 0
-
-    def avg_breakdown(group, category, task_type, metric="ppt"):
-        vals = []
-        for c in group:
-            bd = c.get("taskBreakdown", {}).get(category, {}).get(task_type, {})
-            if bd and metric in bd:
-                vals.append(bd[metric])
-        return round(sum(vals) / len(vals), 2) if vals else 0
-
-    def build_group_stats(group, label):
-        return {
-            "count": len(group),
-            "avgPointsPerTask": avg(group, "pointsPerTask"),
-            "avgPointsPerEpisode": avg(group, "pointsPerEpisode"),
-            "avgEpisodeWinPct": avg(group, "episodeWinPct"),
-            "avgTaskWinPct": avg(group, "taskWinPct"),
-            "byTaskType": {
-                "prize": avg_breakdown(group, "setting", "prize"),
-                "filmed": avg_breakdown(group, "setting", "filmed"),
-                "live": avg_breakdown(group, "setting", "live"),
-                "homework": avg_breakdown(group, "setting", "homework"),
-            },
-            "byActivity": {
-                "creative": avg_breakdown(group, "activity", "creative"),
-                "mental": avg_breakdown(group, "activity", "mental"),
-                "physical": avg_breakdown(group, "activity", "physical"),
-                "social": avg_breakdown(group, "activity", "social"),
-            },
-            "byJudgement": {
-                "objective": avg_breakdown(group, "judgement", "objective"),
-                "subjective": avg_breakdown(group, "judgement", "subjective"),
-                "combo": avg_breakdown(group, "judgement", "combo"),
-            },
-            "byFormat": {
-                "solo": avg_breakdown(group, "format", "solo"),
-                "team": avg_breakdown(group, "format", "team"),
-            }
-        }
-
+    engine = AnalysisEngine(contestants, seasons)
+    groups = winner_groups(engine, SCRAPE_SPEC, skip_zero_breakdown=False)
     analysis = {
-        "totalContestants": len(valid),
+        "totalContestants": len(engine.rows),
         "totalSeasons": len(seasons),
-        "winners": build_group_stats(winners, "winners"),
-        "nonWinners": build_group_stats(non_winners, "nonWinners"),
+        "winners": groups["winners"],
+        "nonWinners": groups["nonWinners"],
         "seasonWinners": [],
     }
 
     # Add per-season winner details
+    dataset = Dataset(contestants, seasons)
     for s in seasons:
         if s.get("winner"):
-            winner_data = next((c for c in contestants if c["id"] == s["winner"]["id"]), None)
+            winner_data = dataset.contestant(s["winner"]["id"])
             if winner_data and "error" not in winner_data:
                 analysis["seasonWinners"].append({
                     "season": s["seriesNumber"],
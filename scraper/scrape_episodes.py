@@ -0,0 +1,234 @@
+"""
+Taskmaster UK Episode Scraper
+Scrapes episode and task scores for each UK series from taskmaster.info.
+
+Each series' season page links its episodes; each episode page has a task
+table with one row per task and one score column per contestant. Each episode
+is appended to ../data/episodes.jsonl as soon as it is parsed, and a
+seriesComplete marker follows a series' last episode. A crash loses at most
+the episode in flight: a rerun fetches only the episodes missing since the
+series' last marker. The stream is then compacted into ../data/episodes.json
+in one read, without holding more than one series in memory. Series already
+complete in the stream are skipped on a rerun; --series rescrapes the given
+series and the newest copy wins on compaction.
+
+Run after scrape.py (shares its fetch engine, HTTP cache and rate limit):
+    python scrape_episodes.py [--series 19,20]
+"""
+
+import argparse
+import json
+import os
+import re
+
+from bs4 import SoupStrainer
+
+from clean_data import UK_SEASONS
+from episodes import EPISODES_FILE, EPISODES_STREAM, EpisodesWriter
+import scrape
+from journal import truncate_torn_tail
+from scrape import (DEFAULT_TTL, HOST_IDS, MAX_REQUESTS_PER_SECOND, MAX_WORKERS, REQUESTS_PER_SECOND,
+                    configure, fetch_all, fetch_html, make_soup, parse_series_list, safe_int)
+from timeline import CLIENT_TIMELINE_FILE, TIMELINE_FILE
+from timeline import update as update_timeline
+
+EPISODE_LINK = re.compile(r"episode\.php\?id=(\d+)")
+TASK_LINK = re.compile(r"task\.php\?id=(\d+)")
+PERSON_LINK = re.compile(r"person\.php\?id=(\d+)")
+JUDGEMENT_TYPES = {"objective": "objective", "subjective": "subjective",
+                   "combination": "combo", "combo": "combo"}
+JUDGEMENT_WORD = re.compile(r"[a-z]+")
+EPISODE_STRAINER = SoupStrainer(["h1", "table"])
+
+
+def parse_episode_links(html: str) -> list[int]:
+    """Episode IDs linked from a season page, in page order."""
+    soup = make_soup(html, SoupStrainer("a", href=EPISODE_LINK))
+    ids = []
+    for link in soup.find_all("a"):
+        eid = int(EPISODE_LINK.search(link["href"]).group(1))
+        if eid not in ids:
+            ids.append(eid)
+    return ids
+
+
+def parse_episode(html: str, number: int) -> dict:
+    """Parse an episode.php page into {episode, title, tasks}."""
+    soup = make_soup(html, EPISODE_STRAINER)
+    heading = soup.find("h1")
+    title = heading.get_text(strip=True) if heading else ""
+    title = re.sub(r"^(Episode\s+\d+\s*[:\-–]\s*)", "", title)
+
+    table = next((t for t in soup.find_all("table") if t.find("a", href=TASK_LINK)), None)
+    episode = {"episode": number, "title": title, "tasks": []}
+    if table is None:
+        return episode
+
+    # Contestant columns come from the person links in the header row
+    header = table.find("tr")
+    contestants = []
+    for link in header.find_all("a", href=PERSON_LINK):
+        cid = int(PERSON_LINK.search(link["href"]).group(1))
+        if cid not in HOST_IDS:
+            contestants.append({"id": cid, "name": link.get_text(strip=True)})
+
+    for row in table.find_all("tr")[1:]:
+        link = row.find("a", href=TASK_LINK)
+        if not link:
+            continue
+        cells = row.find_all("td")
+        scores = cells[-len(contestants):] if contestants else []
+        # The judgement is in its own cell; the task name may contain "objective" etc.
+        task_cell = link.find_parent("td")
+        info = [cell for cell in cells[:len(cells) - len(scores)] if cell is not task_cell]
+        words = JUDGEMENT_WORD.findall(" ".join(cell.get_text(" ", strip=True) for cell in info).lower())
+        judgement = next((JUDGEMENT_TYPES[w] for w in words if w in JUDGEMENT_TYPES), "subjective")
+        episode["tasks"].append({
+            "id": int(TASK_LINK.search(link["href"]).group(1)),
+            "name": link.get_text(strip=True),
+            "judgement": judgement,
+            "contestants": [
+                {**c, "score": safe_int(cell.get_text(strip=True))}
+                for c, cell in zip(contestants, scores)
+            ],
+        })
+    return episode
+
+
+def scrape_series(site_id: int, series: int, stream_path: str, have: set[int]) -> tuple[int, int]:
+    """Fetch a series' episode pages, appending each episode to the stream as it
+    is parsed, then the completion marker. Episode numbers in have are already
+    in the stream and are not refetched. Returns (episodes, tasks fetched)."""
+    episode_ids = parse_episode_links(fetch_html(f"season.php?id={site_id}"))
+    numbers = {eid: i + 1 for i, eid in enumerate(episode_ids)}
+    todo = [eid for eid in episode_ids if numbers[eid] not in have]
+    tasks = 0
+    for eid, html, err in fetch_all(lambda e: fetch_html(f"episode.php?id={e}"), todo):
+        if err:
+            raise Exception(f"episode {eid}: {err}")
+        episode = parse_episode(html, numbers[eid])
+        append_records(stream_path, [{"series": series, **episode}])
+        tasks += len(episode["tasks"])
+    append_records(stream_path, [{"series": series, "seriesComplete": True}])
+    return len(episode_ids), tasks
+
+
+def scan_stream(path: str) -> tuple[dict[int, dict[int, int]], dict[int, dict[int, int]]]:
+    """Byte offsets of episode lines, from one read of the JSONL stream.
+
+    Returns (complete, pending): complete maps each series with a marker to
+    {episode: offset} for its last completed block; pending holds the episodes
+    written since a series' last marker (an interrupted scrape). Within a
+    block, a later copy of an episode wins.
+    """
+    complete: dict[int, dict[int, int]] = {}
+    pending: dict[int, dict[int, int]] = {}
+    if not os.path.exists(path):
+        return complete, pending
+    with open(path, "rb") as f:
+        offset = 0
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                rec = {}  # torn final line from an interrupted run
+            series = rec.get("series")
+            if rec.get("seriesComplete"):
+                complete[series] = pending.pop(series, {})
+            elif "episode" in rec:
+                pending.setdefault(series, {})[rec["episode"]] = offset
+            offset += len(line)
+    return complete, pending
+
+
+def completed_series(path: str) -> set[int]:
+    return set(scan_stream(path)[0])
+
+
+def compact(stream_path: str, out_path: str, series_order: list[int]) -> int:
+    """Rewrite the JSONL stream as episodes.json, one series in memory at a time."""
+    complete, _ = scan_stream(stream_path)
+    writer = EpisodesWriter(out_path)
+    total = 0
+    with open(stream_path, "rb") as f:
+        for series in series_order:
+            for number, offset in sorted(complete.get(series, {}).items()):
+                f.seek(offset)
+                rec = json.loads(f.readline())
+                writer.write(series, {k: v for k, v in rec.items() if k != "series"})
+                total += 1
+    writer.close()
+    return total
+
+
+def append_records(stream_path: str, records: list[dict]) -> None:
+    """Append records to the JSONL stream, fsync'd."""
+    # A line torn by an interrupted run would swallow the next record
+    truncate_torn_tail(stream_path)
+    with open(stream_path, "a", encoding="utf-8") as stream:
+        for rec in records:
+            stream.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        stream.flush()
+        os.fsync(stream.fileno())
+
+
+def append_series(stream_path: str, series: int, episodes: list[dict]) -> None:
+    """Append a whole series' episodes and its completion marker to the stream."""
+    append_records(stream_path, [{"series": series, **ep} for ep in episodes]
+                   + [{"series": series, "seriesComplete": True}])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrape Taskmaster UK episode and task scores")
+    parser.add_argument("--series", type=parse_series_list, metavar="N,N",
+                        help="rescrape only these UK series")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--rate", type=float, default=REQUESTS_PER_SECOND)
+    parser.add_argument("--max-rate", type=float, default=MAX_REQUESTS_PER_SECOND)
+    parser.add_argument("--no-cache", action="store_true", help="bypass the on-disk HTTP cache")
+    args = parser.parse_args()
+    configure(args.workers, args.rate, args.max_rate, use_cache=not args.no_cache, cache_ttl=DEFAULT_TTL)
+    try:
+        run(args)
+    finally:
+        # Index entries are written in batches; the last partial batch is flushed here
+        if scrape.cache:
+            scrape.cache.flush()
+        if scrape.archive:
+            scrape.archive.flush()
+
+
+def run(args):
+    print("=" * 60)
+    print("TASKMASTER UK EPISODE SCRAPER")
+    print("=" * 60)
+
+    series_by_site = {site_id: info["series"] for site_id, info in sorted(UK_SEASONS.items())}
+    complete, pending = scan_stream(EPISODES_STREAM)
+    done = set(complete) if not args.series else set()
+    wanted = set(args.series or series_by_site.values())
+
+    for site_id, series in series_by_site.items():
+        if series not in wanted or series in done:
+            continue
+        have = set(pending.get(series, {}))
+        print(f"\n  Series {series} (site id={site_id}):" + (f" resuming after {len(have)} episodes" if have else ""))
+        try:
+            episodes, tasks = scrape_series(site_id, series, EPISODES_STREAM, have)
+        except Exception as e:
+            print(f"    ERROR: {e}")
+            continue
+        print(f"    {episodes} episodes, {tasks} tasks fetched")
+
+    missing = set(series_by_site.values()) - completed_series(EPISODES_STREAM)
+    if missing:
+        print(f"\nSeries {sorted(missing)} not scraped yet; episodes.json left as is")
+        return
+    total = compact(EPISODES_STREAM, EPISODES_FILE, list(series_by_site.values()))
+    print(f"\nSaved episodes.json ({total} episodes)")
+    changed = update_timeline(EPISODES_FILE, TIMELINE_FILE, client_path=CLIENT_TIMELINE_FILE)
+    print(f"timeline.json: {changed} episodes recomputed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+BM25 retrieval index and per-entity snippets for the chat (data/search_index.json).
+
+Built by clean_data.py so the chat can send the model only the rows relevant
+to a question, within a token budget, instead of every contestant's stats.
+There is one document per contestant, season and task (tasks come from
+episodes.json when it exists). Each has a one-line snippet in the style of
+the old full data dump, and an estimated token count for budget packing:
+
+    {"k1": 1.2, "b": 0.75, "stopwords": [...],
+     "docs": [{"id": "contestant:21", "type": "contestant", "title": ..., "snippet": ..., "tokens": 52}, ...],
+     "postings": {"fielding": [[doc index, weight], ...], ...}}
+
+Weights are the full BM25 term score (idf x saturated, length-normalised tf),
+so a query's score for a document is the sum of the weights of its terms and
+needs no document statistics at query time. Text is casefolded with
+diacritics stripped, and "series 4" / "season 4" / "s4" all become "s4"; the
+server tokenizes queries the same way.
+
+    python search_index.py "noel fielding prize tasks"
+"""
+
+import json
+import math
+import os
+import re
+import sys
+from collections import Counter
+
+from episodes import EPISODES_FILE, iter_episodes
+from names import normalise
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+INDEX_FILE = os.path.join(DATA_DIR, "search_index.json")
+
+K1 = 1.2
+B = 0.75
+CHARS_PER_TOKEN = 4  # rough estimate for English prompt text
+STOPWORDS = frozenset("""
+    a an and are as at be by did do does for from had has have how i in is it its me of on or
+    the their them they this to was were what when which who whom why will with
+""".split())
+NAME_BOOST = 2  # a document's title counts this many times towards its term frequencies
+
+_WORD = re.compile(r"[a-z0-9]+")
+_SERIES_WORDS = {"series", "season", "s"}
+
+
+def tokenize(text: str) -> list[str]:
+    words = _WORD.findall(normalise(text))
+    tokens = []
+    i = 0
+    while i < len(words):
+        w = words[i]
+        if w in _SERIES_WORDS and i + 1 < len(words) and words[i + 1].isdigit():
+            tokens.append(f"s{int(words[i + 1])}")
+            i += 2
+            continue
+        if w not in STOPWORDS:
+            tokens.append(w)
+        i += 1
+    return tokens
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def contestant_doc(c: dict) -> dict:
+    bd = c.get("taskBreakdown") or {}
+
+    def ppt(cat, t):
+        return (bd.get(cat, {}).get(t) or {}).get("ppt", 0)
+
+    series = ",".join(str(s) for s in c.get("seasonIds", []))
+    snippet = (f"{c['name']} (S{series}): PpT={c.get('pointsPerTask', 0)}, PpE={c.get('pointsPerEpisode', 0)}, "
+               f"EpWin%={c.get('episodeWinPct', 0)}%, SeasonWins={c.get('seasonWins', 0)}, "
+               f"Prize={ppt('setting', 'prize')}, Filmed={ppt('setting', 'filmed')}, Live={ppt('setting', 'live')}, "
+               f"Creative={ppt('activity', 'creative')}, Mental={ppt('activity', 'mental')}, "
+               f"Physical={ppt('activity', 'physical')}, Social={ppt('activity', 'social')}, "
+               f"Objective={ppt('judgement', 'objective')}, Subjective={ppt('judgement', 'subjective')}")
+    text = " ".join([c["name"]] * NAME_BOOST + [f"series {s}" for s in c.get("seasonIds", [])]
+                    + (["winner champion"] if c.get("seasonWins") else []))
+    return {"id": f"contestant:{c['id']}", "type": "contestant", "title": c["name"], "snippet": snippet, "text": text}
+
+
+def season_doc(s: dict) -> dict:
+    members = sorted(s.get("contestants", []), key=lambda c: -c.get("totalPoints", 0))
+    winner = s.get("winner", {}).get("name", "")
+    title = f"Series {s['seriesNumber']}"
+    snippet = (f"{title} ({s.get('year', '?')}, {s.get('episodes', 0)} episodes): winner {winner}; "
+               + ", ".join(f"{c['name']} {c.get('totalPoints', 0)}pts" for c in members))
+    text = " ".join([title] * NAME_BOOST + [str(s.get("year", "")), "winner champion", winner]
+                    + [c["name"] for c in members])
+    return {"id": f"season:{s['seriesNumber']}", "type": "season", "title": title, "snippet": snippet, "text": text}
+
+
+def task_doc(series: int, ep: dict, task: dict) -> dict:
+    scores = ", ".join(f"{c['name']} {c['score']}" for c in task["contestants"])
+    snippet = (f"S{series}E{ep['episode']} task \"{task['name']}\" ({task.get('judgement', '?')}): {scores}")
+    text = " ".join([task["name"]] * NAME_BOOST + [f"series {series}", ep.get("title", ""), task.get("judgement", "")]
+                    + [c["name"] for c in task["contestants"]])
+    # Task IDs repeat across series, so the doc ID also says where the task was set
+    return {"id": f"task:{series}:{ep['episode']}:{task['id']}", "type": "task", "title": task["name"],
+            "snippet": snippet, "text": text}
+
+
+def iter_docs(contestants: list[dict], seasons: list[dict], episodes_path: str | None):
+    for c in contestants:
+        yield contestant_doc(c)
+    for s in seasons:
+        yield season_doc(s)
+    if episodes_path and os.path.exists(episodes_path):
+        for series, ep in iter_episodes(episodes_path):
+            for task in ep["tasks"]:
+                yield task_doc(series, ep, task)
+
+
+def build_index(contestants: list[dict], seasons: list[dict], episodes_path: str | None = EPISODES_FILE) -> dict:
+    docs, term_freqs = [], []
+    for doc in iter_docs(contestants, seasons, episodes_path):
+        term_freqs.append(Counter(tokenize(doc.pop("text"))))
+        doc["tokens"] = estimate_tokens(doc["snippet"])
+        docs.append(doc)
+
+    n = len(docs)
+    lengths = [sum(tf.values()) for tf in term_freqs]
+    avg_length = sum(lengths) / n if n else 0.0
+    doc_freq = Counter(term for tf in term_freqs for term in tf)
+    postings: dict[str, list] = {}
+    for i, (tf, length) in enumerate(zip(term_freqs, lengths)):
+        norm = K1 * (1 - B + B * length / avg_length)
+        for term, f in tf.items():
+            idf = math.log(1 + (n - doc_freq[term] + 0.5) / (doc_freq[term] + 0.5))
+            postings.setdefault(term, []).append([i, round(idf * f * (K1 + 1) / (f + norm), 4)])
+
+    return {
+        "k1": K1,
+        "b": B,
+        "charsPerToken": CHARS_PER_TOKEN,
+        "stopwords": sorted(STOPWORDS),
+        "docs": docs,
+        "postings": dict(sorted(postings.items())),
+    }
+
+
+def search(index: dict, query: str, n: int = 10) -> list[tuple[dict, float]]:
+    """Top n documents for query by BM25 score."""
+    scores: dict[int, float] = {}
+    for term in set(tokenize(query)):
+        for doc, weight in index["postings"].get(term, []):
+            scores[doc] = scores.get(doc, 0.0) + weight
+    best = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+    return [(index["docs"][doc], score) for doc, score in best]
+
+
+def main():
+    with open(INDEX_FILE, "r", encoding="utf-8") as f:
+        index = json.load(f)
+    for doc, score in search(index, " ".join(sys.argv[1:])):
+        print(f"{score:6.2f}  {doc['snippet']}")
+
+
+if __name__ == "__main__":
+    main()
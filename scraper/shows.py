@@ -0,0 +1,92 @@
+"""
+Taskmaster shows on taskmaster.info and the data shard each one is written to.
+
+The site's home page links every show (show.php?id=N), and each show page
+lists its series in broadcast order. Every show gets its own shard directory
+with the same file names, so consumers load, and builds process, only the
+show they need:
+
+    data/                 Taskmaster UK (show 1), the default shard
+    data/<slug>/          every other show, e.g. data/norway/contestants.json
+    data/shows.json       global index: per show its id, name, slug, shard
+                          directory, series site IDs and record counts
+
+The UK shard stays at the top level so the server, client and the episode
+tools keep their paths. Its series list is the curated UK_SEASON_IDS rather
+than the show page, which also lists specials.
+"""
+
+import json
+import os
+import re
+import unicodedata
+
+from bs4 import BeautifulSoup
+
+from journal import write_json_atomic
+
+DEFAULT_SHOW = 1
+DEFAULT_SLUG = "uk"
+INDEX_NAME = "shows.json"
+
+SHOW_LINK = re.compile(r"show\.php\?id=(\d+)")
+SEASON_LINK = re.compile(r"season\.php\?id=(\d+)")
+# Series links on a show page that are one-off specials, not regular series
+SPECIAL_SERIES = re.compile(r"champion|new year|special|christmas", re.IGNORECASE)
+
+
+def slugify(name: str, show_id: int) -> str:
+    """Directory name for a show: "Taskmaster Norway" -> "norway"."""
+    text = unicodedata.normalize("NFKD", name)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch)).lower()
+    text = re.sub(r"^taskmaster\b", "", text.strip())
+    slug = re.sub(r"[^a-z0-9]+", "-", text).strip("-")
+    return slug or f"show-{show_id}"
+
+
+def parse_show_list(html: str, parser: str | None = None) -> list[int]:
+    """Show IDs linked from a page, in page order, without duplicates."""
+    soup = BeautifulSoup(html, parser or "html.parser")
+    ids = [int(m.group(1)) for a in soup.find_all("a", href=SHOW_LINK) if (m := SHOW_LINK.search(a["href"]))]
+    return list(dict.fromkeys(ids))
+
+
+def parse_show(html: str, show_id: int, parser: str | None = None) -> dict:
+    """Parse a show.php page into {id, name, slug, seasonIds}, seasonIds being
+    the site IDs of its regular series in page order."""
+    soup = BeautifulSoup(html, parser or "html.parser")
+    heading = soup.find("h1") or soup.find("title")
+    name = heading.get_text(" ", strip=True) if heading else ""
+    name = re.split(r"\s+[-|]\s+", name)[0] or f"Show {show_id}"
+    seasons = []
+    for a in soup.find_all("a", href=SEASON_LINK):
+        sid = int(SEASON_LINK.search(a["href"]).group(1))
+        if sid not in seasons and not SPECIAL_SERIES.search(a.get_text(" ", strip=True)):
+            seasons.append(sid)
+    slug = DEFAULT_SLUG if show_id == DEFAULT_SHOW else slugify(name, show_id)
+    return {"id": show_id, "name": name, "slug": slug, "seasonIds": seasons}
+
+
+def shard_dir(data_dir: str, show: dict) -> str:
+    return data_dir if show["id"] == DEFAULT_SHOW else os.path.join(data_dir, show["slug"])
+
+
+def load_index(data_dir: str) -> list[dict]:
+    path = os.path.join(data_dir, INDEX_NAME)
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)["shows"]
+
+
+def update_index(data_dir: str, shows: list[dict], counts: dict[int, dict]):
+    """Merge shows (with their record counts) into data/shows.json."""
+    # No timestamp: the index is committed, and an unchanged run must leave it as is
+    entries = {s["id"]: {k: v for k, v in s.items() if k != "updatedAt"} for s in load_index(data_dir)}
+    for show in shows:
+        entries[show["id"]] = {
+            **{k: show[k] for k in ("id", "name", "slug", "seasonIds")},
+            "dir": os.path.relpath(shard_dir(data_dir, show), data_dir).replace(os.sep, "/"),
+            **counts.get(show["id"], {}),
+        }
+    write_json_atomic(os.path.join(data_dir, INDEX_NAME), {"shows": [entries[k] for k in sorted(entries)]})
@@ -0,0 +1,91 @@
+"""
+Precomputed "contestants most like X" neighbours (data/similar.json).
+
+Built by clean_data.py. Each contestant's taskBreakdown becomes one feature
+vector: for every category/type, its share of the contestant's tasks in that
+category, winPct and ppt. Types a contestant never attempted take the column
+mean, so a gap reads as average rather than as a bad score. Columns are
+z-scored and rows scaled to unit length, so cosine similarity is a dot
+product and the exact top-k comes from batched matrix products plus
+argpartition, BATCH rows at a time to bound memory:
+
+    {"k": 10, "features": ["format.solo.share", ...],
+     "contestants": {"<id>": [[neighbour id, similarity], ...]}}
+
+Neighbours are ordered most similar first (ties by ID). Contestants without
+any attempted task are left out.
+"""
+
+import numpy as np
+
+from analysis import BREAKDOWN_CATEGORIES
+from records import CATEGORY_TYPES, N_METRICS, SLOTS, Breakdown, Contestant, Metric
+
+TOP_K = 10
+BATCH = 1024  # query rows per similarity block (BATCH x n floats)
+FEATURE_METRICS = ("share", "winPct", "ppt")
+
+
+def feature_names() -> list[str]:
+    return [f"{cat}.{t}.{m}" for cat, types in BREAKDOWN_CATEGORIES.items() for t in types for m in FEATURE_METRICS]
+
+
+def feature_matrix(contestants: list) -> tuple[np.ndarray, np.ndarray]:
+    """IDs and unit-length, standardised feature rows for contestants with any tasks."""
+    breakdowns = [c.taskBreakdown if isinstance(c, Contestant) else Breakdown.from_json(c.get("taskBreakdown") or {})
+                  for c in contestants]
+    empty = bytes(8 * len(SLOTS) * N_METRICS)
+    values = np.frombuffer(b"".join(b.values.tobytes() if b else empty for b in breakdowns),
+                           dtype=float).reshape(len(breakdowns), len(SLOTS), N_METRICS)
+    attempted = values[:, :, Metric.ATTEMPTED]
+    keep = (attempted > 0).any(axis=1)
+    ids = np.array([c["id"] for c in contestants], dtype=np.int64)[keep]
+    values, attempted = values[keep], attempted[keep]
+
+    # Share of the contestant's tasks in the same category, per type
+    totals = np.zeros_like(attempted)
+    start = 0
+    for types in CATEGORY_TYPES.values():
+        end = start + len(types)
+        totals[:, start:end] = attempted[:, start:end].sum(axis=1, keepdims=True)
+        start = end
+    share = np.divide(attempted, totals, out=np.zeros_like(attempted), where=totals > 0)
+    x = np.stack([share, values[:, :, Metric.WIN_PCT], values[:, :, Metric.PPT]], axis=2).reshape(len(ids), -1)
+    # share is always meaningful; winPct/ppt only where the type was attempted
+    tried = attempted > 0
+    mask = np.stack([np.ones_like(tried), tried, tried], axis=2).reshape(x.shape)
+
+    counts = mask.sum(axis=0)
+    means = np.divide(np.where(mask, x, 0).sum(axis=0), counts, out=np.zeros(x.shape[1]), where=counts > 0)
+    x = np.where(mask, x, means)
+    std = x.std(axis=0)
+    x = (x - x.mean(axis=0)) / np.where(std > 0, std, 1)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return ids, x / np.where(norms > 0, norms, 1)
+
+
+def top_k(ids: np.ndarray, x: np.ndarray, k: int = TOP_K) -> dict[str, list]:
+    """Exact cosine top-k neighbours for every row, excluding itself."""
+    n = len(ids)
+    k = min(k, n - 1)
+    out = {}
+    if k <= 0:
+        return {str(cid): [] for cid in ids.tolist()}
+    for start in range(0, n, BATCH):
+        sims = x[start:start + BATCH] @ x.T
+        rows = np.arange(sims.shape[0])
+        sims[rows, rows + start] = -np.inf
+        # k best in arbitrary order, then sort those by (-similarity, id)
+        cand = np.argpartition(-sims, k - 1, axis=1)[:, :k]
+        cand_sims = np.take_along_axis(sims, cand, axis=1)
+        order = np.lexsort((ids[cand], -cand_sims), axis=1)
+        cand = np.take_along_axis(cand, order, axis=1)
+        cand_sims = np.round(np.take_along_axis(cand_sims, order, axis=1), 4)
+        for i, (nbrs, vals) in enumerate(zip(ids[cand].tolist(), cand_sims.tolist())):
+            out[str(ids[start + i])] = [[nid, v] for nid, v in zip(nbrs, vals)]
+    return out
+
+
+def build_similar(contestants: list[dict], k: int = TOP_K) -> dict:
+    ids, x = feature_matrix(contestants)
+    return {"k": k, "features": feature_names(), "contestants": top_k(ids, x, k)}
@@ -0,0 +1,73 @@
+"""Incremental aggregates must give exactly the full rebuild's analysis stats."""
+
+import copy
+import json
+import os
+import random
+
+from aggregates import AggregateStore, compare
+from analysis import AnalysisEngine, winner_groups
+from bench import DATA_DIR, scaled_contestants
+
+with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+    CONTESTANTS = json.load(f)
+
+
+def full(contestants):
+    return winner_groups(AnalysisEngine(contestants))
+
+
+def test_store_matches_full_rebuild():
+    for scale in (1, 10):
+        contestants = scaled_contestants(CONTESTANTS, scale)
+        assert compare(AggregateStore.from_contestants(contestants).group_stats(), full(contestants)) == []
+
+
+def test_deltas_match_full_rebuild(tmp_path):
+    rng = random.Random(1)
+    contestants = scaled_contestants(CONTESTANTS, 3)
+    store = AggregateStore.from_contestants(contestants)
+    path = str(tmp_path / "analysis_aggregates.json")
+    store.save(path)
+
+    contestants = copy.deepcopy(contestants)
+    changed = set()
+    for c in rng.sample(contestants, 20):
+        c["pointsPerTask"] = round(c.get("pointsPerTask", 0) * rng.uniform(0.8, 1.2), 2)
+        for types in c.get("taskBreakdown", {}).values():
+            for m in types.values():
+                m["ppt"] = round(m["ppt"] * rng.uniform(0.8, 1.2), 2)
+        c["seasonWins"] = 1 - min(c.get("seasonWins", 0), 1)
+        changed.add(c["id"])
+    contestants.pop(5)
+    contestants.insert(0, contestants.pop())
+
+    store = AggregateStore.load(path)
+    store.sync(contestants, changed)
+    assert compare(store.group_stats(), full(contestants)) == []
+    assert store.same_state(AggregateStore.from_contestants(contestants))
+
+
+def test_old_file_versions_are_rebuilt(tmp_path):
+    path = tmp_path / "analysis_aggregates.json"
+    path.write_text(json.dumps({"groups": {}, "members": {}}), encoding="utf-8")
+    assert AggregateStore.load(str(path)) is None
+
+
+def test_half_cent_averages_match_committed_analysis():
+    with open(os.path.join(DATA_DIR, "analysis.json"), "r", encoding="utf-8") as f:
+        committed = json.load(f)
+    stats = AggregateStore.from_contestants(CONTESTANTS).group_stats()
+    assert stats == full(CONTESTANTS) == {g: committed[g] for g in ("winners", "nonWinners")}
+
+
+def test_sums_are_exact_after_add_and_remove(tmp_path):
+    contestants = scaled_contestants(CONTESTANTS, 2)
+    store = AggregateStore.from_contestants(contestants)
+    for c in contestants[::3]:
+        store.remove(c["id"])
+    for c in contestants[::3]:
+        store.upsert(c)
+    path = str(tmp_path / "analysis_aggregates.json")
+    store.save(path)
+    assert AggregateStore.load(path).same_state(AggregateStore.from_contestants(contestants))
@@ -0,0 +1,55 @@
+"""The columnar engine must give the same group stats as plain per-group loops."""
+
+import json
+import math
+import os
+
+from analysis import CLEAN_SPEC, SCRAPE_SPEC, TOP_LEVEL, AnalysisEngine, winner_groups
+from bench import DATA_DIR, legacy_clean_analysis, legacy_scrape_analysis, scaled_contestants
+
+with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+    CONTESTANTS = json.load(f)
+with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+    SEASONS = json.load(f)
+
+
+def contestant(cid, judgement=None, **stats):
+    c = {"id": cid, "name": f"C{cid}", "episodes": 10, "seasonIds": [1], **stats}
+    if judgement is not None:
+        c["taskBreakdown"] = {"judgement": judgement}
+    return c
+
+
+def test_winner_groups_match_legacy_loops():
+    for scale in (1, 3):
+        cs = scaled_contestants(CONTESTANTS, scale)
+        assert winner_groups(AnalysisEngine(cs, SEASONS)) == legacy_clean_analysis(cs, SEASONS)
+        assert winner_groups(AnalysisEngine(cs, SEASONS), SCRAPE_SPEC, False) == legacy_scrape_analysis(cs, SEASONS)
+
+
+def test_series_groups_match_per_series_loops():
+    cs = scaled_contestants(CONTESTANTS, 2)
+    engine = AnalysisEngine(cs, SEASONS)
+    groups = engine.group_stats({"series": "series"})["series"]
+    for series, stats in groups.items():
+        members = [c for c in engine.rows if series in c.get("seasonIds", [])]
+        assert stats["count"] == len(members)
+        for out_key, key in TOP_LEVEL.items():
+            vals = [c[key] for c in members if c.get(key, 0) != 0]
+            assert stats[out_key] == (round(math.fsum(vals) / len(vals), 2) if vals else 0)
+        cat, types = CLEAN_SPEC["byActivity"]
+        for t in types:
+            vals = [e["ppt"] for c in members if (e := c.get("taskBreakdown", {}).get(cat, {}).get(t)) and e["ppt"] > 0]
+            assert stats["byActivity"][t] == (round(math.fsum(vals) / len(vals), 2) if vals else 0)
+
+
+def test_judgement_grouping_leaves_rows_without_data_unlabelled():
+    engine = AnalysisEngine([
+        contestant(1, {"subjective": {"ppt": 2.5}, "objective": {"ppt": 1.5}}),
+        contestant(2),
+        contestant(3, {}),
+        contestant(4, {"combo": {"ppt": 3.0}}),
+    ])
+    assert engine._labels("judgement") == ["subjective", "none", "none", "combo"]
+    groups = engine.group_stats({"judgement": "judgement"})["judgement"]
+    assert {label: stats["count"] for label, stats in groups.items()} == {"subjective": 1, "none": 2, "combo": 1}
@@ -0,0 +1,65 @@
+"""Cleaning a show shard, in process and in pool workers."""
+
+import argparse
+import json
+import os
+
+import clean_data
+from bench import DATA_DIR
+from metrics import metrics
+from shows import update_index
+
+SHOW = {"id": 9, "name": "Taskmaster Test", "slug": "test", "seasonIds": [100 + n for n in range(1, 21)]}
+ARGS = argparse.Namespace(shows="9", only_changed=False, incremental=False, verify=False)
+
+
+def raw_shard(root: str) -> str:
+    """A scrape-shaped shard built from the committed UK data under fake site IDs."""
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = json.load(f)
+    with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+        seasons = json.load(f)
+    for c in contestants:
+        c["seasonIds"] = [100 + s for s in c["seasonIds"]]
+    # Another show's contestant, mixed in by an older scrape
+    contestants.append({**contestants[0], "id": 99999, "seasonIds": [999]})
+    seasons = [{"id": 100 + s["seriesNumber"], "seriesNumber": 100 + s["seriesNumber"], "year": s["year"],
+                "episodeCount": s["episodes"], "contestants": [{"id": c["id"], "name": c["name"]}
+                                                                for c in s["contestants"]],
+                "winner": {"name": s["winner"]["name"]}} for s in seasons]
+    shard = os.path.join(root, SHOW["slug"])
+    os.makedirs(shard)
+    for name, data in (("contestants", contestants), ("seasons", seasons)):
+        with open(os.path.join(shard, f"{name}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+    update_index(root, [SHOW], {})
+    return shard
+
+
+def read(shard: str, name: str):
+    with open(os.path.join(shard, f"{name}.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_recleaning_a_cleaned_shard_keeps_every_contestant(tmp_path):
+    shard = raw_shard(str(tmp_path))
+    counts = clean_data.clean_show(str(tmp_path), SHOW, ARGS, {})
+    assert counts == {"contestants": 100, "seasons": 20}
+    contestants, seasons = read(shard, "contestants"), read(shard, "seasons")
+    assert sorted({s for c in contestants for s in c["seasonIds"]}) == list(range(1, 21))
+
+    assert clean_data.clean_show(str(tmp_path), SHOW, ARGS, {}) == counts
+    assert read(shard, "contestants") == contestants
+    assert read(shard, "seasons") == seasons
+
+
+def test_worker_metrics_reach_the_parent(tmp_path, monkeypatch):
+    raw_shard(str(tmp_path))
+    monkeypatch.setattr(clean_data, "DATA_DIR", str(tmp_path))
+    metrics.reset()
+    clean_data.run(ARGS)
+    snapshot = metrics.snapshot()
+    assert snapshot["counters"]["contestants"] == 100
+    assert snapshot["timers"]["build_rankings"]["count"] == 1
+    assert "clean" in snapshot["phases"]
+    assert "updatedAt" not in read(str(tmp_path), "shows")["shows"][0]
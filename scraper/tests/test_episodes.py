@@ -0,0 +1,120 @@
+"""Episode page parsing and the episodes.jsonl stream."""
+
+import json
+
+import scrape
+import scrape_episodes
+import timeline
+from archive import PageArchive
+from http_cache import HttpCache
+from scrape_episodes import append_series, compact, completed_series, parse_episode, scan_stream, scrape_series
+
+HEADER = ('<tr><th>Task</th><th>Type</th><th><a href="person.php?id=1">Ann</a></th>'
+          '<th><a href="person.php?id=2">Bob</a></th></tr>')
+
+
+def episode_page(rows: str) -> str:
+    return f"<html><body><h1>Episode 1: Test</h1><table>{HEADER}{rows}</table></body></html>"
+
+
+def task_row(task_id: int, name: str, judgement: str) -> str:
+    return (f'<tr><td><a href="task.php?id={task_id}">{name}</a></td><td>{judgement}</td>'
+            "<td>3</td><td>5</td></tr>")
+
+
+def test_judgement_comes_from_its_cell_not_the_task_name():
+    html = episode_page(task_row(1, "Most objective-looking hat", "Subjective")
+                        + task_row(2, "Make a subjective sculpture", "Objective")
+                        + task_row(3, "Combination lock", "Combination"))
+    tasks = parse_episode(html, 1)["tasks"]
+    assert [t["judgement"] for t in tasks] == ["subjective", "objective", "combo"]
+    assert tasks[0]["contestants"] == [{"id": 1, "name": "Ann", "score": 3}, {"id": 2, "name": "Bob", "score": 5}]
+
+
+def test_append_after_torn_stream_tail(tmp_path):
+    stream = str(tmp_path / "episodes.jsonl")
+    out = str(tmp_path / "episodes.json")
+    episode = {"episode": 1, "title": "", "tasks": []}
+    append_series(stream, 1, [episode])
+    with open(stream, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"series": 2, **episode})[:15])  # crash mid-write
+    append_series(stream, 2, [episode, {**episode, "episode": 2}])
+
+    assert completed_series(stream) == {1, 2}
+    assert compact(stream, out, [1, 2]) == 3
+    with open(out, "r", encoding="utf-8") as f:
+        assert [ep["episode"] for ep in json.load(f)["2"]] == [1, 2]
+
+
+def test_timeline_update_writes_the_client_copy(tmp_path):
+    stream = str(tmp_path / "episodes.jsonl")
+    episodes = str(tmp_path / "episodes.json")
+    paths = [str(tmp_path / "timeline.json"), str(tmp_path / "client_timeline.json")]
+    tasks = [{"id": 1, "contestants": [{"id": 1, "name": "Ann", "score": 3}, {"id": 2, "name": "Bob", "score": 5}]}]
+    append_series(stream, 1, [{"episode": 1, "title": "", "tasks": tasks}])
+    compact(stream, episodes, [1])
+
+    assert timeline.update(episodes, paths[0], client_path=paths[1]) == 1
+    with open(paths[0], "rb") as f, open(paths[1], "rb") as g:
+        data = f.read()
+        assert g.read() == data
+    assert json.loads(data)["series"]["1"]["leaders"] == [[1]]
+
+
+def test_crash_mid_series_keeps_parsed_episodes(tmp_path, monkeypatch):
+    stream = str(tmp_path / "episodes.jsonl")
+    fetched = []
+
+    def fetch_html(path):
+        fetched.append(path)
+        if path.startswith("season.php"):
+            return "".join(f'<a href="episode.php?id={i}">{i}</a>' for i in (11, 12, 13))
+        if path == "episode.php?id=13" and len(fetched) < 5:
+            raise OSError("connection reset")
+        return episode_page(task_row(1, "Paint a horse", "Subjective"))
+
+    monkeypatch.setattr(scrape_episodes, "fetch_html", fetch_html)
+    monkeypatch.setattr(scrape_episodes, "fetch_all", lambda fetch, items: ((i, fetch(i), None) for i in items))
+    try:
+        scrape_series(1, 20, stream, set())
+    except OSError:
+        pass
+    complete, pending = scan_stream(stream)
+    assert complete == {} and sorted(pending[20]) == [1, 2]
+
+    assert scrape_series(1, 20, stream, set(pending[20])) == (3, 1)
+    assert fetched[-2:] == ["season.php?id=1", "episode.php?id=13"]
+    complete, pending = scan_stream(stream)
+    assert sorted(complete[20]) == [1, 2, 3] and pending == {}
+
+
+def test_main_flushes_cache_and_archive(tmp_path, monkeypatch):
+    class Response:
+        status_code = 200
+
+        def __init__(self, text):
+            self.text = text
+            self.content = text.encode("utf-8")
+            self.headers = {"ETag": '"v1"'}
+
+        def raise_for_status(self):
+            pass
+
+    def get(url, **kwargs):
+        if "season.php" in url:
+            return Response('<a href="episode.php?id=1">1</a><a href="episode.php?id=2">2</a>')
+        return Response(episode_page(task_row(1, "Paint a horse", "Subjective")))
+
+    monkeypatch.setattr(scrape, "CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setattr(scrape, "ARCHIVE_DIR", str(tmp_path / "archive"))
+    monkeypatch.setattr(scrape.session, "get", get)
+    monkeypatch.setattr(scrape_episodes, "EPISODES_STREAM", str(tmp_path / "episodes.jsonl"))
+    monkeypatch.setattr(scrape_episodes, "EPISODES_FILE", str(tmp_path / "episodes.json"))
+    monkeypatch.setattr(scrape_episodes, "TIMELINE_FILE", str(tmp_path / "timeline.json"))
+    monkeypatch.setattr(scrape_episodes, "CLIENT_TIMELINE_FILE", str(tmp_path / "client_timeline.json"))
+    monkeypatch.setattr("sys.argv", ["scrape_episodes.py", "--series", "20", "--rate", "0"])
+    scrape_episodes.main()
+
+    # 3 pages is below both flush batch sizes, so only the final flush writes them
+    assert len(HttpCache(str(tmp_path / "cache")).index) == 3
+    assert len(PageArchive(str(tmp_path / "archive"))) == 3
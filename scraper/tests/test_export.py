@@ -0,0 +1,29 @@
+"""Columnar contestant exports must read back as the exact records written."""
+
+import json
+import os
+
+from bench import DATA_DIR
+from export import read_contestants, write_contestants
+
+
+def round_trip(contestants, tmp_path):
+    path = str(tmp_path / "contestants.tmcol")
+    write_contestants(contestants, path)
+    return read_contestants(path)
+
+
+def test_committed_contestants_round_trip(tmp_path):
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = json.load(f)
+    assert json.dumps(round_trip(contestants, tmp_path)) == json.dumps(contestants)
+
+
+def test_empty_category_and_key_order_round_trip(tmp_path):
+    contestants = [
+        {"id": 1, "name": "A", "taskBreakdown": {"judgement": {}, "format": {"solo": {"ppt": 2.5, "count": 4}}}},
+        {"id": 2, "taskBreakdown": {"format": {}, "judgement": {"objective": {"count": 3, "ppt": 1.25}}},
+         "name": "B", "seasonIds": []},
+        {"id": 3, "name": "C", "error": "HTTP 500", "seasonIds": [4, 5]},
+    ]
+    assert json.dumps(round_trip(contestants, tmp_path)) == json.dumps(contestants)
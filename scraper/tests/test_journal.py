@@ -0,0 +1,44 @@
+"""Journal appends after a crash must not lose records beyond the torn one."""
+
+import json
+
+from journal import Journal, truncate_torn_tail
+
+
+def write_torn(path, records, torn):
+    with open(path, "w", encoding="utf-8") as f:
+        for i in records:
+            f.write(json.dumps({"kind": "contestant", "id": i, "data": {"id": i}}) + "\n")
+        f.write(json.dumps({"kind": "contestant", "id": torn, "data": {"id": torn}})[:20])
+
+
+def test_append_after_torn_tail(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    write_torn(path, [1], torn=2)
+    journal = Journal(path)
+    journal.append("contestant", 3, {"id": 3})
+    journal.close()
+    assert sorted(Journal(path).replay()["contestant"]) == [1, 3]
+
+
+def test_append_to_intact_journal_keeps_every_record(tmp_path):
+    path = str(tmp_path / "journal.jsonl")
+    journal = Journal(path, fsync_every=1)
+    for i in range(3):
+        journal.append("season", i, {"id": i})
+    journal.close()
+    journal = Journal(path)
+    journal.append("season", 3, {"id": 3})
+    journal.close()
+    assert sorted(Journal(path).replay()["season"]) == [0, 1, 2, 3]
+
+
+def test_truncate_torn_tail(tmp_path):
+    path = tmp_path / "log.jsonl"
+    path.write_bytes(b'{"a": 1}\n' + b"x" * 10_000)
+    truncate_torn_tail(str(path))
+    assert path.read_bytes() == b'{"a": 1}\n'
+    path.write_bytes(b"no newline at all")
+    truncate_torn_tail(str(path))
+    assert path.read_bytes() == b""
+    truncate_torn_tail(str(tmp_path / "missing.jsonl"))
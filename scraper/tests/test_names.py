@@ -0,0 +1,50 @@
+"""Winner names from notes and the curated table must resolve to the right contestant."""
+
+import json
+import os
+
+import pytest
+
+import scrape
+from bench import DATA_DIR, render_season_page
+from names import KNOWN_ALIASES, NameIndex, normalise
+
+with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+    CONTESTANTS = [c for c in json.load(f) if "error" not in c]
+IDS = {c["name"]: c["id"] for c in CONTESTANTS}
+
+
+@pytest.mark.parametrize("name, alias", [(n, a) for n, aliases in KNOWN_ALIASES.items() for a in aliases])
+def test_known_alias_resolves(name, alias):
+    assert name in IDS
+    assert NameIndex(CONTESTANTS).resolve(alias, fuzzy=False) == IDS[name]
+
+
+@pytest.mark.parametrize("text", ["Dara", "dara o'briain", "DARA O BRIAIN", "Dara Ó Briain",
+                                  "In the final, Dara Ó Briain"])
+def test_spelling_variants_resolve(text):
+    season = [{"id": 378, "name": "Dara Ó Briain"}, {"id": 1, "name": "Mae Martin"}]
+    assert NameIndex(season).resolve(text) == 378
+
+
+def test_shared_short_name_is_ambiguous():
+    index = NameIndex([{"id": 1, "name": "Sam Campbell"}, {"id": 2, "name": "Sam Simmons"}])
+    assert index.resolve("Sam") is None
+    assert index.resolve("Sam Simmons") == 2
+
+
+def test_misspelt_full_name_resolves_fuzzily():
+    index = NameIndex([{"id": 1, "name": "Kiell Smith-Bynoe"}, {"id": 2, "name": "Sophie Duker"}])
+    assert index.resolve("Kiell Smith-Byno") == 1
+    assert index.resolve("Kiell Smith-Byno", fuzzy=False) is None
+
+
+def test_normalise_strips_diacritics():
+    assert normalise("Babatunde Aléshé") == "babatunde aleshe"
+
+
+def test_winner_note_uses_known_alias():
+    season = {"seriesNumber": 3, "year": 2016, "episodes": 5,
+              "contestants": [{"id": 11, "name": "Doc Brown"}, {"id": 4, "name": "Rob Beckett"}],
+              "winner": {"name": "Ben Bailey Smith"}}
+    assert scrape.parse_season(render_season_page(season), 3)["winner"] == {"id": 11, "name": "Doc Brown"}
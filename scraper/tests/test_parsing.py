@@ -0,0 +1,46 @@
+"""Profile parsing must give the same output with every parser backend."""
+
+import json
+import os
+
+import pytest
+
+import scrape
+from bench import DATA_DIR, STAT_LABELS, available_parsers, render_person_page
+
+with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+    CONTESTANTS = [c for c in json.load(f) if "error" not in c]
+
+# Site chrome the parsers have to skip: nav links, a stats-like sidebar, scripts
+CHROME = ('<nav><a href="index.php">Home</a><div class="statsBox">Site stats</div></nav>'
+          '<script>var statsLabel = "<div>";</script><div class="footer"><table><tr><td>Solo</td>'
+          '<td>9</td></tr></table></div>')
+
+
+def page(c: dict) -> str:
+    return render_person_page(c).replace("<body>", "<body>" + CHROME, 1).replace("</body>", CHROME + "</body>", 1)
+
+
+def parse(html: str, parser: str):
+    soup = scrape.make_soup(html, parser=parser)
+    stats = scrape.extract_stats(soup)
+    return {label: scrape.lookup_stat(stats, label) for label in STAT_LABELS}, scrape.parse_task_breakdown(soup)
+
+
+@pytest.mark.parametrize("parser", available_parsers())
+@pytest.mark.parametrize("c", CONTESTANTS, ids=lambda c: str(c["id"]))
+def test_parser_backends_agree(c, parser):
+    html = page(c)
+    golden_stats, golden_bd = parse(html, "html.parser")
+    stats, bd = parse(html, parser)
+    assert stats == golden_stats
+    assert json.dumps(bd, ensure_ascii=False) == json.dumps(golden_bd, ensure_ascii=False)
+    profile = scrape.parse_contestant_profile(html, c["id"], parser)
+    assert json.dumps(profile["taskBreakdown"], ensure_ascii=False) == json.dumps(golden_bd, ensure_ascii=False)
+
+
+def test_profile_round_trips_through_rendered_page():
+    c = CONTESTANTS[0]
+    profile = scrape.parse_contestant_profile(page(c), c["id"])
+    assert profile["taskBreakdown"] == c["taskBreakdown"]
+    assert profile["totalPoints"] == c["totalPoints"]
@@ -0,0 +1,115 @@
+"""scrape.main against a fake taskmaster.info built from the committed data files."""
+
+import json
+import os
+import re
+
+import pytest
+
+import scrape
+from bench import DATA_DIR, render_person_page, render_season_page
+from journal import Journal
+
+with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+    CONTESTANTS = {c["id"]: c for c in json.load(f)}
+with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+    SEASONS = {scrape.UK_SEASON_IDS[s["seriesNumber"] - 1]: s for s in json.load(f)}
+PAGE = re.compile(r"(person|season)\.php\?id=(\d+)")
+
+
+class Response:
+    def __init__(self, text: str):
+        self.text = text
+        self.content = text.encode("utf-8")
+        self.status_code = 200
+        self.headers = {}
+
+    def raise_for_status(self):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    """Point the scraper at tmp_path and serve pages rendered from data/; yields the fetched URLs."""
+    fetched = []
+
+    def get(url, **kwargs):
+        fetched.append(url)
+        kind, page_id = PAGE.search(url).groups()
+        page_id = int(page_id)
+        return Response(render_person_page(CONTESTANTS[page_id]) if kind == "person"
+                        else render_season_page(SEASONS[page_id]))
+
+    monkeypatch.setattr(scrape, "DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(scrape, "CACHE_DIR", str(tmp_path / ".http_cache"))
+    monkeypatch.setattr(scrape, "ARCHIVE_DIR", str(tmp_path / ".page_archive"))
+    monkeypatch.setattr(scrape.session, "get", get)
+    return fetched
+
+
+def run_scrape(monkeypatch, *argv, use_cache=False):
+    cache_args = [] if use_cache else ["--no-cache"]
+    monkeypatch.setattr("sys.argv", ["scrape.py", "--rate", "0", *cache_args, "--parse-workers", "0", *argv])
+    scrape.main()
+
+
+def test_cold_start_with_seasons(site, tmp_path, monkeypatch):
+    run_scrape(monkeypatch, "--seasons", "19,20")
+    with open(tmp_path / "seasons.json", "r", encoding="utf-8") as f:
+        seasons = json.load(f)
+    assert [s["id"] for s in seasons] == scrape.UK_SEASON_IDS
+    assert all(s["contestants"] and "error" not in s for s in seasons)
+    with open(tmp_path / "contestants.json", "r", encoding="utf-8") as f:
+        assert {c["id"] for c in json.load(f)} == set(CONTESTANTS)
+
+
+def test_seasons_refetches_only_requested_when_warm(site, tmp_path, monkeypatch):
+    run_scrape(monkeypatch)
+    site.clear()
+    run_scrape(monkeypatch, "--seasons", "19,20")
+    fetched_seasons = sorted(int(PAGE.search(url).group(2)) for url in site if "season.php" in url)
+    assert fetched_seasons == [scrape.UK_SEASON_IDS[18], scrape.UK_SEASON_IDS[19]]
+
+
+@pytest.mark.parametrize("argv", [["--seasons", "20"], ["--stale-after", "0"]])
+def test_forced_refetch_bypasses_fresh_cache(site, tmp_path, monkeypatch, argv):
+    run_scrape(monkeypatch, use_cache=True)
+    cid = SEASONS[scrape.UK_SEASON_IDS[19]]["contestants"][0]["id"]
+    monkeypatch.setitem(CONTESTANTS, cid, {**CONTESTANTS[cid], "totalPoints": CONTESTANTS[cid]["totalPoints"] + 7})
+    site.clear()
+    run_scrape(monkeypatch, *argv, use_cache=True)
+    assert any(f"person.php?id={cid}" in url for url in site)
+    with open(tmp_path / "contestants.json", "r", encoding="utf-8") as f:
+        saved = {c["id"]: c for c in json.load(f)}
+    assert saved[cid]["totalPoints"] == CONTESTANTS[cid]["totalPoints"]
+
+
+def test_plain_rerun_is_served_from_cache(site, monkeypatch):
+    run_scrape(monkeypatch, use_cache=True)
+    site.clear()
+    run_scrape(monkeypatch, use_cache=True)
+    assert site == []
+
+
+def test_reparse_includes_resumed_seasons_and_keeps_fetch_times(site, tmp_path, monkeypatch):
+    run_scrape(monkeypatch)
+    with open(tmp_path / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    fetched_at = {kind: {k: e["fetchedAt"] for k, e in manifest[kind].items()} for kind in ("seasons", "contestants")}
+    # An interrupted earlier run left a stale parse of series 20 in the journal
+    sid = scrape.UK_SEASON_IDS[19]
+    journal = Journal(str(tmp_path / "scrape_journal.jsonl"))
+    with open(tmp_path / "seasons.json", "r", encoding="utf-8") as f:
+        season = next(s for s in json.load(f) if s["id"] == sid)
+    journal.append("season", sid, {**season, "year": 1900})
+    journal.close()
+
+    site.clear()
+    run_scrape(monkeypatch, "--reparse")
+    assert site == []
+    with open(tmp_path / "seasons.json", "r", encoding="utf-8") as f:
+        assert next(s for s in json.load(f) if s["id"] == sid) == season
+    with open(tmp_path / "manifest.json", "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    for kind, times in fetched_at.items():
+        assert {k: e["fetchedAt"] for k, e in manifest[kind].items()} == times
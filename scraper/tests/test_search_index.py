@@ -0,0 +1,27 @@
+"""Search index documents must be addressable by a unique ID."""
+
+import json
+import os
+
+from bench import DATA_DIR
+from search_index import build_index, task_doc
+
+
+def test_built_doc_ids_are_unique():
+    with open(os.path.join(DATA_DIR, "contestants.json"), "r", encoding="utf-8") as f:
+        contestants = json.load(f)
+    with open(os.path.join(DATA_DIR, "seasons.json"), "r", encoding="utf-8") as f:
+        seasons = json.load(f)
+    ids = [doc["id"] for doc in build_index(contestants, seasons)["docs"]]
+    assert len(ids) == len(set(ids))
+
+
+def test_committed_doc_ids_are_unique():
+    with open(os.path.join(DATA_DIR, "search_index.json"), "r", encoding="utf-8") as f:
+        ids = [doc["id"] for doc in json.load(f)["docs"]]
+    assert len(ids) == len(set(ids))
+
+
+def test_same_task_id_in_two_series_gets_two_docs():
+    task = {"id": 100, "name": "Make a noise", "judgement": "subjective", "contestants": []}
+    assert task_doc(1, {"episode": 1}, task)["id"] != task_doc(2, {"episode": 1}, task)["id"]
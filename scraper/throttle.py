@@ -0,0 +1,158 @@
+"""
+Adaptive request rate control for the scraper.
+
+A token bucket shared by all fetch threads gates every request start. Its rate
+adapts to how the server responds:
+
+- every WINDOW responses, the rate grows by INCREASE_STEP if there were no
+  errors and latency is near the fastest seen, and halves if the error rate
+  or latency says the server is struggling (additive increase, multiplicative
+  decrease, kept between min_rate and max_rate)
+- a 429/503 halves the rate at once and pauses every thread for the
+  Retry-After the server sent (or the backoff delay when it sent none)
+- after failure_threshold consecutive failures the circuit opens: all threads
+  wait out a cooldown instead of spending their retries, then one more
+  failure reopens it
+
+backoff() gives the jittered wait between retries of a single request.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+
+WINDOW = 10  # responses between rate adjustments
+INCREASE_STEP = 0.25  # req/s added after a clean window
+MIN_RATE = 0.1
+SLOW_FACTOR = 2.0  # latency this many times the best seen counts as slow
+ERROR_RATE_LIMIT = 0.2
+MAX_BACKOFF = 60.0
+LATENCY_ALPHA = 0.2  # EWMA weight of the newest latency sample
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateController:
+    """Thread-safe token bucket whose rate follows the server's responses.
+
+    A rate of 0 disables the bucket (no cap, no adaptation); Retry-After pauses
+    and the circuit breaker still apply.
+    """
+
+    def __init__(self, rate: float, max_rate: float | None = None, min_rate: float = MIN_RATE,
+                 burst: float = 1.0, base_delay: float = 2.5, failure_threshold: int = 5,
+                 cooldown: float = 60.0):
+        self.rate = rate
+        self.max_rate = max(max_rate or rate, rate)
+        self.min_rate = min(min_rate, rate) if rate > 0 else 0.0
+        self.burst = burst
+        self.base_delay = base_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._window: deque[bool] = deque()
+        self._latency: float | None = None
+        self._best_latency: float | None = None
+        self._failures = 0
+        self.throttled = self.trips = 0
+
+    def acquire(self):
+        """Block until a request may start."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self.rate <= 0:
+                    return
+                else:
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff for retry number attempt (0-based)."""
+        return random.uniform(0, min(MAX_BACKOFF, self.base_delay * 2 ** (attempt + 1)))
+
+    def record_success(self, latency: float):
+        with self._lock:
+            self._failures = 0
+            if self._latency is None:
+                self._latency = latency
+            else:
+                self._latency += LATENCY_ALPHA * (latency - self._latency)
+            if self._best_latency is None or self._latency < self._best_latency:
+                self._best_latency = self._latency
+            self._observe(True)
+
+    def record_failure(self) -> float | None:
+        """Record a failed request; returns the pause length if the circuit opened."""
+        with self._lock:
+            self._observe(False)
+            return self._count_failure()
+
+    def record_throttled(self, retry_after: float | None, attempt: int = 0) -> float:
+        """Record a 429/503: halve the rate and pause all threads. Returns the pause."""
+        with self._lock:
+            self.throttled += 1
+            if self.rate > 0:
+                self.rate = max(self.min_rate, self.rate / 2)
+            pause = retry_after if retry_after is not None else self.backoff(attempt)
+            self._pause(pause)
+            self._observe(False)
+            tripped = self._count_failure()
+            return max(pause, tripped or 0.0)
+
+    def _pause(self, seconds: float):
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def _count_failure(self) -> float | None:
+        self._failures += 1
+        if self._failures < self.failure_threshold:
+            return None
+        # Open the circuit; after the cooldown one more failure reopens it
+        self.trips += 1
+        self._failures = self.failure_threshold - 1
+        self._pause(self.cooldown)
+        return self.cooldown
+
+    def _observe(self, ok: bool):
+        self._window.append(ok)
+        if len(self._window) < WINDOW:
+            return
+        error_rate = self._window.count(False) / len(self._window)
+        self._window.clear()
+        if self.rate <= 0:
+            return
+        slow = (self._latency is not None and self._best_latency
+                and self._latency > SLOW_FACTOR * self._best_latency)
+        if error_rate > ERROR_RATE_LIMIT or slow:
+            self.rate = max(self.min_rate, self.rate / 2)
+        elif error_rate == 0:
+            self.rate = min(self.max_rate, self.rate + INCREASE_STEP)
+
+    def summary(self) -> str:
+        latency = f", {self._latency * 1000:.0f} ms latency" if self._latency is not None else ""
+        rate = f"{self.rate:.2f} req/s" if self.rate > 0 else "unlimited"
+        return f"{rate}{latency}, {self.throttled} throttled, {self.trips} circuit trips"
@@ -0,0 +1,191 @@
+"""
+Cumulative standings timeline derived from episodes.json (data/timeline.json).
+
+For each series the task scores become a tasks x contestants matrix. One
+cumsum gives the running totals after every task, and the rows at episode
+boundaries give the standings after every episode. From those come episode
+points, competition ranks ("1224"), rank changes, episode winners, the
+leaders and their lead margin. Per series:
+
+    contestants     [{id, name}] in first-appearance order; the column order
+                    of every matrix below
+    episodes        [{episode, title, taskEnd, hash}]; taskEnd indexes the
+                    taskTotals row after the episode's last task (exclusive)
+    taskTotals      tasks x contestants running totals
+    episodePoints, episodeTotals, ranks, rankChanges
+                    episodes x contestants (rankChanges > 0 = climbed; 0 for
+                    the first episode)
+    episodeWinners, leaders
+                    column indexes per episode (several on a tie)
+    leadMargin      leader's points over second place after each episode
+
+Season View and Watch Mode can index these directly, e.g.
+timeline["series"]["4"]["episodeTotals"][e][col].
+
+Updates are incremental. Each episode's content hash is stored, and only
+episodes from the first changed or new one onwards are recomputed, seeded
+from the stored totals and ranks before them. Appending an episode adds
+rows without touching the earlier ones.
+
+The file is written to data/ and copied to client/public/data/, where the
+client loads it. Run after scrape_episodes.py (which calls update() itself):
+    python timeline.py [--rebuild]
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+
+from episodes import EPISODES_FILE, iter_episodes
+from manifest import content_hash
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+TIMELINE_FILE = os.path.join(DATA_DIR, "timeline.json")
+CLIENT_TIMELINE_FILE = os.path.join(os.path.dirname(__file__), "..", "client", "public", "data", "timeline.json")
+
+ROW_KEYS = ("episodePoints", "episodeTotals", "ranks", "rankChanges", "episodeWinners", "leaders", "leadMargin")
+
+
+def empty_series() -> dict:
+    return {"contestants": [], "episodes": [], "taskTotals": [], **{k: [] for k in ROW_KEYS}}
+
+
+def compute_rows(episodes: list[dict], columns: dict, start_totals: np.ndarray,
+                 prev_ranks: np.ndarray | None) -> dict:
+    """Timeline rows for consecutive episodes, continuing from start_totals."""
+    counts = [len(ep["tasks"]) for ep in episodes]
+    rows, cols, vals = [], [], []
+    r = 0
+    for ep in episodes:
+        for task in ep["tasks"]:
+            for c in task["contestants"]:
+                rows.append(r)
+                cols.append(columns[c["id"]])
+                vals.append(c["score"])
+            r += 1
+    scores = np.zeros((r, len(columns)), dtype=np.int64)
+    np.add.at(scores, (np.array(rows, dtype=np.intp), np.array(cols, dtype=np.intp)), vals)
+
+    task_totals = start_totals + np.cumsum(scores, axis=0)
+    padded = np.vstack([start_totals, task_totals])
+    episode_totals = padded[np.cumsum(counts)]
+    episode_points = np.diff(np.vstack([start_totals, episode_totals]), axis=0)
+    # ranks[e, i] = 1 + number of contestants strictly ahead of i after episode e
+    ranks = 1 + (episode_totals[:, None, :] > episode_totals[:, :, None]).sum(axis=2)
+    if prev_ranks is None:
+        before = np.vstack([ranks[:1], ranks[:-1]])
+    else:
+        before = np.vstack([prev_ranks, ranks[:-1]])
+    ordered = np.sort(episode_totals, axis=1)
+    margin = ordered[:, -1] - ordered[:, -2] if len(columns) > 1 else ordered[:, -1]
+
+    def argmax_all(m: np.ndarray) -> list[list[int]]:
+        return [np.flatnonzero(row == row.max()).tolist() if len(row) else [] for row in m]
+
+    return {
+        "taskTotals": task_totals.tolist(),
+        "episodePoints": episode_points.tolist(),
+        "episodeTotals": episode_totals.tolist(),
+        "ranks": ranks.tolist(),
+        "rankChanges": (before - ranks).tolist(),
+        "episodeWinners": argmax_all(episode_points),
+        "leaders": argmax_all(episode_totals),
+        "leadMargin": margin.tolist(),
+    }
+
+
+def update_series(series: dict, episodes: list[dict]) -> int:
+    """Bring one series' timeline in line with its episodes; returns episodes recomputed."""
+    ids = [c["id"] for ep in episodes for task in ep["tasks"] for c in task["contestants"]]
+    known = [c["id"] for c in series["contestants"]]
+    if any(cid not in known for cid in ids):
+        # A new contestant column changes every row's width: start the series over
+        names = {c["id"]: c["name"] for ep in episodes for task in ep["tasks"] for c in task["contestants"]}
+        series.clear()
+        series.update(empty_series())
+        series["contestants"] = [{"id": cid, "name": names[cid]} for cid in dict.fromkeys(ids)]
+    columns = {c["id"]: i for i, c in enumerate(series["contestants"])}
+
+    hashes = [content_hash(ep) for ep in episodes]
+    keep = 0
+    while keep < min(len(hashes), len(series["episodes"])) and series["episodes"][keep]["hash"] == hashes[keep]:
+        keep += 1
+    if keep == len(hashes) == len(series["episodes"]):
+        return 0
+
+    task_end = series["episodes"][keep - 1]["taskEnd"] if keep else 0
+    series["episodes"] = series["episodes"][:keep]
+    series["taskTotals"] = series["taskTotals"][:task_end]
+    for k in ROW_KEYS:
+        series[k] = series[k][:keep]
+    todo = episodes[keep:]
+    if not todo:
+        return 0
+
+    start = np.array(series["episodeTotals"][-1] if keep else [0] * len(columns), dtype=np.int64)
+    prev_ranks = np.array(series["ranks"][-1]) if keep else None
+    new = compute_rows(todo, columns, start, prev_ranks)
+    for k, rows in new.items():
+        series[k].extend(rows)
+    for ep, h in zip(todo, hashes[keep:]):
+        task_end += len(ep["tasks"])
+        series["episodes"].append({"episode": ep["episode"], "title": ep["title"], "taskEnd": task_end, "hash": h})
+    return len(todo)
+
+
+def load_timeline(path: str = TIMELINE_FILE) -> dict:
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {"series": {}}
+
+
+def update(episodes_path: str = EPISODES_FILE, path: str = TIMELINE_FILE, rebuild: bool = False,
+           client_path: str | None = None) -> int:
+    """Update the timeline file from episodes_path, and its client copy at
+    client_path if given; returns episodes recomputed."""
+    timeline = {"series": {}} if rebuild else load_timeline(path)
+    seen, total = set(), 0
+
+    def flush(series_num, eps):
+        nonlocal total
+        key = str(series_num)
+        total += update_series(timeline["series"].setdefault(key, empty_series()), eps)
+        seen.add(key)
+
+    # Episodes stream grouped by series, so only one series is in memory at a time
+    current, eps = None, []
+    for series_num, ep in iter_episodes(episodes_path):
+        if series_num != current and eps:
+            flush(current, eps)
+            eps = []
+        current = series_num
+        eps.append(ep)
+    if eps:
+        flush(current, eps)
+
+    for key in [k for k in timeline["series"] if k not in seen]:
+        del timeline["series"][key]
+        total += 1
+    for out in filter(None, (path, client_path)):
+        if total or not os.path.exists(out):
+            # Compact rather than journal.write_json_atomic's indented form: the matrices dominate
+            tmp = f"{out}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(timeline, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, out)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the cumulative standings timeline from episodes.json")
+    parser.add_argument("--rebuild", action="store_true", help="recompute every series from scratch")
+    args = parser.parse_args()
+    changed = update(rebuild=args.rebuild, client_path=CLIENT_TIMELINE_FILE)
+    print(f"timeline.json: {changed} episodes recomputed")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,13 @@ import {
   getSeasons,
   getSeason,
   getAnalysis,
+  getLeaderboard,
+  isRankStat,
+  RANK_STATS,
+  getContestantRanks,
+  getSimilarContestants,
+  search,
+  getDataSummary,
 } from "../services/dataService";
 
 const router = Router();
@@ -22,6 +29,40 @@ router.get("/contestants/:id", (req: Request, res: Response) => {
   res.json(contestant);
 });
 
+router.get("/contestants/:id/ranks", (req: Request, res: Response) => {
+  const ranks = getContestantRanks(parseInt(req.params.id as string));
+  if (!ranks) {
+    res.status(404).json({ error: "No rankings for contestant" });
+    return;
+  }
+  res.json(ranks);
+});
+
+router.get("/contestants/:id/similar", (req: Request, res: Response) => {
+  const limit = parseInt((req.query.limit as string) ?? "10") || 10;
+  const similar = getSimilarContestants(parseInt(req.params.id as string), limit);
+  if (!similar) {
+    res.status(404).json({ error: "No similar contestants" });
+    return;
+  }
+  res.json(similar);
+});
+
+router.get("/leaderboards/:stat", (req: Request, res: Response) => {
+  const stat = req.params.stat as string;
+  if (!isRankStat(stat)) {
+    res.status(400).json({ error: `Unknown stat; expected one of ${RANK_STATS.join(", ")}` });
+    return;
+  }
+  const limit = parseInt((req.query.limit as string) ?? "10") || 10;
+  const leaderboard = getLeaderboard(stat, limit);
+  if (!leaderboard) {
+    res.status(404).json({ error: "No leaderboard for stat" });
+    return;
+  }
+  res.json(leaderboard);
+});
+
 router.get("/seasons", (_req: Request, res: Response) => {
   res.json(getSeasons());
 });
@@ -35,6 +76,17 @@ router.get("/seasons/:num", (req: Request, res: Response) => {
   res.json(season);
 });
 
+router.get("/search", (req: Request, res: Response) => {
+  const limit = parseInt((req.query.limit as string) ?? "10") || 10;
+  res.json(search((req.query.q as string) ?? "", limit));
+});
+
+// Chat context for a question: the summary plus the rows relevant to q, within budget tokens
+router.get("/chat/context", (req: Request, res: Response) => {
+  const budget = parseInt((req.query.budget as string) ?? "") || undefined;
+  res.json({ context: getDataSummary((req.query.q as string) || undefined, budget) });
+});
+
 router.get("/analysis", (_req: Request, res: Response) => {
   res.json(getAnalysis());
 });
@@ -1,12 +1,21 @@
 import fs from "fs";
 import path from "path";
-import { Contestant, Season, Analysis } from "../types";
+import { Contestant, Season, Analysis, Rankings, Similar, SearchIndex, SearchDoc } from "../types";
 
 const DATA_DIR = path.join(__dirname, "..", "..", "..", "data");
 
 let contestants: Contestant[] = [];
 let seasons: Season[] = [];
 let analysis: Analysis | null = null;
+let rankings: Rankings | null = null;
+let similar: Similar | null = null;
+let searchIndex: SearchIndex | null = null;
+let stopwords = new Set<string>();
+
+// Token budget for the per-question rows in the chat context
+const CHAT_CONTEXT_TOKENS = 1500;
+let contestantsById = new Map<number, Contestant>();
+let seasonsByNumber = new Map<number, Season>();
 
 export function loadData(): void {
   contestants = JSON.parse(
@@ -18,6 +27,21 @@ export function loadData(): void {
   analysis = JSON.parse(
     fs.readFileSync(path.join(DATA_DIR, "analysis.json"), "utf-8")
   );
+  const rankingsFile = path.join(DATA_DIR, "rankings.json");
+  rankings = fs.existsSync(rankingsFile)
+    ? JSON.parse(fs.readFileSync(rankingsFile, "utf-8"))
+    : null;
+  const similarFile = path.join(DATA_DIR, "similar.json");
+  similar = fs.existsSync(similarFile)
+    ? JSON.parse(fs.readFileSync(similarFile, "utf-8"))
+    : null;
+  const indexFile = path.join(DATA_DIR, "search_index.json");
+  searchIndex = fs.existsSync(indexFile)
+    ? JSON.parse(fs.readFileSync(indexFile, "utf-8"))
+    : null;
+  stopwords = new Set(searchIndex?.stopwords ?? []);
+  contestantsById = new Map(contestants.map((c) => [c.id, c]));
+  seasonsByNumber = new Map(seasons.map((s) => [s.seriesNumber, s]));
   console.log(
     `Loaded ${contestants.length} contestants, ${seasons.length} seasons`
   );
@@ -28,7 +52,7 @@ export function getContestants(): Contestant[] {
 }
 
 export function getContestant(id: number): Contestant | undefined {
-  return contestants.find((c) => c.id === id);
+  return contestantsById.get(id);
 }
 
 export function getSeasons(): Season[] {
@@ -36,23 +60,130 @@ export function getSeasons(): Season[] {
 }
 
 export function getSeason(num: number): Season | undefined {
-  return seasons.find((s) => s.seriesNumber === num);
+  return seasonsByNumber.get(num);
 }
 
 export function getAnalysis(): Analysis | null {
   return analysis;
 }
 
-export function getDataSummary(): string {
-  const winnerNames = seasons.map((s) => `S${s.seriesNumber}: ${s.winner.name}`).join(", ");
+export function getRankings(): Rankings | null {
+  return rankings;
+}
+
+// Stats with a leaderboard; the same list as RANK_STATS in scraper/rankings.py
+export const RANK_STATS = [
+  "pointsPerTask", "pointsPerEpisode", "totalPoints", "basePoints", "bonusPoints",
+  "episodeWinPct", "taskWinPct", "episodeWins", "tasksWon", "tasksAttempted",
+  "episodes", "seasonWins", "pointsDeducted", "dqs",
+] as const;
+export type RankStat = (typeof RANK_STATS)[number];
+
+export function isRankStat(stat: string): stat is RankStat {
+  return (RANK_STATS as readonly string[]).includes(stat);
+}
 
-  const topContestants = [...contestants]
+/** Top n contestants by stat, highest first, from the precomputed order. */
+export function getLeaderboard(stat: RankStat, n: number): Contestant[] | undefined {
+  if (rankings) {
+    const ranking = rankings.stats[stat];
+    if (!ranking) return undefined;
+    return ranking.order
+      .slice(0, n)
+      .map((id) => contestantsById.get(id))
+      .filter((c): c is Contestant => c !== undefined);
+  }
+  // rankings.json not generated yet: fall back to sorting (ties by ID, as in rankings.json)
+  return [...contestants]
     .filter((c) => c.episodes >= 5)
-    .sort((a, b) => b.pointsPerTask - a.pointsPerTask)
-    .slice(0, 10)
+    .sort((a, b) => b[stat] - a[stat] || a.id - b.id)
+    .slice(0, n);
+}
+
+export function getContestantRanks(id: number) {
+  return rankings?.contestants[String(id)];
+}
+
+/** Most similar contestants by taskBreakdown profile, with cosine similarity. */
+export function getSimilarContestants(id: number, n: number) {
+  const neighbours = similar?.contestants[String(id)];
+  if (!neighbours) return undefined;
+  return neighbours
+    .slice(0, n)
+    .map(([nid, similarity]) => ({ contestant: contestantsById.get(nid), similarity }))
+    .filter((e): e is { contestant: Contestant; similarity: number } => e.contestant !== undefined);
+}
+
+/** Same normalisation as scraper/search_index.py: casefold, no diacritics, "series 4" -> "s4". */
+function tokenize(text: string): string[] {
+  // JS has no casefold(); on the [a-z0-9] alphabet it differs from
+  // toLowerCase() only in folding "ß" (and "ẞ", lowercased to "ß") to "ss"
+  const words =
+    text.normalize("NFKD").replace(/\p{M}/gu, "").toLowerCase().replace(/ß/g, "ss").match(/[a-z0-9]+/g) ?? [];
+  const tokens: string[] = [];
+  for (let i = 0; i < words.length; i++) {
+    const w = words[i];
+    if (["series", "season", "s"].includes(w) && /^\d+$/.test(words[i + 1] ?? "")) {
+      tokens.push(`s${parseInt(words[++i])}`);
+    } else if (!stopwords.has(w)) {
+      tokens.push(w);
+    }
+  }
+  return tokens;
+}
+
+/** Top n documents for query by BM25 score (postings hold precomputed term weights). */
+export function search(query: string, n: number): { doc: SearchDoc; score: number }[] {
+  if (!searchIndex) return [];
+  const scores = new Map<number, number>();
+  for (const term of new Set(tokenize(query))) {
+    for (const [doc, weight] of searchIndex.postings[term] ?? []) {
+      scores.set(doc, (scores.get(doc) ?? 0) + weight);
+    }
+  }
+  return [...scores]
+    .sort((a, b) => b[1] - a[1] || a[0] - b[0])
+    .slice(0, n)
+    .map(([doc, score]) => ({ doc: searchIndex!.docs[doc], score }));
+}
+
+/** Snippets for the best matches to query, in score order, within budget tokens. */
+function relevantSnippets(query: string, budget: number): string[] {
+  const snippets: string[] = [];
+  let used = 0;
+  for (const { doc } of search(query, 50)) {
+    if (used + doc.tokens > budget) continue;
+    snippets.push(doc.snippet);
+    used += doc.tokens;
+  }
+  return snippets;
+}
+
+function fullContestantData(): string {
+  return contestants.filter(c => c.episodes >= 5).map(c => {
+    const bd = c.taskBreakdown;
+    return `${c.name} (S${c.seasonIds.join(",")}): PpT=${c.pointsPerTask}, PpE=${c.pointsPerEpisode}, EpWin%=${c.episodeWinPct}%, SeasonWins=${c.seasonWins}, ` +
+      `Prize=${bd.setting?.prize?.ppt || 0}, Filmed=${bd.setting?.filmed?.ppt || 0}, Live=${bd.setting?.live?.ppt || 0}, ` +
+      `Creative=${bd.activity?.creative?.ppt || 0}, Mental=${bd.activity?.mental?.ppt || 0}, Physical=${bd.activity?.physical?.ppt || 0}, Social=${bd.activity?.social?.ppt || 0}, ` +
+      `Objective=${bd.judgement?.objective?.ppt || 0}, Subjective=${bd.judgement?.subjective?.ppt || 0}`;
+  }).join("\n");
+}
+
+/**
+ * Chat context. With a query and search_index.json, only the rows relevant to
+ * the query are included, up to tokenBudget; otherwise every contestant is.
+ */
+export function getDataSummary(query?: string, tokenBudget = CHAT_CONTEXT_TOKENS): string {
+  const winnerNames = seasons.map((s) => `S${s.seriesNumber}: ${s.winner.name}`).join(", ");
+
+  const topContestants = (getLeaderboard("pointsPerTask", 10) ?? [])
     .map((c) => `${c.name} (PpT: ${c.pointsPerTask}, S${c.seasonIds.join(",")})`)
     .join("; ");
 
+  const data = query && searchIndex
+    ? `RELEVANT DATA:\n${relevantSnippets(query, tokenBudget).join("\n")}`
+    : `FULL CONTESTANT DATA:\n${fullContestantData()}`;
+
   const a = analysis!;
   return `
 TASKMASTER UK DATA SUMMARY
@@ -72,13 +203,6 @@ Non-Winners (${a.nonWinners.count}): Avg PpT=${a.nonWinners.avgPointsPerTask}, A
 TOP 10 BY POINTS PER TASK:
 ${topContestants}
 
-FULL CONTESTANT DATA:
-${contestants.filter(c => c.episodes >= 5).map(c => {
-  const bd = c.taskBreakdown;
-  return `${c.name} (S${c.seasonIds.join(",")}): PpT=${c.pointsPerTask}, PpE=${c.pointsPerEpisode}, EpWin%=${c.episodeWinPct}%, SeasonWins=${c.seasonWins}, ` +
-    `Prize=${bd.setting?.prize?.ppt || 0}, Filmed=${bd.setting?.filmed?.ppt || 0}, Live=${bd.setting?.live?.ppt || 0}, ` +
-    `Creative=${bd.activity?.creative?.ppt || 0}, Mental=${bd.activity?.mental?.ppt || 0}, Physical=${bd.activity?.physical?.ppt || 0}, Social=${bd.activity?.social?.ppt || 0}, ` +
-    `Objective=${bd.judgement?.objective?.ppt || 0}, Subjective=${bd.judgement?.subjective?.ppt || 0}`;
-}).join("\n")}
+${data}
 `.trim();
 }
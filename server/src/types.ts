@@ -69,6 +69,57 @@ export interface Analysis {
   keyInsights: string[];
 }
 
+export interface StatRanking {
+  order: number[];
+  rank: number[];
+  percentile: number[];
+}
+
+export interface StandingEntry {
+  rank: number;
+  id: number;
+  name: string;
+  totalPoints: number;
+  winner: boolean;
+}
+
+export interface Rankings {
+  minEpisodes: number;
+  ranked: number;
+  stats: Record<string, StatRanking>;
+  contestants: Record<
+    string,
+    {
+      stats: Record<string, [number, number]>;
+      breakdown: Record<string, Record<string, number>>;
+    }
+  >;
+  seriesStandings: Record<string, StandingEntry[]>;
+}
+
+export interface Similar {
+  k: number;
+  features: string[];
+  contestants: Record<string, [number, number][]>;
+}
+
+export interface SearchDoc {
+  id: string;
+  type: "contestant" | "season" | "task";
+  title: string;
+  snippet: string;
+  tokens: number;
+}
+
+export interface SearchIndex {
+  k1: number;
+  b: number;
+  charsPerToken: number;
+  stopwords: string[];
+  docs: SearchDoc[];
+  postings: Record<string, [number, number][]>;
+}
+
 export interface ChatMessage {
   role: "user" | "assistant" | "system";
   content: string;